@@ -32,6 +32,7 @@ import Draft
 import numpy
 
 from Project.Support import Properties, Units, Utils, DocumentProperties
+from ..project.support.recompute_scheduler import RecomputeScheduler
 
 _CLASS_NAME = 'VerticalAlignment'
 _TYPE = 'Part::Part2DObjectPython'
@@ -616,6 +617,11 @@ class _VerticalAlignment(Draft._Wire):
         if hasattr(self, 'no_execute'):
             return
 
+        #coalesce discretization changes into a single recompute,
+        #except for properties loaded as the document is restored
+        if prop in ['Method', 'Seg_Value'] and 'Restore' not in obj.State:
+            RecomputeScheduler().mark_dirty(obj)
+
         if prop == "Method":
 
             _prop = obj.getPropertyByName(prop)
@@ -634,6 +640,14 @@ class _VerticalAlignment(Draft._Wire):
         if hasattr(self, 'no_execute'):
             return
 
+        _scheduler = RecomputeScheduler()
+
+        #batched changes are recomputed once, when the batch ends
+        if _scheduler.is_deferred(obj):
+            return
+
+        _scheduler.discard(obj)
+
         print('executing ', self.Object.Label)
 
         self.Object.Points = self._discretize_geometry()
@@ -26,11 +26,15 @@ Class for managing 2D Horizontal Alignments
 """
 from copy import deepcopy
 
+import numpy
+
 import FreeCAD as App
 import Draft
 
-from ..project.support import properties, units
-from ..geometry import support, arc
+from ..project.support import instrumentation, properties, units
+from ..project.support.recompute_scheduler import RecomputeScheduler
+from ..project.support.idle_queue import IdleQueue
+from ..geometry import spatial_hash, simplify
 from . import alignment_group, alignment_model
 
 _CLASS_NAME = 'Alignment'
@@ -41,11 +45,14 @@ __author__ = 'Joel Graff'
 __url__ = "https://www.freecadweb.org"
 
 
-def create(geometry, object_name='', no_visual=False):
+def create(geometry, object_name='', no_visual=False, recompute=True):
     """
     Class construction method
+    geometry - alignment data, or a constructed AlignmentModel
     object_name - Optional. Name of new object.  Defaults to class name.
     no_visual - If true, generates the object without a ViewProvider.
+    recompute - If false, the caller recomputes the document, allowing
+                objects to be created in batches.
     """
 
     if not geometry:
@@ -66,9 +73,11 @@ def create(geometry, object_name='', no_visual=False):
     result.set_geometry(geometry)
 
     if not no_visual:
-        Draft._ViewProviderWire(_obj.ViewObject)
+        _ViewProviderAlignment(_obj.ViewObject)
+
+    if recompute:
+        App.ActiveDocument.recompute()
 
-    App.ActiveDocument.recompute()
     return result
 
 #Construction order:
@@ -96,6 +105,7 @@ class Alignment(Draft._Wire):
         self.Object = obj
         self.errors = []
 
+        self.restore_pending = False
         self.curve_edges = None
 
         self.model = None
@@ -184,11 +194,59 @@ class Alignment(Draft._Wire):
 
         self.Object = obj
 
-        self.model = alignment_model.AlignmentModel(
-            self.Object.InList[0].Proxy.get_alignment_data(obj.ID)
-        )
+        #defer the model and edge dictionary to first access, warming them
+        #up in idle time so opening large projects stays fast
+        self._model = None
+        self._curve_edges = None
+        self.restore_pending = True
+
+        IdleQueue().push(self.get_edges)
+
+    @property
+    def model(self):
+        """
+        The alignment model, built from the alignment group data on first
+        access after a document restore
+        """
+
+        if getattr(self, 'restore_pending', False):
+
+            self.restore_pending = False
+
+            self._model = alignment_model.AlignmentModel(
+                self.Object.InList[0].Proxy.get_alignment_data(self.Object.ID)
+            )
+
+        return getattr(self, '_model', None)
+
+    @model.setter
+    def model(self, value):
+        """
+        Assign the alignment model, invalidating dependent data
+        """
+
+        self.restore_pending = False
+        self._model = value
+        self._curve_edges = None
+
+    @property
+    def curve_edges(self):
+        """
+        The dictionary of curve edges, built on first access
+        """
+
+        if getattr(self, '_curve_edges', None) is None and self.model:
+            self.build_curve_edge_dict()
 
-        self.build_curve_edge_dict()
+        return getattr(self, '_curve_edges', None)
+
+    @curve_edges.setter
+    def curve_edges(self, value):
+        """
+        Assign the dictionary of curve edges
+        """
+
+        self._curve_edges = value
 
     def build_curve_edge_dict(self):
         """
@@ -198,6 +256,17 @@ class Alignment(Draft._Wire):
 
         curve_dict = {}
         curves = self.model.data['geometry']
+        curve_edges = self.Object.Shape.Edges
+
+        #index the edges by their start and end points, so each curve's
+        #edges are found by lookup rather than by scanning the edge list
+        starts = spatial_hash.SpatialHash()
+        ends = spatial_hash.SpatialHash(starts.tolerance)
+
+        for _i, edge in enumerate(curve_edges):
+
+            starts.add([edge.Vertexes[0].Point], _i)
+            ends.add([edge.Vertexes[-1].Point], _i)
 
         #iterate the curves, creating the dictionary for each curve
         #that lists it's wire edges keyed by it's Edge index
@@ -206,31 +275,19 @@ class Alignment(Draft._Wire):
             if curve['Type'] == 'Line':
                 continue
 
-            curve_edges = self.Object.Shape.Edges
-            curve_pts = [curve['Start'], curve['End']]
             edge_dict = {}
 
-            #iterate edge list, add edges that fall within curve limits
-            for _i, edge in enumerate(curve_edges):
-
-                edge_pts = [edge.Vertexes[0].Point, edge.Vertexes[1].Point]
-
-                #empty list means we haven't found the start yet
-                if not edge_dict:
-
-                    if not support.within_tolerance(curve_pts[0], edge_pts[0]):
-                        continue
+            _start = starts.get([curve['Start']])
 
-                #still here?  then we're within the geometry
-                edge_dict['Edge' + str(_i + 1)] = edge
+            if _start is not None:
 
-                #if this edge fits the end, we're done
-                if support.within_tolerance(curve_pts[1], edge_pts[1]):
-                    break
+                #no edge at the end point runs the curve to the last edge
+                _end = ends.get([curve['End']], len(curve_edges) - 1)
 
-            #calculate a unique hash based on the curve start and end points
-            #and save the edge list to it
+                for _i in range(_start, max(_start, _end) + 1):
+                    edge_dict['Edge' + str(_i + 1)] = curve_edges[_i]
 
+            #save the edge list to the curve's start / end point hash
             curve_dict[curve['Hash']] = edge_dict
 
         self.curve_edges = curve_dict
@@ -272,19 +329,35 @@ class Alignment(Draft._Wire):
         if not curve_hash:
             return self.model.data['geometry']
 
-        for _geo in self.model.data['geometry']:
+        _geometry = [_g for _g in self.model.data['geometry'] if _g]
+
+        for _geo in _geometry:
 
             if _geo['Hash'] == curve_hash:
                 return _geo
 
+        #fall back to the neighbouring grid cells of each curve, for
+        #hashes of coordinates which have drifted across a cell boundary
+        _tolerance = spatial_hash.get_tolerance()
+
+        for _geo in _geometry:
+
+            if curve_hash in spatial_hash.get_probe_hashes(
+                    _geo['Start'], _geo['End'], tolerance=_tolerance):
+                return _geo
+
         return None
 
     def set_geometry(self, geometry):
         """
-        Assign geometry to the alignment object
+        Assign geometry to the alignment object, as alignment data or a
+        constructed AlignmentModel
         """
 
-        self.model = alignment_model.AlignmentModel(geometry)
+        if not isinstance(geometry, alignment_model.AlignmentModel):
+            geometry = alignment_model.AlignmentModel(geometry)
+
+        self.model = geometry
 
         self.assign_meta_data()
 
@@ -324,70 +397,11 @@ class Alignment(Draft._Wire):
         Discretizes the alignment geometry to a series of vector points
         """
 
-        geometry = self.model.data['geometry']
-        points = [[App.Vector()]]
-        last_curve = None
-        hashes = {}
-
-        #discretize each arc in the geometry list,
-        #store each point set as a sublist in the main points list
-        for curve in geometry:
-
-            if not curve:
-                continue
-
-            curve_hash = hash(tuple(curve['Start']) + tuple(curve['End']))
-
-            if curve['Type'] == 'Curve':
-
-                _pts, _hsh = arc.get_points(curve, interval, interval_type)
-
-                points.append(_pts)
-                hashes = {**hashes,
-                          **dict.fromkeys(set(_hsh), curve_hash)}
-
-            elif curve['Type'] == 'Line':
-                points.append([curve['Start'], curve['End']])
-
-            last_curve = curve
-
-        self.hashes = hashes
-
-        #store the last point of the first geometry for the next iteration
-        _prev = points[0][-1]
-        result = points[0]
-
-        if not (_prev and result):
-            return None
-
-        #iterate the point sets, adding them to the result set
-        #and eliminating any duplicate points
-        for item in points[1:]:
-
-            if _prev.sub(item[0]).Length < 0.0001:
-                result.extend(item[1:])
-            else:
-                result.extend(item)
-
-            _prev = item[-1]
-
-        last_tangent = abs(
-            self.model.data['meta']['Length'] \
-                - last_curve['InternalStation'][1]
-            )
-
-        if not support.within_tolerance(last_tangent):
-            _vec = support.vector_from_angle(last_curve['BearingOut'])\
-                .multiply(last_tangent)
-
-            last_point = result[-1]
-
-            result.append(last_point.add(_vec))
-
-        if not self.model.data['meta'].get('End'):
-            self.model.data['meta']['End'] = result[-1]
+        points, self.hashes = self.model.discretize_geometry(
+            interval, interval_type
+        )
 
-        return result
+        return points
 
     def onChanged(self, obj, prop):
         """
@@ -397,6 +411,14 @@ class Alignment(Draft._Wire):
         if hasattr(self, 'no_execute'):
             return
 
+        #coalesce discretization changes into a single recompute,
+        #except for properties loaded as the document is restored
+        _restoring = 'Restore' in obj.State \
+            or getattr(self, 'restore_pending', False)
+
+        if prop in ['Method', 'Seg_Value'] and not _restoring:
+            RecomputeScheduler().mark_dirty(obj)
+
         if prop == "Method":
 
             _prop = obj.getPropertyByName(prop)
@@ -410,6 +432,7 @@ class Alignment(Draft._Wire):
             elif _prop == 'Tolerance':
                 self.Object.Seg_Value = int(1000.0 / units.scale_factor()) / 100.0
 
+    @instrumentation.timed('recompute')
     def execute(self, obj):
         """
         Recompute callback
@@ -417,6 +440,14 @@ class Alignment(Draft._Wire):
         if hasattr(self, 'no_execute'):
             return
 
+        _scheduler = RecomputeScheduler()
+
+        #batched changes are recomputed once, when the batch ends
+        if _scheduler.is_deferred(obj):
+            return
+
+        _scheduler.discard(obj)
+
         points = self.discretize_geometry(
             self.Object.Seg_Value, self.Object.Method)
 
@@ -432,6 +463,9 @@ class Alignment(Draft._Wire):
 
         super(Alignment, self).execute(obj)
 
+        #edges are rebuilt from the new shape on next access
+        self.curve_edges = None
+
 
 class _ViewProviderHorizontalAlignment:
 
@@ -483,3 +517,185 @@ class _ViewProviderHorizontalAlignment:
         Handle individual property changes
         """
         pass
+
+
+class _ViewProviderAlignment(Draft._ViewProviderWire):
+    """
+    Wire view provider adding a 'LOD' display mode, which draws a
+    decimated copy of the alignment points matched to the screen
+    resolution at which it is viewed
+    """
+
+    #number of decimated levels and the tolerance ratio between them
+    LEVELS = 5
+    RATIO = 4.0
+
+    def __init__(self, vobj):
+        """
+        Constructor
+        """
+
+        self.lod = None
+        self.tolerances = []
+
+        super(_ViewProviderAlignment, self).__init__(vobj)
+
+    def attach(self, vobj):
+        """
+        View provider scene graph initialization
+        """
+
+        from pivy import coin
+
+        super(_ViewProviderAlignment, self).attach(vobj)
+
+        self.lod = {
+            'root': coin.SoSeparator(),
+            'color': coin.SoBaseColor(),
+            'style': coin.SoDrawStyle(),
+            'select': coin.SoCallback(),
+            'switch': coin.SoSwitch(),
+            'center': coin.SbVec3f(0.0, 0.0, 0.0)
+        }
+
+        #choose the level as the scene is traversed for rendering
+        self.lod['select'].setCallback(self.select_level)
+
+        for _k in ['color', 'style', 'select', 'switch']:
+            self.lod['root'].addChild(self.lod[_k])
+
+        self.update_style(vobj)
+
+        vobj.addDisplayMode(self.lod['root'], 'LOD')
+
+    def getDisplayModes(self, vobj):
+        """
+        Valid display modes
+        """
+
+        return super(_ViewProviderAlignment, self).getDisplayModes(vobj) \
+            + ['LOD']
+
+    def updateData(self, obj, prop):
+        """
+        Property update handler
+        """
+
+        super(_ViewProviderAlignment, self).updateData(obj, prop)
+
+        if prop == 'Points':
+            self.build_levels(obj.Points)
+
+    def onChanged(self, vobj, prop):
+        """
+        Handle individual property changes
+        """
+
+        super(_ViewProviderAlignment, self).onChanged(vobj, prop)
+
+        if prop in ['LineColor', 'LineWidth']:
+            self.update_style(vobj)
+
+    def update_style(self, vobj):
+        """
+        Match the LOD line style to the wire style
+        """
+
+        if not self.lod:
+            return
+
+        if hasattr(vobj, 'LineColor'):
+            self.lod['color'].rgb = vobj.LineColor[0:3]
+
+        if hasattr(vobj, 'LineWidth'):
+            self.lod['style'].lineWidth = vobj.LineWidth
+
+    def build_levels(self, points):
+        """
+        Rebuild the point pyramid as one line set per level
+        """
+
+        from pivy import coin
+
+        if not self.lod:
+            return
+
+        _switch = self.lod['switch']
+        _switch.removeAllChildren()
+
+        _points = numpy.array([tuple(_v) for _v in points], dtype=float)
+
+        if not len(_points):
+            self.tolerances = []
+            return
+
+        self.tolerances = simplify.get_tolerances(
+            _points, self.LEVELS, self.RATIO
+        )
+
+        self.lod['center'] = coin.SbVec3f(
+            *((_points.min(axis=0) + _points.max(axis=0)) / 2.0).tolist()
+        )
+
+        for _level in simplify.build_pyramid(_points, self.tolerances):
+
+            _coord = coin.SoCoordinate3()
+            _coord.point.setValues(0, len(_level), _level.tolist())
+
+            _line = coin.SoLineSet()
+            _line.numVertices.setValue(len(_level))
+
+            _node = coin.SoSeparator()
+            _node.addChild(_coord)
+            _node.addChild(_line)
+
+            _switch.addChild(_node)
+
+        _switch.whichChild = 0
+
+    def select_level(self, user_data, action):
+        """
+        SoCallback which selects the coarsest level whose tolerance is
+        under half a pixel at the current view scale
+        """
+
+        from pivy import coin
+
+        #levels are rebuilt on the first Points update after a restore
+        if not getattr(self, 'tolerances', None):
+            return
+
+        if not action.isOfType(coin.SoGLRenderAction.getClassTypeId()):
+            return
+
+        _state = action.getState()
+
+        _volume = coin.SoViewVolumeElement.get(_state)
+        _height = coin.SoViewportRegionElement.get(_state) \
+            .getViewportSizePixels()[1]
+
+        if not _height:
+            return
+
+        _center = coin.SoModelMatrixElement.get(_state) \
+            .multVecMatrix(self.lod['center'])
+
+        #world size of one pixel at the alignment center
+        _pixel = _volume.getWorldToScreenScale(_center, 1.0) / _height
+
+        _level = 0
+
+        for _i, _tol in enumerate(self.tolerances):
+
+            if _tol > _pixel / 2.0:
+                break
+
+            _level = _i + 1
+
+        _which = self.lod['switch'].whichChild
+
+        #change the level without scheduling another redraw
+        if _which.getValue() != _level:
+            _which.enableNotify(False)
+            _which.setValue(_level)
+            _which.enableNotify(True)
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#*                                                                     *
+#* Copyright (c) 2019, Joel Graff <monograff76@gmail.com               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+
+"""
+Compare two versions of a set of alignments.
+
+Geometry elements are keyed by a tolerant hash of their absolute
+coordinates and the element sequences are matched, reporting the
+station intervals which changed between the versions.  Stations are in
+document units and account for station equations.  Unchanged elements
+whose stationing moved are reported as shifts, which do not require
+geometry to be rebuilt.
+"""
+
+import argparse
+import difflib
+import json
+import os
+
+from ..geometry import spatial_hash
+from .alignment_model import AlignmentModel
+from . import model_pipeline
+
+__title__ = 'alignment_diff.py'
+__author__ = 'Joel Graff'
+__url__ = "https://www.freecadweb.org"
+
+def read_file(path):
+    """
+    Import the alignments of a LandXML file
+    """
+
+    from ..project.xml.alignment_importer import AlignmentImporter
+
+    importer = AlignmentImporter(interactive=False)
+    data = importer.import_file(path)
+
+    if not data:
+        raise ValueError('Unable to read {}: {}'.format(
+            path, '; '.join(importer.errors)))
+
+    return data['Alignments']
+
+def get_models(source, workers=None):
+    """
+    Return a dictionary of AlignmentModels keyed by alignment name.
+    source - a LandXML path, imported LandXML data, alignment data,
+             an AlignmentModel or a dictionary of alignment data / models
+    """
+
+    if isinstance(source, (str, os.PathLike)):
+        source = read_file(source)
+
+    elif isinstance(source, AlignmentModel) or 'geometry' in source:
+        source = {source_name(source): source}
+
+    elif 'Alignments' in source:
+        source = source['Alignments']
+
+    result = {
+        _k: _v for _k, _v in source.items() if isinstance(_v, AlignmentModel)
+    }
+
+    _names = [_k for _k in source if _k not in result]
+
+    _models = model_pipeline.construct_models(
+        [source[_k] for _k in _names], workers)
+
+    result.update(zip(_names, _models))
+
+    return result
+
+def source_name(source):
+    """
+    Return the ID of an alignment's data or model
+    """
+
+    if isinstance(source, AlignmentModel):
+        source = source.data
+
+    return source['meta'].get('ID') or ''
+
+def get_elements(model, tolerance=None, reference=None):
+    """
+    Return the keys and station intervals of the geometry elements of a
+    model.  Keys are the element type and the hash of it's absolute
+    start, end and center coordinates, so a moved datum does not change
+    the keys of unchanged elements.
+
+    reference - optional keys of another version.  Elements whose
+                coordinates are within the tolerance of a grid cell of
+                a reference key take that key.
+    """
+
+    if not tolerance:
+        tolerance = spatial_hash.get_tolerance()
+
+    reference = set(reference or [])
+
+    datum = model.get_datum()
+    keys = []
+    positions = []
+
+    for _geo in model.data['geometry']:
+
+        if not _geo:
+            continue
+
+        _points = [
+            _geo[_k].add(datum) for _k in ['Start', 'End', 'Center']
+            if _geo.get(_k) is not None
+        ]
+
+        _probes = [
+            (_geo['Type'], _h) for _h in
+            spatial_hash.get_probe_hashes(*_points, tolerance=tolerance)
+        ]
+
+        #the exact key is first, so it is kept if there is no match
+        keys.append(
+            next((_k for _k in _probes if _k in reference), _probes[0])
+        )
+
+        positions.append(_geo.get('InternalStation') or (0.0, 0.0))
+
+    intervals = []
+
+    if positions:
+        intervals = [
+            tuple(_v) for _v in model.get_stations(positions).tolist()
+        ]
+
+    return keys, intervals
+
+def get_span(intervals, start, end):
+    """
+    Return the station interval of a range of elements.  Empty ranges
+    return the zero-length interval at the position of the range.
+    """
+
+    if start < end:
+        return (intervals[start][0], intervals[end - 1][1])
+
+    if start < len(intervals):
+        return (intervals[start][0],) * 2
+
+    if intervals:
+        return (intervals[-1][1],) * 2
+
+    return (0.0, 0.0)
+
+def merge_intervals(intervals, tolerance=0.0):
+    """
+    Merge overlapping or adjacent intervals, returning a sorted list
+    """
+
+    result = []
+
+    for _lo, _hi in sorted(intervals):
+
+        if result and _lo <= result[-1][1] + tolerance:
+            result[-1] = (result[-1][0], max(result[-1][1], _hi))
+            continue
+
+        result.append((_lo, _hi))
+
+    return result
+
+def diff_models(old, new, tolerance=None):
+    """
+    Compare two AlignmentModels, returning a dictionary of:
+
+    changes - list of changes with the operation ('replace', 'insert',
+              'delete' or 'shift'), the old and new station intervals and
+              the station offset of shifted elements
+    old_intervals / new_intervals - merged station intervals of the
+              changed geometry in each version, excluding shifts
+    """
+
+    if not tolerance:
+        tolerance = spatial_hash.get_tolerance()
+
+    _old_keys, _old_sta = get_elements(old, tolerance)
+    _new_keys, _new_sta = get_elements(new, tolerance, _old_keys)
+
+    matcher = difflib.SequenceMatcher(
+        None, _old_keys, _new_keys, autojunk=False)
+    changes = []
+
+    for _op, _i1, _i2, _j1, _j2 in matcher.get_opcodes():
+
+        _old = get_span(_old_sta, _i1, _i2)
+        _new = get_span(_new_sta, _j1, _j2)
+
+        #matching elements have equal lengths, so a block shifts as a whole
+        if _op == 'equal':
+
+            _offset = _new[0] - _old[0]
+
+            if abs(_offset) <= tolerance:
+                continue
+
+            _op = 'shift'
+
+        changes.append({
+            'op': _op, 'old': _old, 'new': _new, 'offset': _new[0] - _old[0]
+        })
+
+    _edits = [_c for _c in changes if _c['op'] != 'shift']
+
+    return {
+        'changes': changes,
+        'old_intervals':
+            merge_intervals([_c['old'] for _c in _edits], tolerance),
+        'new_intervals':
+            merge_intervals([_c['new'] for _c in _edits], tolerance)
+    }
+
+def diff(old, new, workers=None):
+    """
+    Compare two alignment sources (see get_models()), returning a
+    dictionary keyed by alignment name of diff_models() results and the
+    status of each alignment: 'added', 'removed', 'changed', 'shifted'
+    or 'unchanged'
+    """
+
+    _old = get_models(old, workers)
+    _new = get_models(new, workers)
+
+    result = {}
+
+    for _name in list(_old) + [_k for _k in _new if _k not in _old]:
+
+        _models = [_old.get(_name), _new.get(_name)]
+
+        #diff missing alignments against an empty model
+        for _i, _m in enumerate(_models):
+
+            if _m is None:
+                _models[_i] = AlignmentModel()
+                _models[_i].data = {
+                    'meta': {'Start': _models[1 - _i].get_datum()},
+                    'geometry': []
+                }
+
+        _diff = diff_models(*_models)
+
+        if _name not in _new:
+            _diff['status'] = 'removed'
+
+        elif _name not in _old:
+            _diff['status'] = 'added'
+
+        elif _diff['old_intervals'] or _diff['new_intervals']:
+            _diff['status'] = 'changed'
+
+        elif _diff['changes']:
+            _diff['status'] = 'shifted'
+
+        else:
+            _diff['status'] = 'unchanged'
+
+        result[_name] = _diff
+
+    return result
+
+def main(argv=None):
+    """
+    Command line entry point.  Prints the diff of two LandXML files as
+    JSON and returns non-zero if any alignment differs.
+    """
+
+    parser = argparse.ArgumentParser(
+        description='Report the changed station ranges between two '
+                    'versions of a LandXML alignment file')
+
+    parser.add_argument('old', help='previous LandXML file')
+    parser.add_argument('new', help='revised LandXML file')
+    parser.add_argument('-j', '--workers', type=int,
+                        help='number of worker processes')
+
+    args = parser.parse_args(argv)
+
+    result = diff(args.old, args.new, args.workers)
+
+    print(json.dumps(result, indent=1))
+
+    return int(any(_v['status'] != 'unchanged' for _v in result.values()))
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -25,10 +25,13 @@
 Class for managing 2D Horizontal Alignment data
 """
 
+import numpy
+
 import FreeCAD as App
 
 from ..project.support import units
-from ..geometry import arc, line, support
+from ..project.support.utils import Constants as C
+from ..geometry import arc, line, spatial_hash, support
 
 _CLASS_NAME = 'AlignmentModel'
 _TYPE = 'AlignmentModel'
@@ -37,6 +40,83 @@ __title__ = 'alignment_model.py'
 __author__ = 'Joel Graff'
 __url__ = "https://www.freecadweb.org"
 
+#structured validation records - the geometry index, the check which
+#flagged it, the measured value and the expected value
+ERROR_DTYPE = numpy.dtype([
+    ('index', numpy.int64), ('code', 'U16'),
+    ('value', numpy.float64), ('expected', numpy.float64)
+])
+
+def get_error_array(index, code, value, expected):
+    """
+    Return a structured array of validation records
+    """
+
+    result = numpy.zeros(len(index), dtype=ERROR_DTYPE)
+
+    result['index'] = index
+    result['code'] = code
+    result['value'] = value
+    result['expected'] = expected
+
+    return result
+
+def get_angle_delta(lhs, rhs):
+    """
+    Return the absolute difference between angles, accounting for
+    wrapping at 2 * pi
+    """
+
+    return numpy.abs(numpy.mod(lhs - rhs + numpy.pi, C.TWO_PI) - numpy.pi)
+
+def get_pi_data(meta, pis, radii, station=None):
+    """
+    Return alignment data for a polyline of PIs, with a curve of the
+    given radius at each interior PI.  The start, end and length are
+    taken from the PIs, while tangent lines and stationing are added
+    when the data is constructed.
+
+    meta - alignment meta data, copied into the result
+    pis - list of PI vectors in internal units
+    radii - curve radius at each PI in internal units.  The radii of the
+            end PIs are ignored, as are zero radii and collinear PIs.
+    station - optional list of station equations
+    """
+
+    geometry = []
+    _prev = pis[0]
+    _length = 0.0
+
+    for _i in range(1, len(pis) - 1):
+
+        if not radii[_i]:
+            continue
+
+        _curve = arc.get_pi_curve(pis[_i - 1], pis[_i], pis[_i + 1], radii[_i])
+
+        if not _curve:
+            continue
+
+        _length += _curve['Start'].sub(_prev).Length \
+            + _curve['Radius'] * _curve['Delta']
+
+        _prev = _curve['End']
+
+        geometry.append(_curve)
+
+    _length += pis[-1].sub(_prev).Length
+
+    #a tangent alignment is a single line
+    if not geometry:
+        geometry.append(
+            line.get_parameters({'Start': pis[0], 'End': pis[-1]})
+        )
+
+    meta = dict(meta)
+    meta.update({'Start': pis[0], 'End': pis[-1], 'Length': _length})
+
+    return {'meta': meta, 'station': station or [], 'geometry': geometry}
+
 #Construction order:
 #Calc arc parameters
 #Sort arcs
@@ -52,10 +132,125 @@ class AlignmentModel:
         """
         self.errors = []
         self.data = []
+        self.validation = []
 
         if geometry:
             self.construct_geometry(geometry)
 
+    def get_validation(self):
+        """
+        Return the structured array of validation records
+        """
+
+        if not self.validation:
+            return numpy.zeros(0, dtype=ERROR_DTYPE)
+
+        return numpy.concatenate(self.validation)
+
+    def add_validation(self, records):
+        """
+        Add structured validation records
+        """
+
+        if len(records):
+            self.validation.append(records)
+
+    def get_columns(self):
+        """
+        Return the geometry as a dictionary of columnar arrays, skipping
+        undefined geometry.  Missing values are NaN.
+
+        index - index of each row in the geometry list
+        start / end - (n, 3) arrays of coordinates
+        bearing_in / bearing_out / length - (n,) arrays
+        internal_station - (n, 2) array of start / end internal stations
+        """
+
+        _geo = [(_i, _g) for _i, _g in enumerate(self.data['geometry']) if _g]
+        _nan = (numpy.nan,) * 3
+
+        def _vectors(key):
+            return numpy.array([
+                _nan if _g.get(key) is None else tuple(_g[key])
+                for _i, _g in _geo
+            ], dtype=float).reshape(-1, 3)
+
+        def _floats(key):
+            return numpy.array([
+                numpy.nan if _g.get(key) is None else _g[key]
+                for _i, _g in _geo
+            ], dtype=float)
+
+        return {
+            'index': numpy.array([_i for _i, _g in _geo], dtype=int),
+            'start': _vectors('Start'),
+            'end': _vectors('End'),
+            'bearing_in': _floats('BearingIn'),
+            'bearing_out': _floats('BearingOut'),
+            'length': _floats('Length'),
+            'internal_station': numpy.array([
+                _g.get('InternalStation') or (numpy.nan, numpy.nan)
+                for _i, _g in _geo
+            ], dtype=float).reshape(-1, 2)
+        }
+
+    @staticmethod
+    def check_bearings(columns):
+        """
+        Return validation records for geometry whose incoming bearing
+        does not match the outgoing bearing of the previous geometry
+        """
+
+        _in = columns['bearing_in'][1:]
+        _out = columns['bearing_out'][:-1]
+
+        #NaN comparisons fail, flagging missing bearings
+        _mask = ~(get_angle_delta(_in, _out) <= C.TOLERANCE)
+
+        return get_error_array(
+            columns['index'][1:][_mask], 'bearing', _in[_mask], _out[_mask]
+        )
+
+    @staticmethod
+    def check_gaps(columns, datum):
+        """
+        Return validation records for geometry which does not start at
+        the end of the previous geometry (or the datum)
+        """
+
+        _prev = numpy.vstack([tuple(datum), columns['end'][:-1]])
+        _gap = numpy.linalg.norm(columns['start'] - _prev, axis=1)
+
+        _mask = ~(_gap <= C.TOLERANCE)
+
+        return get_error_array(
+            columns['index'][_mask], 'gap', _gap[_mask], 0.0
+        )
+
+    @staticmethod
+    def check_stationing(columns, datum):
+        """
+        Return validation records for geometry whose distance from the
+        previous geometry (or the datum) differs from the distance
+        between their internal stations
+        """
+
+        _sf = units.scale_factor()
+
+        _prev = numpy.vstack([tuple(datum), columns['end'][:-1]])
+        _dist = numpy.linalg.norm(columns['start'] - _prev, axis=1)
+
+        _sta = columns['internal_station']
+        _prev_sta = numpy.concatenate([[0.0], _sta[:-1, 1]])
+        _sta_len = numpy.abs(_sta[:, 0] - _prev_sta)
+
+        _mask = ~(numpy.abs(_dist - _sta_len) / _sf <= C.TOLERANCE)
+
+        return get_error_array(
+            columns['index'][_mask], 'station', _dist[_mask] / _sf,
+            _sta_len[_mask] / _sf
+        )
+
     def get_datum(self):
         """
         Return the alignment datum
@@ -84,6 +279,76 @@ class AlignmentModel:
 
         pass
 
+    def discretize_geometry(self, interval=10.0, interval_type='Segment'):
+        """
+        Discretizes the alignment geometry to a series of vector points.
+        Returns the list of points and a dictionary of the curve hashes
+        keyed to the hashes of the points on each curve.
+        """
+
+        geometry = self.data['geometry']
+        points = [[App.Vector()]]
+        last_curve = None
+        hashes = {}
+
+        #discretize each arc in the geometry list,
+        #store each point set as a sublist in the main points list
+        for curve in geometry:
+
+            if not curve:
+                continue
+
+            curve_hash = curve['Hash']
+
+            if curve['Type'] == 'Curve':
+
+                _pts, _hsh = arc.get_points(curve, interval, interval_type)
+
+                points.append(_pts)
+                hashes = {**hashes,
+                          **dict.fromkeys(set(_hsh), curve_hash)}
+
+            elif curve['Type'] == 'Line':
+                points.append([curve['Start'], curve['End']])
+
+            last_curve = curve
+
+        #store the last point of the first geometry for the next iteration
+        _prev = points[0][-1]
+        result = points[0]
+
+        if not (_prev and result):
+            return None, hashes
+
+        #iterate the point sets, adding them to the result set
+        #and eliminating any duplicate points
+        for item in points[1:]:
+
+            if _prev.sub(item[0]).Length < 0.0001:
+                result.extend(item[1:])
+            else:
+                result.extend(item)
+
+            _prev = item[-1]
+
+        last_tangent = abs(
+            self.data['meta']['Length'] \
+                - last_curve['InternalStation'][1]
+            )
+
+        if not support.within_tolerance(last_tangent):
+            _vec = support.vector_from_angle(last_curve['BearingOut'])\
+                .multiply(last_tangent)
+
+            last_point = result[-1]
+
+            result.append(last_point.add(_vec))
+
+        if not self.data['meta'].get('End'):
+            self.data['meta']['End'] = result[-1]
+
+        return result, hashes
+
     def construct_geometry(self, geometry):
         """
         Assign geometry to the alignment object
@@ -121,6 +386,9 @@ class AlignmentModel:
 
         self.zero_reference_coordinates()
 
+        #hash after zeroing, as the coordinates have shifted
+        self.assign_hashes()
+
         return True
 
     def zero_reference_coordinates(self):
@@ -140,6 +408,15 @@ class AlignmentModel:
 
                 _geo[_key] = _geo[_key].sub(datum)
 
+    def assign_hashes(self):
+        """
+        Assign grid hashes of the start and end coordinates to the
+        geometry, including lines added to fill gaps
+        """
+
+        for _geo in self.data['geometry']:
+            _geo['Hash'] = spatial_hash.get_hash(_geo['Start'], _geo['End'])
+
     def validate_alignment(self):
         """
         Ensure the alignment geometry is continuous.
@@ -147,34 +424,36 @@ class AlignmentModel:
         must be filled by a completely defined line
         """
 
-        _prev_coord = self.get_datum()
-        _geo_list = []
+        columns = self.get_columns()
+        gaps = self.check_gaps(columns, self.get_datum())
 
-        for _geo in self.data['geometry']:
+        self.add_validation(gaps)
 
-            if not _geo:
-                continue
+        _geo_data = self.data['geometry']
+        _geo_list = [_geo_data[_i] for _i in columns['index']]
+        _length = float(numpy.nansum(columns['length']))
 
-            _coord = _geo['Start']
+        #fill the gaps in reverse so the insertion points stay valid
+        _positions = numpy.searchsorted(columns['index'], gaps['index'])
 
-            if not support.within_tolerance(_coord.Length, _prev_coord.Length):
+        for _k in _positions[::-1]:
 
-                #build the line using the provided parameters and add it
-                _geo_list.append(
-                    line.get_parameters({'Start': App.Vector(_prev_coord),
-                                         'End': App.Vector(_coord),
-                                         'BearingIn': _geo['BearingIn'],
-                                         'BearingOut': _geo['BearingOut'],
-                                         })
-                )
+            _geo = _geo_list[_k]
+            _prev_coord = self.get_datum()
 
-            _geo_list.append(_geo)
-            _prev_coord = _geo['End']
+            if _k:
+                _prev_coord = _geo_list[_k - 1]['End']
 
-        _length = 0.0
+            #build the line using the provided parameters and add it
+            _line = line.get_parameters({'Start': App.Vector(_prev_coord),
+                                         'End': App.Vector(_geo['Start']),
+                                         'BearingIn': _geo['BearingIn'],
+                                         'BearingOut': _geo['BearingOut'],
+                                        })
 
-        for _geo in _geo_list:
-            _length += _geo['Length']
+            if _line:
+                _geo_list.insert(_k, _line)
+                _length += _line['Length']
 
         align_length = self.data['meta']['Length']
 
@@ -212,7 +491,8 @@ class AlignmentModel:
         _geo = self.data['geometry'][0]
 
         if not _geo or not _datum:
-            print('Unable to validate alignment datum')
+            self.add_validation(get_error_array([0], 'datum', numpy.nan, 0.0))
+            self.errors.append('Unable to validate alignment datum')
             return
 
         _datum_truth = [not _datum.get('StartStation') is None,
@@ -308,16 +588,31 @@ class AlignmentModel:
         #internal station and coordinate vectors
 
         _datum = self.data['meta']
-        _geo_data = self.data['geometry']
+
+        columns = self.get_columns()
+        flagged = self.check_stationing(columns, _datum['Start'])
+
+        self.add_validation(flagged)
+
+        if not len(flagged):
+            return
+
+        #fixes cascade, so correct sequentially from the first flagged
+        #geometry onward
+        _first = numpy.searchsorted(columns['index'], flagged['index'][0])
+
+        _geo_data = [
+            self.data['geometry'][_i] for _i in columns['index'][_first:]
+        ]
 
         _prev_geo = {'End': _datum['Start'], 'InternalStation': (0.0, 0.0),
                      'StartStation': _datum['StartStation'], 'Length': 0.0
                     }
 
-        for _geo in _geo_data:
+        if _first:
+            _prev_geo = self.data['geometry'][columns['index'][_first - 1]]
 
-            if not _geo:
-                continue
+        for _geo in _geo_data:
 
             #get the vector between the two gemetries
             #and the station distance
@@ -332,7 +627,7 @@ class AlignmentModel:
 
             #if the stationing / coordinates are out of tolerance,
             #the error is with the coordinate vector or station
-            if not support.within_tolerance(_delta):
+            if abs(_delta) > C.TOLERANCE:
                 bearing_angle = support.get_bearing(_vector)
 
                 #fix station if coordinate vector bearings match
@@ -371,32 +666,26 @@ class AlignmentModel:
         if geo_data[0] is None:
             return False
 
-        prev_bearing = geo_data[0]['BearingOut']
+        flagged = self.check_bearings(self.get_columns())
 
-        for _geo in geo_data[1:]:
+        self.add_validation(flagged)
 
-            if not _geo:
-                continue
+        if not len(flagged):
+            return True
 
-            _b = _geo.get('BearingIn')
+        _rec = flagged[0]
+        _msg = 'Bearing mismatch'
 
-            if _b is None:
-                self.errors.append(
-                    'Invalid bearings ({0:.4f}, {1:.4f}) at curve {2}'\
-                        .format(prev_bearing, _b, _geo)
-                )
-                return False
+        if numpy.isnan(_rec['value']):
+            _msg = 'Invalid bearings'
 
-            if not support.within_tolerance(_b, prev_bearing):
-                self.errors.append(
-                    'Bearing mismatch ({0:.4f}, {1:.4f}) at curve {2}'\
-                        .format(prev_bearing, _b, _geo)
-                )
-                return False
-
-            prev_bearing = _geo.get('BearingOut')
+        self.errors.append(
+            '{0} ({1:.4f}, {2:.4f}) at curve {3}'.format(
+                _msg, _rec['expected'], _rec['value'],
+                geo_data[_rec['index']])
+        )
 
-        return True
+        return False
 
     def validate_stationing(self):
         """
@@ -410,7 +699,9 @@ class AlignmentModel:
         prev_coord = self.data['meta'].get('Start')
 
         if (prev_coord is None) or (prev_station is None):
-            print('Unable to validate alignment stationing')
+            self.add_validation(
+                get_error_array([0], 'stationing', numpy.nan, 0.0))
+            self.errors.append('Unable to validate alignment stationing')
             return
 
         for _geo in self.data['geometry']:
@@ -476,6 +767,38 @@ class AlignmentModel:
 
         return position * units.scale_factor()
 
+    def get_stations(self, positions):
+        """
+        Return the stations of an array of internal stations (positions
+        along the alignment in document units), applying the station
+        equations.  The inverse of get_internal_station().
+        """
+
+        start_sta = self.data['meta'].get('StartStation') or 0.0
+
+        #position and station at the start of each equation's range
+        _pos = [0.0]
+        _sta = [start_sta]
+
+        for _eq in (self.data.get('station') or [])[1:]:
+
+            if isinstance(_eq, dict):
+                _back, _ahead = _eq['Back'], _eq['Ahead']
+
+            else:
+                _back, _ahead = _eq.x, _eq.y
+
+            _pos.append(_pos[-1] + _back - _sta[-1])
+            _sta.append(_ahead)
+
+        positions = numpy.asarray(positions, dtype=float) / units.scale_factor()
+
+        _i = numpy.maximum(
+            numpy.searchsorted(_pos, positions, side='right') - 1, 0
+        )
+
+        return numpy.array(_sta)[_i] + positions - numpy.array(_pos)[_i]
+
     def locate_curve(self, station):
         """
         Retrieve the curve at the specified station
@@ -29,9 +29,6 @@
 
 import os
 
-import numpy as np
-from scipy import interpolate
-
 import FreeCAD as App
 import FreeCADGui as Gui
 import Part
@@ -104,6 +101,10 @@ class Generate3dAlignment():
         Build a 3D alignment from the supplied alignments
         """
 
+        #deferred to keep numpy / scipy out of workbench start-up
+        import numpy as np
+        from scipy import interpolate
+
         parent = alignments[0].InList[0]
 
         #get list of geometry edges
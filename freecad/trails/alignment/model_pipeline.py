@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#*                                                                     *
+#* Copyright (c) 2019, Joel Graff <monograff76@gmail.com               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+
+"""
+Parallel construction of alignment models.
+
+Alignment data is converted to plain Python data (vectors as tuples),
+the models are constructed and validated in a process pool and the
+results are converted back.  Small jobs, the GUI, platforms without
+fork() and pool failures fall back to constructing the models serially,
+directly from the alignment data.
+"""
+
+import concurrent.futures
+import multiprocessing
+import os
+
+import FreeCAD as App
+
+from .alignment_model import AlignmentModel
+
+__title__ = 'model_pipeline.py'
+__author__ = 'Joel Graff'
+__url__ = "https://www.freecadweb.org"
+
+#fewer alignments than this are constructed serially
+MIN_PARALLEL = 8
+
+class PlainVector(tuple):
+    """
+    Vector coordinates as a picklable tuple, told apart from other tuples
+    so from_plain() restores every vector, wherever it is in the data
+    """
+
+    __slots__ = ()
+
+def to_plain(value):
+    """
+    Return a copy of the alignment data with vectors as tuples
+    """
+
+    if isinstance(value, App.Vector):
+        return PlainVector(value)
+
+    if isinstance(value, dict):
+        return {_k: to_plain(_v) for _k, _v in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return type(value)(to_plain(_v) for _v in value)
+
+    return value
+
+def from_plain(value):
+    """
+    Return a copy of plain alignment data with coordinate tuples
+    restored as vectors.  The inverse of to_plain().
+    """
+
+    if isinstance(value, PlainVector):
+        return App.Vector(*value)
+
+    if isinstance(value, dict):
+        return {_k: from_plain(_v) for _k, _v in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return type(value)(from_plain(_v) for _v in value)
+
+    return value
+
+def construct(data):
+    """
+    Construct and validate a model from plain data, returning the plain
+    model data, errors and validation records
+    """
+
+    model = AlignmentModel(from_plain(data))
+
+    return to_plain(model.data), model.errors, model.get_validation()
+
+def get_model(result):
+    """
+    Return the AlignmentModel for a construct() result
+    """
+
+    model = AlignmentModel()
+
+    model.data = from_plain(result[0])
+    model.errors = list(result[1])
+
+    if len(result[2]):
+        model.validation = [result[2]]
+
+    return model
+
+def get_pool_context():
+    """
+    Return the multiprocessing context for the pool, or None if models
+    must be built serially.  Only fork() is used, as spawned workers
+    would start the host executable (e.g. FreeCADCmd), and only without
+    the GUI, as forking the multithreaded GUI process can deadlock the
+    workers.
+    """
+
+    if App.GuiUp:
+        return None
+
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return None
+
+    return multiprocessing.get_context('fork')
+
+def construct_models(alignments, workers=None):
+    """
+    Construct and validate the models of a list of alignment data,
+    returning the list of AlignmentModels in the same order.  Models
+    constructed serially take ownership of (and modify) their data.
+    """
+
+    _context = get_pool_context()
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if len(alignments) >= MIN_PARALLEL and workers > 1 and _context:
+
+        _plain = [to_plain(_a) for _a in alignments]
+
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                workers, mp_context=_context) as _pool:
+
+                return [
+                    get_model(_r)
+                    for _r in _pool.map(construct, _plain, chunksize=4)
+                ]
+
+        #fall back to serial construction if the pool cannot run
+        except (OSError, concurrent.futures.process.BrokenProcessPool) as _ex:
+            App.Console.PrintWarning(
+                'Parallel alignment construction failed ({}), '
+                'constructing serially\n'.format(_ex)
+            )
+
+    return [AlignmentModel(_a) for _a in alignments]
@@ -0,0 +1,401 @@
+#***********************************************************************
+#*                                                                     *
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Headless batch processing of alignment files.
+
+Imports each LandXML or CSV file found in the input paths, validates and
+discretizes its alignments and writes the results, fanning the files
+out across a process pool.  A JSON report records the timings and
+errors of every file, and of every alignment within it.  CSV columns
+are matched to fields by their headers, or by a JSON mapping file
+(--csv-map).  Runs under FreeCADCmd or any Python interpreter which can
+import FreeCAD:
+
+    FreeCADCmd -c "from freecad.trails import batch; \
+        batch.main(['deliverables/', '-o', 'out/', '--report', 'r.json'])"
+
+    python -m freecad.trails.batch deliverables/ -o out/ -j 8 \
+        --csv-map headers.json --outputs points polyline
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import json
+import os
+import re
+import sys
+import time
+import traceback
+
+__title__ = "batch.py"
+__author__ = "Joel Graff"
+__url__ = "https://www.freecadweb.org"
+
+OUTPUTS = ['points', 'stations', 'polyline', 'npz', 'parquet']
+
+def find_files(paths, extensions=('.xml', '.csv')):
+    """
+    Return the sorted list of files with the extensions in the paths,
+    searching directories recursively
+    """
+
+    result = set()
+
+    for _path in paths:
+
+        if os.path.isfile(_path):
+            result.add(_path)
+            continue
+
+        for _root, _dirs, _files in os.walk(_path):
+
+            result.update(
+                os.path.join(_root, _f) for _f in _files
+                if os.path.splitext(_f)[1].lower() in extensions
+            )
+
+    return sorted(result)
+
+def get_file_name(name):
+    """
+    Return the name with characters unsafe for file names replaced
+    """
+
+    return re.sub(r'[^\w\-.]+', '_', name).strip('_') or 'alignment'
+
+def write_points(path, samples):
+    """
+    Write the (x, y, z) sample points to a CSV file
+    """
+
+    with open(path, 'w', newline='') as _f:
+
+        _writer = csv.writer(_f)
+        _writer.writerow(['x', 'y', 'z'])
+        _writer.writerows(
+            zip(*[samples[_k].tolist() for _k in ['x', 'y', 'z']]))
+
+def write_stations(path, samples):
+    """
+    Write the station, (x, y, z) and bearing of each sample to a CSV file
+    """
+
+    _keys = ['station', 'x', 'y', 'z', 'bearing']
+
+    with open(path, 'w', newline='') as _f:
+
+        _writer = csv.writer(_f)
+        _writer.writerow(_keys)
+        _writer.writerows(zip(*[samples[_k].tolist() for _k in _keys]))
+
+def write_polyline(path, samples):
+    """
+    Write the sample points as a 3D polyline to a BREP file
+    """
+
+    import Part
+    from FreeCAD import Vector
+
+    from .project.support import units
+
+    _scale = units.scale_factor()
+
+    Part.makePolygon([
+        Vector(*_p).multiply(_scale) for _p in
+        zip(*[samples[_k].tolist() for _k in ['x', 'y', 'z']])
+    ]).exportBrep(path)
+
+def process_alignment(name, data, options, target, timings):
+    """
+    Validate, discretize and export a single alignment,
+    returning the list of model errors.  CSV alignment data is converted
+    to alignment data first.
+    """
+
+    from .alignment.alignment_model import AlignmentModel
+    from .project import columnar_export, csv_reader
+
+    _time = time.perf_counter()
+
+    if 'geometry' not in data:
+
+        data = csv_reader.to_model_data(data)
+
+        if not data:
+            return ['No PIs to build the alignment from']
+
+    model = AlignmentModel(data)
+
+    timings['validate'] += time.perf_counter() - _time
+    _time = time.perf_counter()
+
+    samples = columnar_export.get_samples(
+        model, options['interval'], options['method'])
+
+    timings['discretize'] += time.perf_counter() - _time
+    _time = time.perf_counter()
+
+    if not len(samples['station']):
+        return model.errors + ['No geometry to discretize']
+
+    _name = os.path.join(target, get_file_name(name))
+    _outputs = options['outputs']
+
+    if 'points' in _outputs:
+        write_points(_name + '_points.csv', samples)
+
+    if 'stations' in _outputs:
+        write_stations(_name + '_stations.csv', samples)
+
+    if 'polyline' in _outputs:
+        write_polyline(_name + '_polyline.brep', samples)
+
+    if 'npz' in _outputs:
+        columnar_export.write_npz(_name + '.npz', samples)
+
+    if 'parquet' in _outputs:
+        columnar_export.write_parquet(_name + '.parquet', samples)
+
+    timings['export'] += time.perf_counter() - _time
+
+    return model.errors
+
+def read_xml(path, report):
+    """
+    Generator yielding the name and data of each alignment in a LandXML
+    file, recording the import errors and timing in the report
+    """
+
+    from .project.xml.alignment_importer import AlignmentImporter
+
+    importer = AlignmentImporter(interactive=False)
+
+    _time = time.perf_counter()
+    data = importer.import_file(path)
+    report['timings']['import'] = time.perf_counter() - _time
+
+    report['errors'].extend(importer.errors)
+
+    if not data:
+        report['status'] = 'failed'
+        return
+
+    yield from data['Alignments'].items()
+
+def read_csv(path, options, report):
+    """
+    Generator yielding the name and data of each alignment in a CSV
+    file.  Columns are matched to fields by the csv_map option - a list
+    of the field of each column, or a dictionary of file headers to
+    fields - or by the file headers if they are field names.
+    """
+
+    from .project import csv_reader
+
+    dialect, has_header, sample = csv_reader.sniff(path)
+    mapping = options.get('csv_map')
+
+    if isinstance(mapping, list):
+        headers = mapping
+
+    #headers are mapped by name, so the first row must be a header row
+    else:
+        headers = csv_reader.map_headers(sample, dialect, mapping)
+        has_header = True
+
+    if 'ID' not in headers:
+        report['status'] = 'failed'
+        report['errors'].append(
+            'No ID column.  Map the CSV headers with --csv-map.')
+        return
+
+    _names = set()
+
+    for _i, _data in enumerate(csv_reader.read_alignments(
+            path, headers, dialect, skip_header=has_header)):
+
+        _name = _data['meta'].get('ID') or 'alignment_{}'.format(_i)
+
+        #keep the outputs of alignments sharing an ID apart
+        if _name in _names:
+            _name = '{}_{}'.format(_name, _i)
+
+        _names.add(_name)
+
+        yield _name, _data
+
+def process_file(path, options):
+    """
+    Process a single file, returning it's report dictionary
+    """
+
+    _start = time.perf_counter()
+
+    report = {
+        'file': path,
+        'status': 'ok',
+        'alignments': 0,
+        'errors': [],
+        'timings': dict.fromkeys(
+            ['import', 'validate', 'discretize', 'export'], 0.0)
+    }
+
+    try:
+
+        _ext = os.path.splitext(path)[1].lower()
+
+        if _ext == '.xml':
+            alignments = read_xml(path, report)
+
+        elif _ext == '.csv':
+            alignments = read_csv(path, options, report)
+
+        else:
+            report['status'] = 'unsupported'
+            report['errors'].append('Unsupported file type')
+
+            return report
+
+        target = os.path.join(
+            options['output'],
+            get_file_name(os.path.splitext(os.path.basename(path))[0])
+        )
+
+        os.makedirs(target, exist_ok=True)
+
+        for _name, _data in alignments:
+
+            #a failed alignment does not stop the rest of the file
+            try:
+                _errors = process_alignment(
+                    _name, _data, options, target, report['timings']
+                )
+
+            except Exception:
+                _errors = [traceback.format_exc()]
+
+            report['errors'].extend(
+                '{}: {}'.format(_name, _e) for _e in _errors)
+
+            report['alignments'] += 1
+
+    except Exception:
+
+        report['status'] = 'failed'
+        report['errors'].append(traceback.format_exc())
+
+    finally:
+        report['timings']['total'] = time.perf_counter() - _start
+
+    if report['errors'] and report['status'] == 'ok':
+        report['status'] = 'errors'
+
+    return report
+
+def run(files, options, workers=None):
+    """
+    Process the files, in parallel where more than one worker is
+    requested, returning the list of reports in file order
+    """
+
+    from .alignment.model_pipeline import get_pool_context
+
+    #spawned workers would relaunch the interpreter (e.g. FreeCADCmd),
+    #so process serially where fork() is unavailable
+    _context = get_pool_context()
+
+    if workers == 1 or len(files) < 2 or not _context:
+        return [process_file(_f, options) for _f in files]
+
+    with concurrent.futures.ProcessPoolExecutor(
+        workers, mp_context=_context) as _pool:
+
+        _futures = [_pool.submit(process_file, _f, options) for _f in files]
+
+        return [_f.result() for _f in _futures]
+
+def main(argv=None):
+    """
+    Command line entry point.  Returns non-zero if any file failed.
+    """
+
+    parser = argparse.ArgumentParser(
+        description='Validate, discretize and export alignment files')
+
+    parser.add_argument('inputs', nargs='+',
+                        help='files or directories to process')
+    parser.add_argument('-o', '--output', default='.',
+                        help='output directory')
+    parser.add_argument('--outputs', nargs='+', choices=OUTPUTS,
+                        default=OUTPUTS[0:2], help='outputs to write')
+    parser.add_argument('--method', default='Segment',
+                        choices=['Segment', 'Interval', 'Tolerance'],
+                        help='curve subdivision method')
+    parser.add_argument('--interval', type=float, default=200.0,
+                        help='curve subdivision value for the method')
+    parser.add_argument('--csv-map',
+                        help='JSON file mapping CSV headers to fields, or '
+                             'listing the field of each column')
+    parser.add_argument('-j', '--workers', type=int,
+                        help='number of worker processes')
+    parser.add_argument('--report', help='path of the JSON report')
+
+    args = parser.parse_args(argv)
+
+    options = {
+        'output': args.output,
+        'outputs': args.outputs,
+        'method': args.method,
+        'interval': args.interval,
+        'csv_map': None
+    }
+
+    if args.csv_map:
+        with open(args.csv_map) as _f:
+            options['csv_map'] = json.load(_f)
+
+    files = find_files(args.inputs)
+
+    _time = time.perf_counter()
+    reports = run(files, options, args.workers)
+
+    summary = {
+        'files': len(files),
+        'alignments': sum(_r['alignments'] for _r in reports),
+        'failed': sum(_r['status'] == 'failed' for _r in reports),
+        'elapsed': time.perf_counter() - _time,
+        'reports': reports
+    }
+
+    for _r in reports:
+        print('{:<12} {:>8.3f}s  {}'.format(
+            _r['status'], _r['timings']['total'], _r['file']))
+
+    if args.report:
+        with open(args.report, 'w') as _f:
+            json.dump(summary, _f, indent=1)
+
+    return int(bool(summary['failed']))
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -57,6 +57,9 @@ class EditIntervals():
         print('updating with: ', task.get_model())
         setattr(self.loft.Proxy.Object, 'Interval_Schedule', task.get_model())
 
+        #the panel closes on return, so report progress to the status bar
+        self.loft.Proxy.progress_callback = None
+
         App.ActiveDocument.recompute()
 
     def _validate_selection(self):
@@ -93,4 +96,7 @@ class EditIntervals():
 
         panel.setup(self.loft.Proxy.Object.Interval_Schedule, ['Station', 'Interval', 'StationRaw'])
 
+        #background regeneration reports to the panel while it is open
+        self.loft.Proxy.progress_callback = panel.show_progress
+
 Gui.addCommand('EditIntervals', EditIntervals())
@@ -24,12 +24,21 @@
 """
 DESCRIPTION
 """
+
+from pivy import coin
+
 import FreeCAD as App
 import FreeCADGui as Gui
 import Part
+import Mesh
 
 from Project.Support import Properties
 
+from ...project.support import instrumentation, units
+from ...project.support.idle_queue import IdleQueue
+from ..template import template_cache
+from . import loft_worker, path_frames, section_mesh, section_schedule
+
 _CLASS_NAME = 'ElementLoft'
 _TYPE = 'Part::FeaturePython'
 
@@ -70,6 +79,10 @@ class _ElementLoft(object):
         obj.Proxy = self
         self.Type = '_' + _CLASS_NAME
         self.Object = None
+        self.sections = None
+        self.preview = None
+        self.worker = None
+        self.progress_callback = None
 
         #add class properties
         Properties.add(obj, 'StringList', 'Control_Schedule', 'Schedule for loft controls', [], is_read_only=True, is_hidden=False)
@@ -77,6 +90,10 @@ class _ElementLoft(object):
         Properties.add(obj, 'Link', 'Template', 'Linked template', sketch)
         Properties.add(obj, 'Float', 'Interval', 'Section spacing interval', 100.0)
         Properties.add(obj, 'FloatList', 'Interval_Schedule', 'Schedule for loft section intervals', [], is_read_only=True, is_hidden=False)
+        Properties.add(obj, 'Float', 'Tolerance', 'Maximum deviation between the sections and the curved path', 0.01)
+        Properties.add(obj, 'Bool', 'Preview', 'Display a mesh preview in place of the lofted solid', False)
+        Properties.add(obj, 'Bool', 'Minimize_Rotation', 'Orient sections with rotation-minimizing frames rather than level frames', False)
+        Properties.add(obj, 'Bool', 'Asynchronous', 'Regenerate the loft in the background', False)
 
         self.Object = obj
 
@@ -86,6 +103,47 @@ class _ElementLoft(object):
         """
 
         self.Object = fp
+        self.sections = None
+        self.preview = None
+        self.worker = None
+        self.progress_callback = None
+
+        #add properties missing from lofts saved by earlier versions
+        if not hasattr(fp, 'Tolerance'):
+            Properties.add(fp, 'Float', 'Tolerance', 'Maximum deviation between the sections and the curved path', 0.01)
+
+        #lofts saved by earlier versions hold the lofted solid
+        if not hasattr(fp, 'Preview'):
+            Properties.add(fp, 'Bool', 'Preview', 'Display a mesh preview in place of the lofted solid', False)
+
+        if not hasattr(fp, 'Minimize_Rotation'):
+            Properties.add(fp, 'Bool', 'Minimize_Rotation', 'Orient sections with rotation-minimizing frames rather than level frames', False)
+
+        if not hasattr(fp, 'Asynchronous'):
+            Properties.add(fp, 'Bool', 'Asynchronous', 'Regenerate the loft in the background', False)
+
+        #the preview mesh is not saved, so rebuild it once the document
+        #has finished loading
+        if fp.Preview:
+            IdleQueue().push(self.rebuild_preview)
+
+    def rebuild_preview(self):
+        """
+        Rebuild the preview mesh of a restored loft without recomputing
+        """
+
+        if not (self.Object and self.Object.Preview):
+            return
+
+        self.sections = self._build_spline_sections(
+            self.Object.Alignment, self.Object.Template, self.get_stations(),
+            self.Object.Minimize_Rotation
+        )
+
+        self.preview = section_mesh.triangulate(self.sections)
+
+        if App.GuiUp:
+            self.Object.ViewObject.Proxy.update_preview(self.Object)
 
     def __getstate__(self):
         """
@@ -107,150 +165,242 @@ class _ElementLoft(object):
 
         spline = self.Object.Alignment
         sketch = self.Object.Template
-        interval = self.Object.Interval
 
-        #create loft sections
-        section_list = self.build_sections(spline, sketch) #, interval)
+        #create loft section vertex arrays at the scheduled stations
+        self.sections = self._build_spline_sections(
+            spline, sketch, self.get_stations(), self.Object.Minimize_Rotation
+        )
 
-        #Part.show(Part.Compound(section_list))
-        #create a compound of the components (polygons)
-        #section_object.Shape = Part.Compound(section_list)
+        #triangulate the sections for display in place of the solid
+        if self.Object.Preview:
 
-        #loft the polygons to generate the solid
-        #loft_object.Sections = section_object.Shape
+            self.preview = section_mesh.triangulate(self.sections)
+            self.Object.Shape = Part.Shape()
 
-        self.Object.Shape = Part.makeLoft(section_list, False, True, False)
+            return
 
-    def execute(self, obj):
+        self.preview = None
+        self.Object.Shape = self.build_loft(self.sections)
+
+    def get_stations(self):
         """
-        Class execute for recompute calls
+        Return the section stations as distances along the loft path,
+        scheduled from the interval schedule, the path curvature and
+        the control schedule
         """
 
-        #early execution protection
-        if not self.Object:
-            return
+        spline = self.Object.Alignment
+        scale = units.scale_factor()
 
-        self.regenerate()
+        #schedules are in document stations, the path starts at zero
+        start = 0.0
 
-    def show_interval_schedule(self):
-        """
-        Create a temporary spreadsheet for viewing and
-        editing the schedule data
-        """
-        pass
+        if hasattr(spline, 'Start_Station'):
+            start = spline.Start_Station.Value
 
-    @staticmethod
-    def build_sections(fpo, sketch, average=True):
+        schedule = [
+            (_s * scale - start, _i * scale) for _s, _i in
+            section_schedule.parse_interval_schedule(
+                self.Object.Interval_Schedule
+            )
+        ]
+
+        breaks = [
+            _s * scale - start for _s in
+            section_schedule.parse_control_schedule(
+                self.Object.Control_Schedule
+            )
+        ]
+
+        return section_schedule.build_stations(
+            0.0, spline.Shape.Length, self.Object.Interval * scale,
+            schedule, self.get_curves(), breaks,
+            self.Object.Tolerance * scale
+        )
+
+    def get_curves(self):
         """
-        Generate / regenerate the loft along a wire path
+        Return the (start, end, radius) limits of the curves along the
+        loft path, from the alignment geometry where it is available,
+        otherwise by sampling the path curvature
         """
-        comps = []
-        z_up = App.Vector(0, 0, 1)
 
-        prev_tangent = None
+        spline = self.Object.Alignment
+        proxy = getattr(spline, 'Proxy', None)
+
+        if hasattr(proxy, 'get_geometry'):
+            return section_schedule.get_curve_limits(proxy.get_geometry())
+
+        result = []
+        position = 0.0
+
+        #sample the curvature in windows of the section interval
+        window = self.Object.Interval * units.scale_factor()
+
+        if window <= 0.0:
+            window = spline.Shape.Length
 
-        for edge in fpo.Shape.Edges:
+        for edge in spline.Shape.Edges:
 
-            tangent = edge.Curve.Direction
+            _length = edge.Length
 
-            #average the tangent if desired
-            if average and prev_tangent:
-                tangent = ((tangent + prev_tangent) / 2.0).normalize()
+            if isinstance(edge.Curve, (Part.Line, Part.LineSegment)):
+                position += _length
+                continue
 
-            x_normal = tangent.cross(z_up).normalize()
-            z_normal = tangent.cross(x_normal).normalize()
+            count = max(2, int(_length / window) + 1)
 
-            if z_normal.z < 0.0:
-                z_normal = z_normal.negative()
+            _d = [_length * _i / count for _i in range(0, count + 1)]
+            _k = [
+                edge.curvatureAt(edge.getParameterByLength(_v)) for _v in _d
+            ]
 
-            for _i in range(0, 1):
+            for _i in range(0, count):
 
-                origin = edge.Vertexes[_i].Point
-                poly_points = []
+                _max = max(_k[_i], _k[_i + 1])
 
-                #iterate sketch vertices, scaling them along the normal and adding the origin to locate them
-                for sk_vtx in sketch.Shape.Vertexes:
-                    point = sk_vtx.Point
-                    poly_points.append(origin + (point.x * x_normal) + (point.y * z_normal))
+                if _max > 0.0:
+                    result.append(
+                        (position + _d[_i], position + _d[_i + 1], 1.0 / _max)
+                    )
 
-                poly_points.append(origin)
+            position += _length
 
-                #generate a polygon of the points and save it
-                comps += [Part.makePolygon(poly_points)]
+        return result
 
-                #averaging tangents on the first tangent
-                #requries skipping the end vertex
-                if average and not prev_tangent:
-                    continue
+    def finalize(self):
+        """
+        Replace the mesh preview with the exact loft
+        """
+
+        self.Object.Preview = False
+
+        self.Object.Document.recompute()
+
+    def get_preview_mesh(self):
+        """
+        Return the current preview as a Mesh object
+        """
 
-            if average:
-                prev_tangent = tangent
+        if not self.preview:
+            return None
 
-        return comps
+        return Mesh.Mesh(section_mesh.get_mesh_facets(*self.preview))
 
     @staticmethod
-    def _build_spline_sections(spline, sketch, interval):
+    def build_loft(sections):
         """
-        Generate / regenerate the loft along a spline path
+        Loft the section vertex arrays to generate the solid
         """
 
-        #reference spline curve object
-        curve = spline.Shape.Curve
+        return Part.makeLoft(
+            [Part.makePolygon([App.Vector(*_p) for _p in _s])
+             for _s in sections], False, True, False
+        )
 
-        #return first / last parameters
-        [_a, _b] = spline.Shape.ParameterRange
+    @instrumentation.timed('recompute')
+    def execute(self, obj):
+        """
+        Class execute for recompute calls
+        """
 
-        #round the length up and add one
-        length = int(round(_b)) + 1
+        #early execution protection
+        if not self.Object:
+            return
+
+        #keep the current shape until the background job completes
+        if self.Object.Asynchronous and App.GuiUp:
+            self.get_worker().request()
+            return
 
-        comps = []
-        z_up = App.Vector(0, 0, 1)
+        self.regenerate()
+
+    def get_worker(self):
+        """
+        Return the background regeneration worker, creating it if needed
+        """
 
-        #iterate the range of the length as integers
-        i = 0.0
-        step = 304.8 * interval
+        if not self.worker:
+            self.worker = loft_worker.LoftWorker(
+                self.get_job, self.apply_result, self.report_progress
+            )
 
-        sketch_points = []
+        return self.worker
 
-        for vtx in sketch.Shape.Vertexes:
-            sketch_points.append(vtx.Point)
+    def get_job(self):
+        """
+        Capture the loft inputs for background regeneration
+        """
+
+        return {
+            'sampler': path_frames.PathSampler(self.Object.Alignment.Shape),
+            'stations': self.get_stations(),
+            'profile': self.get_profile(self.Object.Template),
+            'minimize_rotation': self.Object.Minimize_Rotation,
+            'preview': self.Object.Preview
+        }
+
+    def apply_result(self, result):
+        """
+        Swap in the result of a background regeneration
+        """
 
-        is_last_section = False
+        self.sections = result['sections']
+        self.preview = result['preview']
 
-        while i <= length:
+        if self.preview is not None:
+            self.Object.Shape = Part.Shape()
 
-            #get the coordinate of the sweep path at the first millimeter
-            origin = curve.value(i)
+        #OpenCASCADE lofting stays on the GUI thread
+        else:
+            self.report_progress(1.0, 'Lofting sections')
+            self.Object.Shape = self.build_loft(self.sections)
 
-            #get the tangent of the sweep path at that coordinate
-            tangent = curve.tangent(i)[0]
+        #the result is the recomputed state, so don't leave the loft touched
+        self.Object.purgeTouched()
 
-            #calculate the normal against z-up and normalize
-            x_normal = tangent.cross(z_up).normalize()
-            z_normal = tangent.cross(x_normal).normalize()
+    def report_progress(self, fraction, message):
+        """
+        Forward background regeneration progress to the active task panel,
+        or the status bar if none is listening
+        """
 
-            #z-coordinate should always be positive
-            if z_normal.z < 0.0:
-                z_normal = z_normal.negative()
+        if self.progress_callback:
+            self.progress_callback(fraction, message)
 
-            poly_points = []
+        else:
+            loft_worker.show_status(fraction, message)
 
-            for point in sketch_points:
-                poly_points.append(origin + (point.x * x_normal) + (point.y * z_normal))
+    def show_interval_schedule(self):
+        """
+        Create a temporary spreadsheet for viewing and
+        editing the schedule data
+        """
+        pass
 
-            poly_points.append(origin)
+    @staticmethod
+    def _build_spline_sections(spline, sketch, stations, minimize_rotation=False):
+        """
+        Generate the loft section vertex arrays at the stations
+        (distances along the path) of a spline or wire path
 
-            #generate a polygon of the points and save it
-            comps += [Part.makePolygon(poly_points)]
+        Returns an (n, m + 1, 3) array of n sections of the m template
+        vertices, followed by the section origin
+        """
 
-            i += step
+        return path_frames.sample_sections(
+            spline.Shape, stations, _ElementLoft.get_profile(sketch),
+            minimize_rotation
+        )
 
-            if i > length:
-                if not is_last_section:
-                    i = length
-                    is_last_section = True
+    @staticmethod
+    def get_profile(sketch):
+        """
+        Return the (m, 2) array of template vertex coordinates,
+        shared between lofts using the same template geometry
+        """
 
-        return comps
+        return template_cache.TemplateCache().get(sketch).profile
 
 class _ViewProviderElementLoft():
 
@@ -259,6 +409,7 @@ class _ViewProviderElementLoft():
         View Provider initialization
         """
         self.Object = vobj
+        self.preview = None
         vobj.Proxy = self
 
     def onDocumentRestored(self, vobj):
@@ -278,7 +429,64 @@ class _ViewProviderElementLoft():
         """
         View Provider Scene subgraph
         """
-        return
+
+        self.Object = vobj
+
+        self.preview = {
+            'node': coin.SoSeparator(),
+            'hints': coin.SoShapeHints(),
+            'material': coin.SoMaterial(),
+            'coord': coin.SoCoordinate3(),
+            'faces': coin.SoIndexedFaceSet()
+        }
+
+        self.preview['hints'].vertexOrdering = \
+            coin.SoShapeHints.COUNTERCLOCKWISE
+
+        self.preview['material'].diffuseColor = (0.6, 0.6, 0.6)
+
+        for _k in ['hints', 'material', 'coord', 'faces']:
+            self.preview['node'].addChild(self.preview[_k])
+
+        vobj.RootNode.addChild(self.preview['node'])
+
+    def updateData(self, obj, prop):
+        """
+        Property update handler
+        """
+
+        if prop == 'Shape':
+            self.update_preview(obj)
+
+    def update_preview(self, obj):
+        """
+        Push the loft preview mesh to the scene graph
+        """
+
+        if not self.preview:
+            return
+
+        _coord = self.preview['coord']
+        _faces = self.preview['faces']
+
+        _mesh = None
+
+        if hasattr(obj.Proxy, 'preview'):
+            _mesh = obj.Proxy.preview
+
+        if not _mesh:
+            _faces.coordIndex.setNum(0)
+            _coord.point.setNum(0)
+            return
+
+        coords, faces = _mesh
+        indices = section_mesh.get_coin_indices(faces)
+
+        _coord.point.setValues(0, len(coords), coords.tolist())
+        _coord.point.setNum(len(coords))
+
+        _faces.coordIndex.setValues(0, len(indices), indices)
+        _faces.coordIndex.setNum(len(indices))
 
     def __getstate__(self):
         """
@@ -299,3 +507,6 @@ class _ViewProviderElementLoft():
         """
         action = menu.addAction("Interval Schedule...")
         action.triggered.connect(lambda: Gui.runCommand('EditIntervals'))
+
+        action = menu.addAction("Finalize Loft")
+        action.triggered.connect(lambda: vobj.Object.Proxy.finalize())
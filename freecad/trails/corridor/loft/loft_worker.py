@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# **************************************************************************
+# *                                                                        *
+# *  Copyright (c) 2019 Joel Graff <monograff76@gmail.com>                 *
+# *                                                                        *
+# *  This program is free software; you can redistribute it and/or modify  *
+# *  it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *  as published by the Free Software Foundation; either version 2 of     *
+# *  the License, or (at your option) any later version.                   *
+# *  for detail see the LICENCE text file.                                 *
+# *                                                                        *
+# *  This program is distributed in the hope that it will be useful,       *
+# *  but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *  GNU Library General Public License for more details.                  *
+# *                                                                        *
+# *  You should have received a copy of the GNU Library General Public     *
+# *  License along with this program; if not, write to the Free Software   *
+# *  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *  USA                                                                   *
+# *                                                                        *
+# **************************************************************************
+
+"""
+Background regeneration of element lofts.
+
+Loft inputs are captured on the GUI thread, the sections are computed on
+a worker thread and the result is handed back to the GUI thread by
+polling a message queue, where the solid is lofted.  Requests made while a job is running
+cancel it and restart after a short debounce delay.
+"""
+
+import queue
+import threading
+
+from PySide import QtCore
+
+import FreeCAD as App
+import FreeCADGui as Gui
+
+from . import path_frames, section_mesh
+
+__title__ = 'loft_worker.py'
+__author__ = "Joel Graff"
+__url__ = "https://www.freecadweb.org"
+
+def run_job(job, is_cancelled, progress):
+    """
+    Compute the loft sections for a job captured by the loft object.
+    Only NumPy work is done here - OpenCASCADE is not thread safe, so the
+    solid is lofted when the result is applied on the GUI thread.
+
+    Returns a dictionary of the 'sections' and 'preview' mesh,
+    or None if cancelled
+    """
+
+    progress(0.0, 'Sampling sections')
+
+    sections = path_frames.place_sections(
+        job['sampler'], job['stations'], job['profile'],
+        job['minimize_rotation']
+    )
+
+    if is_cancelled():
+        return None
+
+    result = {'sections': sections, 'preview': None}
+
+    if job['preview']:
+
+        progress(0.5, 'Building sections')
+        result['preview'] = section_mesh.triangulate(sections)
+
+    progress(1.0, 'Sections complete')
+
+    return result
+
+def show_status(fraction, message):
+    """
+    Default progress report to the main window status bar
+    """
+
+    Gui.getMainWindow().statusBar().showMessage(
+        '{} ({:.0%})'.format(message, fraction), 2000
+    )
+
+class LoftWorker():
+    """
+    Debounced, cancellable background loft regeneration
+    """
+
+    DEBOUNCE = 250
+    POLL = 50
+
+    def __init__(self, get_job, apply_result, progress=None):
+        """
+        Constructor
+
+        get_job - callback returning the job inputs, called on the GUI thread
+        apply_result - callback receiving the finished result on the GUI thread
+        progress - callback receiving (fraction, message) progress reports
+        """
+
+        self.get_job = get_job
+        self.apply_result = apply_result
+        self.progress = progress
+
+        self.cancel_event = None
+        self.messages = None
+        self.thread = None
+
+        self.debounce = QtCore.QTimer()
+        self.debounce.setSingleShot(True)
+        self.debounce.timeout.connect(self.start)
+
+        self.poll = QtCore.QTimer()
+        self.poll.timeout.connect(self.check_messages)
+
+    def request(self):
+        """
+        Cancel any running job and schedule a new one
+        """
+
+        self.cancel()
+        self.debounce.start(self.DEBOUNCE)
+
+    def cancel(self):
+        """
+        Signal the running job to stop and discard its result
+        """
+
+        if self.cancel_event:
+            self.cancel_event.set()
+
+        self.cancel_event = None
+        self.messages = None
+
+    def is_running(self):
+        """
+        Return true if a job is scheduled or running
+        """
+
+        return self.debounce.isActive() or self.messages is not None
+
+    def start(self):
+        """
+        Capture the job inputs and start the worker thread
+        """
+
+        job = self.get_job()
+
+        if not job:
+            return
+
+        self.cancel_event = threading.Event()
+        self.messages = queue.Queue()
+
+        self.thread = threading.Thread(
+            target=self.run, args=(job, self.cancel_event, self.messages)
+        )
+
+        self.thread.daemon = True
+        self.thread.start()
+
+        self.poll.start(self.POLL)
+
+    @staticmethod
+    def run(job, cancel_event, messages):
+        """
+        Worker thread body.  Results are only posted to the queue.
+        """
+
+        def _progress(fraction, message):
+            messages.put(('progress', (fraction, message)))
+
+        try:
+            result = run_job(job, cancel_event.is_set, _progress)
+
+            if result is not None and not cancel_event.is_set():
+                messages.put(('done', result))
+
+        except Exception as _e:
+            messages.put(('error', _e))
+
+        messages.put(('exit', None))
+
+    def check_messages(self):
+        """
+        Drain the worker messages on the GUI thread
+        """
+
+        #a cancelled job's queue is dropped, so its messages are ignored
+        if self.messages is None:
+            self.poll.stop()
+            return
+
+        while True:
+
+            try:
+                _key, _value = self.messages.get_nowait()
+
+            except queue.Empty:
+                return
+
+            if _key == 'progress':
+
+                if self.progress:
+                    self.progress(*_value)
+
+            elif _key == 'done':
+                self.apply_result(_value)
+
+            elif _key == 'error':
+                App.Console.PrintError(
+                    'Loft regeneration failed: {}\n'.format(_value)
+                )
+
+            elif _key == 'exit':
+                self.cancel_event = None
+                self.messages = None
+                self.poll.stop()
+
+                return
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+# **************************************************************************
+# *                                                                        *
+# *  Copyright (c) 2019 Joel Graff <monograff76@gmail.com>                 *
+# *                                                                        *
+# *  This program is free software; you can redistribute it and/or modify  *
+# *  it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *  as published by the Free Software Foundation; either version 2 of     *
+# *  the License, or (at your option) any later version.                   *
+# *  for detail see the LICENCE text file.                                 *
+# *                                                                        *
+# *  This program is distributed in the hope that it will be useful,       *
+# *  but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *  GNU Library General Public License for more details.                  *
+# *                                                                        *
+# *  You should have received a copy of the GNU Library General Public     *
+# *  License along with this program; if not, write to the Free Software   *
+# *  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *  USA                                                                   *
+# *                                                                        *
+# **************************************************************************
+
+"""
+Bulk evaluation of points, tangents and section frames along loft paths
+"""
+
+import numpy
+
+import Part
+
+__title__ = 'path_frames.py'
+__author__ = "Joel Graff"
+__url__ = "https://www.freecadweb.org"
+
+Z_UP = numpy.array([0.0, 0.0, 1.0])
+
+def _normalize(vectors):
+    """
+    Normalize an (n, 3) array of vectors, leaving zero vectors unchanged
+    """
+
+    _len = numpy.linalg.norm(vectors, axis=-1, keepdims=True)
+    _len[_len == 0.0] = 1.0
+
+    return vectors / _len
+
+def de_boor(knots, degree, poles, params):
+    """
+    Evaluate a non-periodic B-spline at an array of parameters
+
+    knots - flat knot vector (multiplicities expanded)
+    degree - spline degree
+    poles - (k, d) array of control points (homogeneous, if rational)
+    params - (n,) array of parameters
+
+    Returns an (n, d) array of points
+    """
+
+    _count = len(poles)
+
+    #locate the knot span of each parameter, clamping to the valid range
+    span = numpy.searchsorted(knots, params, side='right') - 1
+    span = numpy.clip(span, degree, _count - 1)
+
+    _d = poles[span[:, None] + numpy.arange(-degree, 1)]
+
+    for _r in range(1, degree + 1):
+        for _j in range(degree, _r - 1, -1):
+
+            _i = span + _j - degree
+
+            _left = knots[_i]
+            _right = knots[_i + 1 + degree - _r]
+            _denom = _right - _left
+            _denom[_denom == 0.0] = 1.0
+
+            _alpha = ((params - _left) / _denom)[:, None]
+
+            _d[:, _j] = (1.0 - _alpha) * _d[:, _j - 1] + _alpha * _d[:, _j]
+
+    return _d[:, degree]
+
+class EdgeEvaluator():
+    """
+    Bulk point evaluation for a single edge, using the B-spline
+    representation of the edge curve
+    """
+
+    def __init__(self, edge):
+        """
+        Constructor
+        """
+
+        curve = edge.Curve
+        self.range = (edge.FirstParameter, edge.LastParameter)
+
+        if not isinstance(curve, Part.BSplineCurve):
+            curve = curve.toBSpline(*self.range)
+
+        else:
+            curve = curve.copy()
+
+        if curve.isPeriodic():
+            curve.setNotPeriodic()
+
+        _knots = []
+
+        for _k, _m in zip(curve.getKnots(), curve.getMultiplicities()):
+            _knots.extend([_k] * _m)
+
+        self.knots = numpy.array(_knots)
+        self.degree = curve.Degree
+
+        _poles = numpy.array([tuple(_p) for _p in curve.getPoles()])
+        _weights = numpy.array(curve.getWeights())
+
+        #homogeneous coordinates for rational curves
+        self.poles = numpy.hstack(
+            [_poles * _weights[:, None], _weights[:, None]]
+        )
+
+    def value(self, params):
+        """
+        Return the (n, 3) array of points at the parameters
+        """
+
+        _p = de_boor(self.knots, self.degree, self.poles, params)
+
+        return _p[:, 0:3] / _p[:, 3:4]
+
+class PathSampler():
+    """
+    Batched point and tangent sampling by distance along a path shape
+    """
+
+    def __init__(self, shape, density=32):
+        """
+        Constructor
+
+        shape - the path shape (edge or wire)
+        density - arc length table samples per knot span
+        """
+
+        self.edges = []
+        self.tables = []
+        self.limits = [0.0]
+
+        for edge in shape.Edges:
+
+            _eval = EdgeEvaluator(edge)
+
+            #build the arc length table for distance to parameter mapping
+            _count = density * max(1, len(set(_eval.knots)) - 1) + 1
+            _params = numpy.linspace(_eval.range[0], _eval.range[1], _count)
+            _points = _eval.value(_params)
+
+            _dist = numpy.concatenate([[0.0], numpy.cumsum(
+                numpy.linalg.norm(numpy.diff(_points, axis=0), axis=1)
+            )])
+
+            #scale the chord lengths to the exact edge length
+            if _dist[-1] > 0.0:
+                _dist *= edge.Length / _dist[-1]
+
+            self.edges.append(_eval)
+            self.tables.append((_dist, _params))
+            self.limits.append(self.limits[-1] + edge.Length)
+
+        self.limits = numpy.array(self.limits)
+
+    def sample(self, stations):
+        """
+        Return the (n, 3) arrays of points and unit tangents at the
+        stations (distances along the path)
+        """
+
+        stations = numpy.asarray(stations, dtype=float)
+
+        points = numpy.zeros((len(stations), 3))
+        tangents = numpy.zeros((len(stations), 3))
+
+        if not self.edges:
+            return points, tangents
+
+        #find the edge on which each station falls
+        _idx = numpy.searchsorted(self.limits, stations, side='right') - 1
+        _idx = numpy.clip(_idx, 0, len(self.edges) - 1)
+
+        for _i, _eval in enumerate(self.edges):
+
+            _mask = _idx == _i
+
+            if not _mask.any():
+                continue
+
+            _dist, _table = self.tables[_i]
+
+            params = numpy.interp(
+                stations[_mask] - self.limits[_i], _dist, _table
+            )
+
+            #central differences for the tangents
+            _lo, _hi = _eval.range
+            _h = (_hi - _lo) * 1.0e-6
+
+            _ahead = numpy.minimum(params + _h, _hi)
+            _back = numpy.maximum(params - _h, _lo)
+
+            _pts = _eval.value(numpy.concatenate([params, _back, _ahead]))
+            _count = len(params)
+
+            points[_mask] = _pts[0:_count]
+            tangents[_mask] = _normalize(
+                _pts[2 * _count:] - _pts[_count:2 * _count]
+            )
+
+        return points, tangents
+
+def get_level_frames(tangents, up=Z_UP):
+    """
+    Return the (x, z) section axes for each tangent, keeping the
+    section x-axis level and the z-axis upward
+    """
+
+    x_normals = _normalize(numpy.cross(tangents, up))
+    z_normals = _normalize(numpy.cross(tangents, x_normals))
+
+    #z-coordinate should always be positive
+    z_normals[z_normals[:, 2] < 0.0] *= -1.0
+
+    return x_normals, z_normals
+
+def get_rotation_minimizing_frames(points, tangents, up=Z_UP):
+    """
+    Return the (x, z) section axes for each tangent, propagating the
+    first level frame along the path by double reflection
+    """
+
+    x_normals = numpy.zeros_like(tangents)
+
+    if not len(tangents):
+        return x_normals, numpy.zeros_like(tangents)
+
+    x_normals[0] = get_level_frames(tangents[0:1], up)[0][0]
+
+    for _i in range(0, len(points) - 1):
+
+        _r = x_normals[_i]
+
+        #reflect the frame across the bisector of the two points
+        _v1 = points[_i + 1] - points[_i]
+        _c1 = _v1.dot(_v1)
+
+        if _c1 == 0.0:
+            x_normals[_i + 1] = _r
+            continue
+
+        _r_l = _r - (2.0 / _c1) * _v1.dot(_r) * _v1
+        _t_l = tangents[_i] - (2.0 / _c1) * _v1.dot(tangents[_i]) * _v1
+
+        #reflect again to align the reflected tangent with the next tangent
+        _v2 = tangents[_i + 1] - _t_l
+        _c2 = _v2.dot(_v2)
+
+        if _c2 == 0.0:
+            x_normals[_i + 1] = _r_l
+            continue
+
+        x_normals[_i + 1] = _r_l - (2.0 / _c2) * _v2.dot(_r_l) * _v2
+
+    z_normals = _normalize(numpy.cross(tangents, x_normals))
+
+    if z_normals[0, 2] < 0.0:
+        z_normals *= -1.0
+
+    return _normalize(x_normals), z_normals
+
+def build_sections(origins, x_normals, z_normals, profile):
+    """
+    Place the profile at each frame, returning the (n, m + 1, 3) array of
+    section points.  The origin is appended as the last point of each
+    section.
+
+    profile - (m, 2) array of profile (x, y) coordinates
+    """
+
+    profile = numpy.asarray(profile, dtype=float).reshape(-1, 2)
+
+    _sections = origins[:, None, :] \
+        + profile[None, :, 0:1] * x_normals[:, None, :] \
+        + profile[None, :, 1:2] * z_normals[:, None, :]
+
+    return numpy.concatenate([_sections, origins[:, None, :]], axis=1)
+
+def sample_sections(shape, stations, profile, minimize_rotation=False):
+    """
+    Return the (n, m + 1, 3) array of profile sections placed at the
+    stations (distances along the path shape)
+    """
+
+    return place_sections(
+        PathSampler(shape), stations, profile, minimize_rotation
+    )
+
+def place_sections(sampler, stations, profile, minimize_rotation=False):
+    """
+    Return the (n, m + 1, 3) array of profile sections placed at the
+    stations by a PathSampler.  Only NumPy is used, so sections may be
+    placed off the GUI thread once the sampler is built.
+    """
+
+    #sample the path points and tangents at all stations at once
+    origins, tangents = sampler.sample(stations)
+
+    if minimize_rotation:
+        x_normals, z_normals = get_rotation_minimizing_frames(
+            origins, tangents
+        )
+
+    else:
+        x_normals, z_normals = get_level_frames(tangents)
+
+    return build_sections(origins, x_normals, z_normals, profile)
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# **************************************************************************
+# *                                                                        *
+# *  Copyright (c) 2019 Joel Graff <monograff76@gmail.com>                 *
+# *                                                                        *
+# *  This program is free software; you can redistribute it and/or modify  *
+# *  it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *  as published by the Free Software Foundation; either version 2 of     *
+# *  the License, or (at your option) any later version.                   *
+# *  for detail see the LICENCE text file.                                 *
+# *                                                                        *
+# *  This program is distributed in the hope that it will be useful,       *
+# *  but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *  GNU Library General Public License for more details.                  *
+# *                                                                        *
+# *  You should have received a copy of the GNU Library General Public     *
+# *  License along with this program; if not, write to the Free Software   *
+# *  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *  USA                                                                   *
+# *                                                                        *
+# **************************************************************************
+
+"""
+Triangulation of loft section polygons for lightweight previews
+"""
+
+import numpy
+
+__title__ = 'section_mesh.py'
+__author__ = "Joel Graff"
+__url__ = "https://www.freecadweb.org"
+
+def to_array(sections):
+    """
+    Convert a list of section point lists to an (n, m, 3) array.
+    Sections must all have the same number of points.
+    """
+
+    return numpy.array(
+        [[tuple(_p) for _p in _section] for _section in sections],
+        dtype=float
+    )
+
+def triangulate(sections, closed=False):
+    """
+    Triangulate consecutive section polygons into a triangle strip mesh
+
+    sections - (n, m, 3) array or list of n sections of m points each
+    closed - if true, the last point of each section is joined to the first
+
+    Returns a tuple of (coordinates, faces), where coordinates is an
+    (n * m, 3) array and faces is a (k, 3) array of coordinate indices
+    """
+
+    _sections = sections
+
+    if not isinstance(sections, numpy.ndarray):
+        _sections = to_array(sections)
+
+    if _sections.ndim != 3 or _sections.shape[0] < 2:
+        return numpy.empty((0, 3)), numpy.empty((0, 3), dtype=int)
+
+    count, size = _sections.shape[0:2]
+
+    coords = _sections.reshape(-1, 3)
+
+    #number of quads around each section
+    span = size
+
+    if not closed:
+        span -= 1
+
+    #index the lower-left corner of each quad between consecutive sections
+    _i, _j = numpy.meshgrid(
+        numpy.arange(count - 1), numpy.arange(span), indexing='ij'
+    )
+
+    _a = (_i * size + _j).ravel()
+    _b = (_i * size + (_j + 1) % size).ravel()
+    _c = _b + size
+    _d = _a + size
+
+    #split each quad into two triangles
+    faces = numpy.concatenate([
+        numpy.stack([_a, _b, _c], axis=1),
+        numpy.stack([_a, _c, _d], axis=1)
+    ])
+
+    return coords, faces
+
+def get_coin_indices(faces):
+    """
+    Return the face indices as a flat list of SoIndexedFaceSet
+    coordinate indices, with each face terminated by -1
+    """
+
+    if not len(faces):
+        return []
+
+    _idx = numpy.full((faces.shape[0], 4), -1, dtype=int)
+    _idx[:, 0:3] = faces
+
+    return _idx.ravel().tolist()
+
+def get_mesh_facets(coords, faces):
+    """
+    Return the triangles as a flat list of points,
+    every three of which define a Mesh facet
+    """
+
+    if not len(faces):
+        return []
+
+    return coords[faces].reshape(-1, 3).tolist()
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+# **************************************************************************
+# *                                                                        *
+# *  Copyright (c) 2019 Joel Graff <monograff76@gmail.com>                 *
+# *                                                                        *
+# *  This program is free software; you can redistribute it and/or modify  *
+# *  it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *  as published by the Free Software Foundation; either version 2 of     *
+# *  the License, or (at your option) any later version.                   *
+# *  for detail see the LICENCE text file.                                 *
+# *                                                                        *
+# *  This program is distributed in the hope that it will be useful,       *
+# *  but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *  GNU Library General Public License for more details.                  *
+# *                                                                        *
+# *  You should have received a copy of the GNU Library General Public     *
+# *  License along with this program; if not, write to the Free Software   *
+# *  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *  USA                                                                   *
+# *                                                                        *
+# **************************************************************************
+
+"""
+Section scheduling for lofts along alignments.
+
+Stations are distances along the loft path.  The schedule is built from
+key stations (path ends, interval schedule entries, curve limits and
+template changes) which are always kept, with each span between them
+subdivided evenly at the largest spacing permitted by both the interval
+schedule and the curvature tolerance.
+"""
+
+import math
+import bisect
+
+__title__ = 'section_schedule.py'
+__author__ = "Joel Graff"
+__url__ = "https://www.freecadweb.org"
+
+def parse_interval_schedule(schedule):
+    """
+    Convert the flat Interval_Schedule property data
+    ([station, interval, station, interval, ...]) to a sorted list of
+    (station, interval) tuples
+    """
+
+    if not schedule:
+        return []
+
+    result = [
+        (float(schedule[_i]), float(schedule[_i + 1]))
+        for _i in range(0, len(schedule) - 1, 2)
+    ]
+
+    return sorted(result)
+
+def parse_control_schedule(schedule):
+    """
+    Return the stations of the Control_Schedule property entries.
+    Entries are comma-delimited strings led by the station at which
+    the control (e.g. a template change) takes effect
+    """
+
+    result = []
+
+    for _entry in schedule:
+
+        _token = str(_entry).split(',')[0].replace('+', '').strip()
+
+        try:
+            result.append(float(_token))
+
+        except ValueError:
+            continue
+
+    return sorted(result)
+
+def get_arc_spacing(radius, tolerance):
+    """
+    Return the longest chord along an arc of the given radius whose
+    middle ordinate does not exceed the tolerance
+    """
+
+    if not radius or not tolerance:
+        return None
+
+    radius = abs(radius)
+
+    if tolerance >= radius:
+        return 2.0 * radius
+
+    return 2.0 * math.sqrt(tolerance * (2.0 * radius - tolerance))
+
+def get_curve_limits(geometry):
+    """
+    Return the (start, end, radius) limits of the curves in an alignment
+    geometry list, using the internal stations of each curve
+    """
+
+    result = []
+
+    for _geo in geometry:
+
+        if not _geo or _geo.get('Type') != 'Curve':
+            continue
+
+        _sta = _geo.get('InternalStation')
+
+        if not _sta or not _geo.get('Radius'):
+            continue
+
+        result.append((_sta[0], _sta[1], _geo['Radius']))
+
+    return result
+
+def get_interval(station, schedule, default):
+    """
+    Return the interval in effect at the station.  Schedule intervals
+    apply from their station to the next scheduled station.
+    """
+
+    _stations = [_v[0] for _v in schedule]
+    _i = bisect.bisect_right(_stations, station) - 1
+
+    if _i < 0:
+        return default
+
+    return schedule[_i][1]
+
+def get_min_radius(start, end, curves):
+    """
+    Return the smallest radius of the curves overlapping the span
+    """
+
+    _radii = [
+        abs(_c[2]) for _c in curves if _c[0] < end and _c[1] > start
+    ]
+
+    if not _radii:
+        return None
+
+    return min(_radii)
+
+def build_stations(start, end, interval=None, schedule=None, curves=None,
+                   breaks=None, tolerance=None, min_gap=1.0e-3):
+    """
+    Return the minimal sorted list of section stations between
+    start and end
+
+    interval - default maximum spacing, None / 0.0 for no limit
+    schedule - list of (station, interval) tuples overriding the default
+    curves - list of (start, end, radius) curve limits
+    breaks - additional stations which must be sectioned
+    tolerance - maximum middle ordinate between sections on curves
+    min_gap - key stations closer than this are merged
+    """
+
+    if end <= start:
+        return [start]
+
+    if not schedule:
+        schedule = []
+
+    if not curves:
+        curves = []
+
+    if not breaks:
+        breaks = []
+
+    #collect the key stations which must be sectioned
+    keys = [start, end] + [_v[0] for _v in schedule] + list(breaks)
+
+    for _c in curves:
+        keys.extend(_c[0:2])
+
+    keys = sorted(_k for _k in keys if start <= _k <= end)
+
+    _stations = [keys[0]]
+
+    for _k in keys[1:]:
+
+        if _k - _stations[-1] > min_gap:
+            _stations.append(_k)
+
+    #an end station lost to the minimum gap replaces its predecessor
+    if _stations[-1] != end:
+
+        if len(_stations) > 1:
+            _stations[-1] = end
+
+        else:
+            _stations.append(end)
+
+    result = []
+
+    #subdivide each span evenly at the largest spacing permitted
+    for _a, _b in zip(_stations[:-1], _stations[1:]):
+
+        _limits = [get_interval(_a, schedule, interval)]
+
+        _radius = get_min_radius(_a, _b, curves)
+
+        if _radius:
+            _limits.append(get_arc_spacing(_radius, tolerance))
+
+        _limits = [_v for _v in _limits if _v and _v > 0.0]
+
+        _count = 1
+
+        if _limits:
+            _count = max(1, int(math.ceil((_b - _a) / min(_limits) - 1.0e-9)))
+
+        _step = (_b - _a) / _count
+
+        result.extend(_a + _step * _i for _i in range(0, _count))
+
+    result.append(end)
+
+    return result
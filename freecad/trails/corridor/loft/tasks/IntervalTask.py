@@ -36,13 +36,16 @@ class IntervalTask:
         path = sys.path[0] + '/../freecad-transportation-wb/transportationwb/corridor/loft/tasks/interval_task_panel.ui'
         self.ui = path
         self.form = None
+        self.progress_bar = None
         self.update_callback = update_callback
 
     def accept(self):
         self.update_callback(self)
+        self.form = None
         return True
 
     def reject(self):
+        self.form = None
         return True
 
     def clicked(self, index):
@@ -138,6 +141,25 @@ class IntervalTask:
         QtCore.QObject.connect(form.add_button, QtCore.SIGNAL('clicked()'), self.add_item)
         QtCore.QObject.connect(form.remove_button, QtCore.SIGNAL('clicked()'), self.remove_item)
 
+    def show_progress(self, fraction, message):
+        """
+        Display background loft regeneration progress in the panel
+        """
+
+        if not self.form:
+            return
+
+        if not self.progress_bar:
+
+            self.progress_bar = QtGui.QProgressBar(self.form)
+            self.progress_bar.setRange(0, 100)
+
+            if self.form.layout():
+                self.form.layout().addWidget(self.progress_bar)
+
+        self.progress_bar.setFormat(message + ' %p%')
+        self.progress_bar.setValue(int(fraction * 100.0))
+
     def getMainWindow(self):
 
         top = QtGui.QApplication.topLevelWidgets()
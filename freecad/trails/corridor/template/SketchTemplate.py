@@ -7,6 +7,7 @@
 
 import FreeCAD as App
 from ...project.support import properties
+from . import template_cache
 
 def create(sketch_object, template_name):
     """
@@ -25,6 +26,24 @@ def create(sketch_object, template_name):
 
     return _o
 
+def get_instance(sketch_object, template_name):
+    """
+    Return the template in the active document with the same geometry
+    as the sketch, creating a new template if there is none
+    """
+
+    _templates = [
+        _o for _o in App.ActiveDocument.Objects
+        if getattr(getattr(_o, 'Proxy', None), 'Type', '') == '_Sketch'
+    ]
+
+    _match = template_cache.TemplateCache().find(sketch_object, _templates)
+
+    if _match:
+        return _match.Proxy
+
+    return create(sketch_object, template_name)
+
 
 class _Sketch(object):
 
@@ -76,6 +95,13 @@ class _Sketch(object):
         self.Object.solve()
         self.Object.recompute()
 
+    def get_template(self):
+        """
+        Return the shared template geometry of the sketch
+        """
+
+        return template_cache.TemplateCache().get(self.Object)
+
     def onChanged(self, obj, prop):
 
         #avoid call during object initializtion
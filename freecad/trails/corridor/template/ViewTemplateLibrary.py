@@ -24,11 +24,10 @@
 Manages template library UI
 """
 
-import os
-
 import FreeCAD as App
 import FreeCADGui as Gui
 from . import TemplateLibrary, SketchTemplate
+from ...project.commands.command_resources import RESOURCES
 
 class ViewTemplateLibrary():
     """
@@ -43,15 +42,7 @@ class ViewTemplateLibrary():
         Icon resources.
         """
 
-        icon_path = os.path.dirname(os.path.abspath(__file__))
-
-        icon_path += "/../../resources/icons/new_alignment.svg"
-
-        return {'Pixmap'  : icon_path,
-                'Accel'   : "Ctrl+Alt+G",
-                'MenuText': "Open Template Library",
-                'ToolTip' : "Open the template library",
-                'CmdType' : "ForEdit"}
+        return RESOURCES['ViewTemplateLibrary']
 
     def _validate_tree(self):
         """
@@ -102,8 +93,12 @@ class ViewTemplateLibrary():
                     continue
 
                 new_objects.append(obj.Name)
-                _o = SketchTemplate.create(obj, obj.Label)
-                folder.addObject(_o.Object)
+
+                #templates matching an existing template share it
+                _o = SketchTemplate.get_instance(obj, obj.Label)
+
+                if _o.Object not in folder.Group:
+                    folder.addObject(_o.Object)
 
         #remove the root objects...
         for obj_name in new_objects:
@@ -116,4 +111,4 @@ class ViewTemplateLibrary():
         TemplateLibrary.show(self._library_call_back)
 
 
-Gui.addCommand('ViewTemplateLibrary', ViewTemplateLibrary())
+#registered on demand through project.commands.command_stubs
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+# **************************************************************************
+# *                                                                        *
+# *  Copyright (c) 2019 Joel Graff <monograff76@gmail.com>                 *
+# *                                                                        *
+# *  This program is free software; you can redistribute it and/or modify  *
+# *  it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *  as published by the Free Software Foundation; either version 2 of     *
+# *  the License, or (at your option) any later version.                   *
+# *  for detail see the LICENCE text file.                                 *
+# *                                                                        *
+# *  This program is distributed in the hope that it will be useful,       *
+# *  but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *  GNU Library General Public License for more details.                  *
+# *                                                                        *
+# *  You should have received a copy of the GNU Library General Public     *
+# *  License along with this program; if not, write to the Free Software   *
+# *  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *  USA                                                                   *
+# *                                                                        *
+# **************************************************************************
+
+"""
+Shared cache of template sketch geometry.
+
+Template geometry is stored once per distinct sketch content, so lofts
+which share a typical section share one vertex array.  Entries are keyed
+on a hash of the sketch geometry and dropped when no sketch of an open
+document uses them.  A sketch's hash is kept until it's shape changes, so
+the geometry is only traversed again after the sketch is recomputed.
+"""
+
+import hashlib
+
+import numpy
+
+import FreeCAD as App
+
+from ...project.support.singleton import Singleton
+
+__title__ = 'template_cache.py'
+__author__ = "Joel Graff"
+__url__ = "https://www.freecadweb.org"
+
+#decimal places kept when hashing vertex coordinates
+PRECISION = 6
+
+class TemplateData():
+    """
+    Immutable template geometry shared between lofts
+    """
+
+    def __init__(self, points, edges, closed):
+        """
+        Constructor
+
+        points - (m, 3) array of ordered template vertices
+        edges - (k, 2) array of vertex indices of the profile edges
+        closed - true if every profile wire is closed
+        """
+
+        self.points = points
+        self.profile = points[:, 0:2]
+        self.edges = edges
+        self.closed = closed
+
+        for _v in (self.points, self.profile, self.edges):
+            _v.flags.writeable = False
+
+def get_sketch_key(sketch):
+    """
+    Return the key identifying a sketch
+    """
+
+    return (sketch.Document.Name, sketch.Name)
+
+def read_template(shape):
+    """
+    Traverse a sketch shape, returning the content hash and template data
+    """
+
+    points = numpy.array(
+        [tuple(_v.Point) for _v in shape.Vertexes], dtype=float
+    ).reshape(-1, 3)
+
+    #index vertices by rounded coordinate to recover the edge topology
+    _index = {
+        tuple(_p): _i for _i, _p in
+        enumerate(numpy.round(points, PRECISION).tolist())
+    }
+
+    edges = []
+
+    for _e in shape.Edges:
+
+        _ends = [
+            _index.get(tuple(round(_c, PRECISION) for _c in _v.Point))
+            for _v in _e.Vertexes
+        ]
+
+        if len(_ends) == 2 and None not in _ends:
+            edges.append(_ends)
+
+    edges = numpy.array(edges, dtype=int).reshape(-1, 2)
+
+    closed = bool(shape.Wires) and all(_w.isClosed() for _w in shape.Wires)
+
+    _hash = hashlib.sha1()
+    _hash.update(numpy.round(points, PRECISION).tobytes())
+    _hash.update(edges.tobytes())
+    _hash.update(bytes([closed]))
+
+    return _hash.hexdigest(), TemplateData(points, edges, closed)
+
+class TemplateCache(metaclass=Singleton):
+    """
+    Template geometry cache, keyed on sketch content
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+
+        #content hash -> TemplateData
+        self.templates = {}
+
+        #sketch key -> content hash
+        self.keys = {}
+
+        App.addDocumentObserver(self)
+
+    def get_hash(self, sketch):
+        """
+        Return the content hash of a sketch
+        """
+
+        _key = get_sketch_key(sketch)
+        _hash = self.keys.get(_key)
+
+        if _hash:
+            return _hash
+
+        _hash, _data = read_template(sketch.Shape)
+
+        self.keys[_key] = _hash
+        self.templates.setdefault(_hash, _data)
+
+        self.purge()
+
+        return _hash
+
+    def get(self, sketch):
+        """
+        Return the shared template data for a sketch
+        """
+
+        return self.templates[self.get_hash(sketch)]
+
+    def find(self, sketch, candidates):
+        """
+        Return the first candidate sketch with the same content as sketch
+        """
+
+        _hash = self.get_hash(sketch)
+
+        for _c in candidates:
+
+            if _c != sketch and self.get_hash(_c) == _hash:
+                return _c
+
+        return None
+
+    def purge(self):
+        """
+        Drop templates no longer used by any sketch
+        """
+
+        _used = set(self.keys.values())
+
+        for _h in [_h for _h in self.templates if _h not in _used]:
+            del self.templates[_h]
+
+    def slotChangedObject(self, obj, prop):
+        """
+        Forget the hash of a sketch when it's shape changes
+        """
+
+        if prop != 'Shape':
+            return
+
+        #the geometry stays shared until the sketch is read again
+        self.keys.pop(get_sketch_key(obj), None)
+
+    def slotDeletedObject(self, obj):
+        """
+        Drop the entry of a deleted sketch
+        """
+
+        if self.keys.pop(get_sketch_key(obj), None):
+            self.purge()
+
+    def slotDeletedDocument(self, doc):
+        """
+        Drop the entries of the sketches of a closed document
+        """
+
+        for _k in [_k for _k in self.keys if _k[0] == doc.Name]:
+            del self.keys[_k]
+
+        self.purge()
+
+    def clear(self):
+        """
+        Empty the cache
+        """
+
+        self.templates = {}
+        self.keys = {}
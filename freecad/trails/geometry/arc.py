@@ -30,7 +30,7 @@ import numpy
 import FreeCAD as App
 
 from ..project.support import units, utils
-from . import support
+from . import spatial_hash, support
 from ..project.support.utils import Const, Constants as C
 
 def _create_geo_func():
@@ -466,6 +466,51 @@ def get_parameters(arc):
 
     #scale_factor = 1.0 / Units.scale_factor()
 
+def get_pi_curve(prev_pi, pi, next_pi, radius):
+    """
+    Solve the curve of the given radius at a PI, tangent to the lines
+    joining it to the previous and next PIs.
+
+    Returns the arc dictionary, or None if the tangents are collinear
+    """
+
+    _in = pi.sub(prev_pi)
+    _out = next_pi.sub(pi)
+
+    if not (_in.Length and _out.Length and radius):
+        return None
+
+    delta = _in.getAngle(_out)
+
+    if delta < C.TOLERANCE:
+        return None
+
+    direction = support.get_rotation(_in, _out)
+    tangent = radius * math.tan(delta / 2.0)
+
+    _in.normalize()
+    _out.normalize()
+
+    start = pi.sub(App.Vector(_in).multiply(tangent))
+
+    result = {
+        'Type': 'Curve',
+        'Radius': radius,
+        'Delta': delta,
+        'Direction': direction,
+        'Tangent': tangent,
+        'BearingIn': support.get_bearing(_in),
+        'BearingOut': support.get_bearing(_out),
+        'Start': start,
+        'End': pi.add(App.Vector(_out).multiply(tangent)),
+        'Center': start.add(support.get_ortho(_in, direction).multiply(radius)),
+        'PI': App.Vector(pi)
+    }
+
+    result.update(get_missing_parameters(result, result))
+
+    return result
+
 def convert_units(arc, to_document=False):
     """
     Cnvert the units of the arc parameters to or from document units
@@ -780,18 +825,12 @@ def get_points(arc_dict, interval, interval_type='Segment', layer=0.0):
 
     _forward = App.Vector(math.sin(bearing_in), math.cos(bearing_in), 0.0)
     _right = App.Vector(_forward.y, -_forward.x, 0.0)
-    hashes = []
-
-    _prev = None
 
     for _pt in points:
-
-        #store the hash of the starting and ending coordinates
-        #aka - the segment hash
-        if _prev:
-            hashes.append(hash(tuple(_prev) + tuple(_pt)))
-
         _pt.z = layer
-        _prev = _pt
+
+    #store the hashes of the starting and ending coordinates
+    #aka - the segment hashes
+    hashes = spatial_hash.get_segment_hashes(points)
 
     return points, hashes
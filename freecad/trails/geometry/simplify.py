@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#*                                                                     *
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+
+"""
+Polyline decimation for multi-resolution display
+"""
+
+import numpy
+
+def get_distances(points, start, end):
+    """
+    Return the distances of the points from the segment start-end
+    """
+
+    _seg = end - start
+    _len = _seg.dot(_seg)
+
+    if _len == 0.0:
+        return numpy.linalg.norm(points - start, axis=1)
+
+    _t = numpy.clip((points - start) @ _seg / _len, 0.0, 1.0)
+
+    return numpy.linalg.norm(points - (start + _t[:, None] * _seg), axis=1)
+
+def douglas_peucker(points, tolerance):
+    """
+    Return the boolean mask of the points kept by Douglas-Peucker
+    decimation of the polyline to within the tolerance.
+    The end points are always kept.
+    """
+
+    points = numpy.asarray(points, dtype=float)
+    _count = len(points)
+
+    keep = numpy.zeros(_count, dtype=bool)
+
+    if _count < 3:
+        keep[:] = True
+        return keep
+
+    keep[[0, -1]] = True
+
+    #iterate over a stack of spans rather than recursing
+    _stack = [(0, _count - 1)]
+
+    while _stack:
+
+        _a, _b = _stack.pop()
+
+        if _b - _a < 2:
+            continue
+
+        _dist = get_distances(points[_a + 1:_b], points[_a], points[_b])
+        _i = int(numpy.argmax(_dist))
+
+        if _dist[_i] <= tolerance:
+            continue
+
+        _i += _a + 1
+        keep[_i] = True
+
+        _stack.append((_a, _i))
+        _stack.append((_i, _b))
+
+    return keep
+
+def get_tolerances(points, levels=5, ratio=4.0, base=None):
+    """
+    Return increasing decimation tolerances for a point pyramid,
+    starting from base, or the point extents / 20000 if not provided
+    """
+
+    if base is None:
+
+        points = numpy.asarray(points, dtype=float)
+
+        if not len(points):
+            return []
+
+        base = numpy.linalg.norm(points.max(axis=0) - points.min(axis=0))
+        base = float(base) / 20000.0
+
+    return [base * ratio ** _i for _i in range(0, levels)]
+
+def build_pyramid(points, tolerances):
+    """
+    Return the list of decimated point arrays, one per tolerance,
+    preceded by the full resolution points.  Each level is decimated
+    from the previous one.
+    """
+
+    result = [numpy.asarray(points, dtype=float)]
+
+    for _tol in tolerances:
+
+        _prev = result[-1]
+        result.append(_prev[douglas_peucker(_prev, _tol)])
+
+    return result
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#*                                                                     *
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+
+"""
+Tolerant hashing of geometry coordinates
+
+Coordinates are snapped to a fixed grid in internal units (mm) before
+hashing, so hashes do not depend on the document units or policy and
+are comparable across documents.  The hash tolerance (in document units)
+only applies when hashes are compared: probing returns the hashes of
+every grid cell within the tolerance of a point, so points which differ
+only by round-off (serialization, unit conversion) still match.  Hashes
+are blake2b digests of the grid cells, and are stable across sessions,
+unlike the built-in hash().
+
+Alignment geometry is planar - the z coordinate is a rendering layer -
+so only the x and y coordinates are hashed.
+"""
+
+__title__ = 'spatial_hash.py'
+__author__ = 'Joel Graff'
+__url__ = "https://www.freecadweb.org"
+
+import itertools
+from hashlib import blake2b
+
+import numpy
+
+#number of coordinates hashed per point
+DIMENSIONS = 2
+
+#size of the hash grid cells in internal units (mm)
+GRID = 1.0
+
+def get_tolerance():
+    """
+    Return the hash comparison tolerance in document units from the
+    workbench policy
+    """
+
+    from ..project.support.document_properties import Policy
+
+    return Policy.HashTolerance.get_value()
+
+def set_tolerance(value):
+    """
+    Set the hash comparison tolerance in document units as the
+    workbench policy
+    """
+
+    from ..project.support.document_properties import Policy
+
+    Policy.HashTolerance.set_value(value)
+
+def get_coordinates(points):
+    """
+    Return an (n, >=2) array-like of points in internal units as grid
+    coordinates, where cell boundaries fall halfway between integers
+    """
+
+    _pts = numpy.array(
+        [tuple(_p)[:DIMENSIONS] for _p in points], dtype=float
+    ).reshape(-1, DIMENSIONS)
+
+    return _pts / GRID + 0.5
+
+def get_cells(points):
+    """
+    Return the integer grid cells of an (n, >=2) array-like of points in
+    internal units
+    """
+
+    return numpy.floor(get_coordinates(points)).astype(numpy.int64)
+
+def hash_cells(cells):
+    """
+    Return the signed 64-bit integer hash of an array of grid cells
+    """
+
+    _digest = blake2b(
+        numpy.ascontiguousarray(cells, dtype='<i8').tobytes(), digest_size=8
+    ).digest()
+
+    return int.from_bytes(_digest, 'little', signed=True)
+
+def get_hash(*points):
+    """
+    Return the hash of the passed points, typically the start and end
+    points of a curve or segment
+    """
+
+    return hash_cells(get_cells(points))
+
+def get_segment_hashes(points):
+    """
+    Return the hashes of the consecutive segments of a point list
+    """
+
+    _cells = get_cells(points)
+
+    return [
+        hash_cells(_cells[_i:_i + 2]) for _i in range(0, len(_cells) - 1)
+    ]
+
+def get_probe_hashes(*points, tolerance=None):
+    """
+    Return the hashes of the passed points and of the neighbouring grid
+    cells within the tolerance (document units) of any coordinate.  The
+    exact hash is always first.
+    """
+
+    from ..project.support import units
+
+    if tolerance is None:
+        tolerance = get_tolerance()
+
+    _reach = tolerance * units.scale_factor() / GRID
+
+    _coords = get_coordinates(points).ravel()
+    _cells = numpy.floor(_coords)
+
+    _lows = (numpy.floor(_coords - _reach) - _cells).astype(int)
+    _highs = (numpy.floor(_coords + _reach) - _cells).astype(int)
+
+    _offsets = [
+        [0] + [_o for _o in range(_lo, _hi + 1) if _o]
+        for _lo, _hi in zip(_lows.tolist(), _highs.tolist())
+    ]
+
+    _cells = _cells.astype(numpy.int64)
+
+    return [
+        hash_cells(_cells + numpy.array(_o, dtype=numpy.int64))
+        for _o in itertools.product(*_offsets)
+    ]
+
+class SpatialHash():
+    """
+    Dictionary of values keyed to point hashes, matched within a
+    tolerance
+    """
+
+    def __init__(self, tolerance=None):
+        """
+        Constructor
+
+        tolerance - lookup tolerance in document units
+        """
+
+        if tolerance is None:
+            tolerance = get_tolerance()
+
+        self.tolerance = tolerance
+        self.values = {}
+
+    def __len__(self):
+        """
+        Return the number of stored values
+        """
+
+        return len(self.values)
+
+    def add(self, points, value):
+        """
+        Store a value keyed to the hash of a list of points.
+        Returns the hash.
+        """
+
+        _hash = get_hash(*points)
+
+        self.values.setdefault(_hash, value)
+
+        return _hash
+
+    def get(self, points, default=None):
+        """
+        Return the value stored for a list of points, probing the
+        neighbouring cells within the tolerance if there is no exact match
+        """
+
+        for _hash in get_probe_hashes(*points, tolerance=self.tolerance):
+
+            if _hash in self.values:
+                return self.values[_hash]
+
+        return default
@@ -27,11 +27,10 @@ import os
 import FreeCADGui as Gui
 from . import ICONPATH
 
-from .project.commands \
-    import new_project_cmd, import_alignment_cmd, edit_alignment_cmd, \
-    test_cmd, test_cmd_2
+from .project.commands import command_stubs
 
-from .corridor.template import ViewTemplateLibrary
+#command modules are imported on first activation
+command_stubs.register()
 
 class TrailsWorkbench(Gui.Workbench):
     """
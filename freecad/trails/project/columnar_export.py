@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+# **************************************************************************
+# *                                                                        *
+# *  Copyright (c) 2019 Joel Graff <monograff76@gmail.com>                 *
+# *                                                                        *
+# *  This program is free software; you can redistribute it and/or modify  *
+# *  it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *  as published by the Free Software Foundation; either version 2 of     *
+# *  the License, or (at your option) any later version.                   *
+# *  for detail see the LICENCE text file.                                 *
+# *                                                                        *
+# *  This program is distributed in the hope that it will be useful,       *
+# *  but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *  GNU Library General Public License for more details.                  *
+# *                                                                        *
+# *  You should have received a copy of the GNU Library General Public     *
+# *  License along with this program; if not, write to the Free Software   *
+# *  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *  USA                                                                   *
+# *                                                                        *
+# **************************************************************************
+
+"""
+Columnar binary export of discretized alignments.
+
+Samples are written as named, equal-length columns (station, x, y, z,
+bearing and curve_hash for alignments; any columns for station / offset
+/ elevation tables).  Uncompressed .npz files are always available and
+are read back memory-mapped.  Parquet files are written when pyarrow
+is installed and read back through memory-mapped Arrow tables.
+
+The read functions need only NumPy (and pyarrow for Parquet), so
+downstream tools can use this module without FreeCAD.
+"""
+
+import os
+import zipfile
+
+import numpy
+
+__title__ = 'columnar_export.py'
+__author__ = "Joel Graff"
+__url__ = "https://www.freecadweb.org"
+
+ALIGNMENT_COLUMNS = ['station', 'x', 'y', 'z', 'bearing', 'curve_hash']
+
+def get_pyarrow():
+    """
+    Return the pyarrow module, or None if it is not installed
+    """
+
+    try:
+        import pyarrow
+        import pyarrow.parquet
+
+    except ImportError:
+        return None
+
+    return pyarrow
+
+def get_element_samples(geometry, interval=200.0, interval_type='Segment'):
+    """
+    Discretize a line or curve, returning the (n, 3) array of points and
+    the distances along the element and tangent bearings of each point
+    """
+
+    from ..geometry import arc
+
+    if geometry['Type'] == 'Line':
+
+        _points = numpy.array(
+            [tuple(geometry['Start']), tuple(geometry['End'])], dtype=float)
+
+        return _points, numpy.array([0.0, geometry['Length']]), \
+            numpy.full(2, geometry['BearingIn'], dtype=float)
+
+    _points = arc.get_points(geometry, interval, interval_type)[0]
+    _points = numpy.array([tuple(_p) for _p in _points], dtype=float)
+
+    #accumulate the central angle of each chord, scaled to the exact delta
+    _chords = numpy.linalg.norm(numpy.diff(_points[:, 0:2], axis=0), axis=1)
+    _angles = 2.0 * numpy.arcsin(
+        numpy.clip(_chords / (2.0 * geometry['Radius']), 0.0, 1.0))
+
+    _angle = numpy.concatenate([[0.0], numpy.cumsum(_angles)])
+
+    if _angle[-1] > 0.0:
+        _angle *= geometry['Delta'] / _angle[-1]
+
+    _bearing = geometry['BearingIn'] + geometry['Direction'] * _angle
+
+    return _points, _angle * geometry['Radius'], _bearing
+
+def get_samples(model, interval=200.0, interval_type='Segment'):
+    """
+    Discretize an AlignmentModel, returning a dictionary of the
+    ALIGNMENT_COLUMNS arrays in document units.  Stations are taken from
+    the element stationing and station equations.  Bearings are the
+    tangent bearings in radians, clockwise from north.  Points on lines
+    have a curve hash of zero, and the point shared by two elements takes
+    the hash of the following element.
+    """
+
+    from .support import units
+
+    _points = []
+    _positions = []
+    _bearings = []
+    _hashes = []
+
+    for _geo in model.data['geometry']:
+
+        if not _geo or _geo['Type'] not in ['Line', 'Curve']:
+            continue
+
+        _pts, _dist, _brg = get_element_samples(_geo, interval, interval_type)
+        _hash = _geo['Hash'] if _geo['Type'] == 'Curve' else 0
+
+        #drop the start point shared with the previous element
+        if _points and numpy.allclose(_points[-1][-1], _pts[0], atol=1e-4):
+
+            _hashes[-1][-1] = _hash
+            _pts, _dist, _brg = _pts[1:], _dist[1:], _brg[1:]
+
+        _points.append(_pts)
+        _positions.append(_geo['InternalStation'][0] + _dist)
+        _bearings.append(_brg)
+        _hashes.append(numpy.full(len(_pts), _hash, dtype=numpy.int64))
+
+    if not _points:
+        return {_k: numpy.empty(0) for _k in ALIGNMENT_COLUMNS}
+
+    #extend the last bearing to the end of the alignment
+    _tail = (model.data['meta'].get('Length') or 0.0) - _positions[-1][-1]
+
+    if _tail > 1e-4:
+
+        _brg = _bearings[-1][-1]
+        _end = _points[-1][-1] \
+            + _tail * numpy.array([numpy.sin(_brg), numpy.cos(_brg), 0.0])
+
+        _points.append(_end[None, :])
+        _positions.append(numpy.array([_positions[-1][-1] + _tail]))
+        _bearings.append(numpy.array([_brg]))
+        _hashes.append(numpy.zeros(1, dtype=numpy.int64))
+        _hashes[-2][-1] = 0
+
+    _coords = numpy.concatenate(_points) + tuple(model.get_datum())
+    _coords /= units.scale_factor()
+
+    return {
+        'station': model.get_stations(numpy.concatenate(_positions)),
+        'x': _coords[:, 0],
+        'y': _coords[:, 1],
+        'z': _coords[:, 2],
+        'bearing': numpy.mod(numpy.concatenate(_bearings), 2.0 * numpy.pi),
+        'curve_hash': numpy.concatenate(_hashes)
+    }
+
+def get_shape_samples(shape, interval=200.0, start_station=0.0):
+    """
+    Sample a path shape, such as a 3D alignment, at a fixed interval,
+    returning a dictionary of the ALIGNMENT_COLUMNS arrays in document
+    units.  Stations are the path length from start_station and the
+    curve hash is zero.
+    """
+
+    from .support import units
+
+    _scale = units.scale_factor()
+    _step = interval * _scale
+
+    _coords = []
+    _station = []
+    _bearing = []
+    _position = 0.0
+
+    for _edge in shape.Edges:
+
+        _count = max(1, int(numpy.ceil(_edge.Length / _step)))
+        _dist = numpy.linspace(0.0, _edge.Length, _count + 1)
+
+        #drop the start point shared with the previous edge
+        if _coords:
+            _dist = _dist[1:]
+
+        for _d in _dist:
+
+            _param = _edge.getParameterByLength(_d)
+            _tangent = _edge.tangentAt(_param)
+
+            _coords.append(tuple(_edge.valueAt(_param)))
+            _station.append(_position + _d)
+            _bearing.append(numpy.arctan2(_tangent.x, _tangent.y))
+
+        _position += _edge.Length
+
+    if not _coords:
+        return {_k: numpy.empty(0) for _k in ALIGNMENT_COLUMNS}
+
+    _coords = numpy.array(_coords, dtype=float) / _scale
+
+    return {
+        'station': numpy.array(_station) / _scale + start_station,
+        'x': _coords[:, 0],
+        'y': _coords[:, 1],
+        'z': _coords[:, 2],
+        'bearing': numpy.mod(_bearing, 2.0 * numpy.pi),
+        'curve_hash': numpy.zeros(len(_coords), dtype=numpy.int64)
+    }
+
+def _validate(columns):
+    """
+    Return the columns as contiguous arrays, ensuring equal lengths
+    """
+
+    result = {
+        _k: numpy.ascontiguousarray(_v) for _k, _v in columns.items()
+    }
+
+    if len({len(_v) for _v in result.values()}) > 1:
+        raise ValueError('Columns must be of equal length')
+
+    return result
+
+def write_npz(path, columns):
+    """
+    Write the columns to an uncompressed .npz file
+    """
+
+    numpy.savez(path, **_validate(columns))
+
+def read_npz(path):
+    """
+    Read the columns of an uncompressed .npz file as read-only arrays
+    memory-mapped from the file
+    """
+
+    result = {}
+
+    with zipfile.ZipFile(path) as _zip, open(path, 'rb') as _file:
+
+        for _info in _zip.infolist():
+
+            if _info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError('Compressed .npz files cannot be mapped')
+
+            #skip the zip local file header to reach the .npy data
+            _file.seek(_info.header_offset + 26)
+            _lengths = numpy.frombuffer(_file.read(4), dtype='<u2')
+            _file.seek(int(_lengths.sum()), os.SEEK_CUR)
+
+            _format = numpy.lib.format
+            _read_header = _format.read_array_header_2_0
+
+            if _format.read_magic(_file) == (1, 0):
+                _read_header = _format.read_array_header_1_0
+
+            _shape, _fortran, _dtype = _read_header(_file)
+
+            _name = os.path.splitext(_info.filename)[0]
+
+            result[_name] = numpy.memmap(
+                path, dtype=_dtype, mode='r', offset=_file.tell(),
+                shape=_shape, order='F' if _fortran else 'C'
+            )
+
+    return result
+
+def write_parquet(path, columns):
+    """
+    Write the columns to a Parquet file.  Requires pyarrow.
+    """
+
+    pyarrow = get_pyarrow()
+
+    if not pyarrow:
+        raise ImportError('Parquet export requires pyarrow')
+
+    _table = pyarrow.table(_validate(columns))
+
+    pyarrow.parquet.write_table(_table, path)
+
+def read_parquet(path):
+    """
+    Read the columns of a Parquet file, memory-mapping the file.
+    Returns arrays which share the Arrow buffers where possible.
+    """
+
+    pyarrow = get_pyarrow()
+
+    if not pyarrow:
+        raise ImportError('Parquet import requires pyarrow')
+
+    _table = pyarrow.parquet.read_table(path, memory_map=True)
+
+    return {
+        _name: _table.column(_name).to_numpy()
+        for _name in _table.column_names
+    }
+
+def write(path, columns):
+    """
+    Write the columns in the format given by the file extension,
+    .npz or .parquet
+    """
+
+    if os.path.splitext(path)[1].lower() == '.parquet':
+        write_parquet(path, columns)
+
+    else:
+        write_npz(path, columns)
+
+def read(path):
+    """
+    Read the columns of a .npz or .parquet file
+    """
+
+    if os.path.splitext(path)[1].lower() == '.parquet':
+        return read_parquet(path)
+
+    return read_npz(path)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#**************************************************************************
+#*                                                                     *
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Command resources (icons, accelerators, menu text and tool tips).
+
+Shared by the command stubs and the command classes, so the resources
+are defined once.  Only lightweight modules may be imported here, as the
+stubs load this module when the workbench starts.
+"""
+
+import os
+
+from PySide import QtCore
+
+from ... import ICONPATH
+
+__title__ = "command_resources.py"
+__author__ = "Joel Graff"
+__url__ = "https://www.freecadweb.org"
+
+#command name -> resources dictionary
+RESOURCES = {
+
+    'NewProjectCmd': {
+        'Pixmap'  : os.path.join(ICONPATH, 'icons', 'workbench.svg'),
+        'Accel'   : "Shift+N",
+        'MenuText': "New Project",
+        'ToolTip' : "Create a new project document and make it active",
+        'CmdType' : "ForEdit"
+    },
+
+    'ImportAlignmentCmd': {
+        'Pixmap'  : os.path.join(ICONPATH, 'icons', 'new_alignment.svg'),
+        'Accel'   : 'Ctrl+Shift+A',
+        'MenuText': 'Import Alignment',
+        'ToolTip' : 'Import a horizontal or vertical alignment from CSV',
+        'CmdType' : 'ForEdit'
+    },
+
+    'EditAlignmentCmd': {
+        'Pixmap'  : os.path.join(ICONPATH, 'icons', 'new_alignment.svg'),
+        'Accel'   : 'Ctrl+Shift+D',
+        'MenuText': 'Draft Alignment',
+        'ToolTip' : 'Draft a horizontal alignment',
+        'CmdType' : 'ForEdit'
+    },
+
+    'ViewTemplateLibrary': {
+        'Pixmap'  : os.path.join(ICONPATH, 'icons', 'new_alignment.svg'),
+        'Accel'   : "Ctrl+Alt+G",
+        'MenuText': "Open Template Library",
+        'ToolTip' : "Open the template library",
+        'CmdType' : "ForEdit"
+    },
+
+    'Command': {
+        'Pixmap'  : '',
+        'Accel'   : '',
+        'MenuText': '',
+        'ToolTip' : '',
+        'CmdType' : 'ForEdit'
+    },
+
+    'Command2': {
+        'Pixmap'  : 'Draft_Arc',
+        'Accel'   : "A, R",
+        'MenuText': QtCore.QT_TRANSLATE_NOOP("Draft_Arc", "Arc"),
+        'ToolTip' : QtCore.QT_TRANSLATE_NOOP(
+            "Draft_Arc", "Creates an arc. CTRL to snap, SHIFT to constrain")
+    },
+}
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#**************************************************************************
+#*                                                                     *
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Lightweight command registration.
+
+Commands are registered through stubs holding only their resources (see
+command_resources), so the workbench starts without importing the command
+modules and their dependencies (Draft, DraftTools, numpy, task panels,
+etc.).  The real command is imported and constructed on first activation.
+"""
+
+import importlib
+
+import FreeCADGui as Gui
+
+from .command_resources import RESOURCES
+
+__title__ = "command_stubs.py"
+__author__ = "Joel Graff"
+__url__ = "https://www.freecadweb.org"
+
+#command name -> (module, class name)
+#modules are relative to this package
+COMMANDS = {
+    'NewProjectCmd': ('.new_project_cmd', 'NewProjectCmd'),
+    'ImportAlignmentCmd': ('.import_alignment_cmd', 'ImportAlignmentCmd'),
+    'EditAlignmentCmd': ('.edit_alignment_cmd', 'EditAlignmentCmd'),
+    'ViewTemplateLibrary': (
+        '...corridor.template.ViewTemplateLibrary', 'ViewTemplateLibrary'),
+    'Command': ('.test_cmd', 'Command'),
+    'Command2': ('.test_cmd_2', 'Command2'),
+}
+
+class CommandStub():
+    """
+    Stand-in command which loads the real command on first activation
+    """
+
+    def __init__(self, module, class_name, resources):
+        """
+        Constructor
+        """
+
+        self.module = module
+        self.class_name = class_name
+        self.resources = resources
+        self.command = None
+
+    def get_command(self):
+        """
+        Return the real command, importing it if necessary
+        """
+
+        if not self.command:
+
+            _module = importlib.import_module(self.module, __package__)
+            self.command = getattr(_module, self.class_name)()
+
+        return self.command
+
+    def GetResources(self):
+        """
+        Return the command resources dictionary
+        """
+
+        return self.resources
+
+    def IsActive(self):
+        """
+        Defer to the real command once loaded.  Until then, the command is
+        available and activation conditions are checked on activation.
+        """
+
+        if not self.command or not hasattr(self.command, 'IsActive'):
+            return True
+
+        return self.command.IsActive()
+
+    def Activated(self):
+        """
+        Load and activate the real command
+        """
+
+        _cmd = self.get_command()
+
+        if hasattr(_cmd, 'IsActive') and not _cmd.IsActive():
+            return
+
+        _cmd.Activated()
+
+def register():
+    """
+    Register the command stubs
+    """
+
+    for _name, (_module, _class) in COMMANDS.items():
+        Gui.addCommand(_name, CommandStub(_module, _class, RESOURCES[_name]))
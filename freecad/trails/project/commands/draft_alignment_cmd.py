@@ -36,10 +36,10 @@ import DraftTools
 from DraftGui import translate
 
 from ..tasks.alignment.draft_alignment_task import DraftAlignmentTask
-from ...project.support import utils
+from ...project.support import instrumentation, utils
 from ... import resources
 from ...geometry import arc
-from .alignment_tracker import AlignmentTracker
+from ..trackers.alignment_tracker import AlignmentTracker
 
 
 class DraftAlignmentCmd(DraftTools.DraftTool):
@@ -118,6 +118,9 @@ class DraftAlignmentCmd(DraftTools.DraftTool):
 
         self.call = self.view.addEventCallback("SoEvent", self.action)
 
+        #points picked while drafting
+        self.node = []
+
         #make all other visible geometry unselectable
         view_objects = [
             _v.ViewObject for _v in App.ActiveDocument.findObjects()
@@ -224,6 +227,8 @@ class DraftAlignmentCmd(DraftTools.DraftTool):
 
             self.temp_group.addObject(_wire)
 
+            _wire.recompute()
+
     def get_control_geometry(self, curve_hash=None):
         """
         Return a list of control geometry names
@@ -300,6 +305,7 @@ class DraftAlignmentCmd(DraftTools.DraftTool):
 
         geo.ViewObject.Visibility = False
 
+    @instrumentation.timed('event')
     def action(self, arg):
         """
         Event handling for alignment drawing
@@ -315,6 +321,15 @@ class DraftAlignmentCmd(DraftTools.DraftTool):
         if arg['Type'] == 'SoLocation2Event':
 
             _p = Gui.ActiveDocument.ActiveView.getCursorPos()
+
+            #while drafting, only the rubber-band segment follows the cursor
+            if self.node:
+                self.alignment_tracker.update_tail(
+                    Gui.ActiveDocument.ActiveView.getPoint(_p)
+                )
+
+                return
+
             info = Gui.ActiveDocument.ActiveView.getObjectInfo(_p)
 
             curve_hash = None
@@ -343,9 +358,16 @@ class DraftAlignmentCmd(DraftTools.DraftTool):
             #if this is a new curve, hide the prev geometry if not active
 #            if self.curve_hash:
 
+            #control geometry is recomputed as it is created, so mouse
+            #movement never recomputes the document
+            return
+
         #trap button clicks
         elif arg['Type'] == 'SoMouseButtonEvent':
 
+            if arg['State'] != 'DOWN' or arg['Button'] != 'BUTTON1':
+                return
+
             _p = Gui.ActiveDocument.ActiveView.getCursorPos()
             info = Gui.ActiveDocument.ActiveView.getObjectInfo(_p)
 
@@ -372,7 +394,11 @@ class DraftAlignmentCmd(DraftTools.DraftTool):
                     self.hide_control_geometry()
                     self.curve_hash = None
 
-        #    self.alignment_tracker.update(self.node + [self.point])
+                #picking empty space drafts the next point
+                _point = Gui.ActiveDocument.ActiveView.getPoint(_p)
+
+                self.node.append(_point)
+                self.draw_update(_point)
 
         else:
             return
@@ -385,18 +411,21 @@ class DraftAlignmentCmd(DraftTools.DraftTool):
         Undo the last segment
         """
 
-        #if len(self.node) > 1:
+        if len(self.node) > 1:
 
-        #    self.node.pop()
-        #    self.alignment_tracker.update(self.node)
-        #    self.obj.Shape = self.update_shape(self.node)
-        #    print(translate('Transporation', 'Undo last point'))
+            self.node.pop()
+            self.alignment_tracker.pop()
+            print(translate('Transporation', 'Undo last point'))
 
+    @instrumentation.timed('scene')
     def draw_update(self, point):
         """
         Update the geometry as it has been defined
         """
 
+        #commit the picked point to the tracker's frozen coordinates
+        self.alignment_tracker.append(point)
+
         if len(self.node) == 1:
 
             self.alignment_tracker.on()
@@ -408,11 +437,6 @@ class DraftAlignmentCmd(DraftTools.DraftTool):
 
             return
 
-        print(type(self.obj.Shape))
-        #res = self.update_shape(self.node)
-        #print(type(res))
-        #self.obj.Shape = self.update_shape(self.node)
-
         print(
             translate(
                 'Transportation',
@@ -422,10 +446,11 @@ class DraftAlignmentCmd(DraftTools.DraftTool):
 
     def update_shape(self, points):
         """
-        Generates the shape to be rendered during the creation process
+        Rebuild the rendered wire from a full list of points, e.g. after
+        the drafted points are replaced
         """
 
-        #return Draft.makeWire(points).Shape
+        self.alignment_tracker.update(points)
 
     def clean_up(self):
         """
@@ -31,7 +31,7 @@ from DraftTools import DraftTool
 
 from ..support import utils
 
-from ... import resources
+from .command_resources import RESOURCES
 from ...alignment import alignment as hz_align
 
 from ..tasks.alignment import edit_alignment_task 
@@ -79,13 +79,7 @@ class EditAlignmentCmd(DraftTool):
         Icon resources.
         """
 
-        icon_path = resources.__path__[0] + '/icons/new_alignment.svg'
-
-        return {'Pixmap'  : icon_path,
-                'Accel'   : 'Ctrl+Shift+D',
-                'MenuText': 'Draft Alignment',
-                'ToolTip' : 'Draft a horizontal alignment',
-                'CmdType' : 'ForEdit'}
+        return RESOURCES['EditAlignmentCmd']
 
     def Activated(self):
         """
@@ -139,4 +133,4 @@ class EditAlignmentCmd(DraftTool):
 
         self.is_activated = False
 
-Gui.addCommand('EditAlignmentCmd', EditAlignmentCmd())
+#registered on demand through project.commands.command_stubs
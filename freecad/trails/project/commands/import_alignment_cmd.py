@@ -23,10 +23,10 @@
 """
 Command to being alignment importing
 """
-import os
 import FreeCADGui as Gui
 
 from ..tasks.alignment.import_alignment_task import ImportAlignmentTask
+from .command_resources import RESOURCES
 
 
 class ImportAlignmentCmd():
@@ -45,16 +45,7 @@ class ImportAlignmentCmd():
         Icon resources.
         """
 
-        icon_path = os.path.dirname(os.path.abspath(__file__))
-
-        icon_path += "/../../resources/icons/new_alignment.svg"
-
-        return {'Pixmap'  : icon_path,
-                'Accel'   : 'Ctrl+Shift+A',
-                'MenuText': 'Import Alignment',
-                'ToolTip' :
-                    'Import a horizontal or vertical alignment from CSV',
-                'CmdType' : 'ForEdit'}
+        return RESOURCES['ImportAlignmentCmd']
 
     def Activated(self):
         """
@@ -67,4 +58,4 @@ class ImportAlignmentCmd():
 
         return
 
-Gui.addCommand('ImportAlignmentCmd', ImportAlignmentCmd())
+#registered on demand through project.commands.command_stubs
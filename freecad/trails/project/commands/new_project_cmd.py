@@ -31,21 +31,14 @@ import FreeCADGui as Gui
 from PySide import QtGui, QtCore
 
 from ..support import document_properties
-from ... import resources, corridor
+from ... import corridor
+from .command_resources import RESOURCES
 
 class NewProjectCmd():
     """
     Command to creatae a new Trails project
     """
-    icon_path = os.path.dirname(resources.__file__)
-
-    resources = {
-        'Pixmap'  : icon_path + '/icons/workbench.svg',
-        'Accel'   : "Shift+N",
-        'MenuText': "New Project",
-        'ToolTip' : "Create a new project document and make it active",
-        'CmdType' : "ForEdit"
-    }
+    resources = RESOURCES['NewProjectCmd']
 
     def GetResources(self):
         """
@@ -138,4 +131,4 @@ class NewProjectCmd():
         #create observers to handle tasks when document-level events occur
         #Observer.create(App.ActiveDocument)
 
-Gui.addCommand('NewProjectCmd', NewProjectCmd())
+#registered on demand through project.commands.command_stubs
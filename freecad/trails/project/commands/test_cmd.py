@@ -36,6 +36,8 @@ from DraftTrackers import editTracker
 from DraftTools import Modifier
 from DraftTools import selectObject, getPoint, redraw3DView
 
+from .command_resources import RESOURCES
+
 #from .edit_tracker import editTracker
 #plane = WorkingPlane.plane()
 
@@ -49,11 +51,7 @@ class Command(Modifier):
 
     def GetResources(self):
 
-        return {'Pixmap'  : '',
-                'Accel'   : '',
-                'MenuText': '',
-                'ToolTip' : '',
-                'CmdType' : 'ForEdit'}
+        return RESOURCES['Command']
 
     def Activated(self):
         """
@@ -64,4 +62,4 @@ class Command(Modifier):
 
         self.tracker = editTracker(App.Vector(), 'test', 0)
 
-Gui.addCommand('Command', Command())
+#registered on demand through project.commands.command_stubs
@@ -39,6 +39,8 @@ from DraftTrackers import editTracker, Tracker, lineTracker
 from DraftTools import Modifier, Creator, DraftTool
 from DraftTools import selectObject, getPoint, redraw3DView
 
+from .command_resources import RESOURCES
+
 #from .edit_tracker import editTracker
 
 plane = WorkingPlane.plane()
@@ -74,10 +76,7 @@ class Command2(DraftTool):
         DraftTool.__init__(self)
 
     def GetResources(self):
-        return {'Pixmap'  : 'Draft_Arc',
-                'Accel' : "A, R",
-                'MenuText': QtCore.QT_TRANSLATE_NOOP("Draft_Arc", "Arc"),
-                'ToolTip': QtCore.QT_TRANSLATE_NOOP("Draft_Arc", "Creates an arc. CTRL to snap, SHIFT to constrain")}
+        return RESOURCES['Command2']
 
     def Activated(self):
         DraftTool.Activated(self,"TrackerTest")
@@ -106,4 +105,4 @@ class Command2(DraftTool):
             if (arg["State"] == "DOWN") and (arg["Button"] == "BUTTON1"):
                 pass
 
-Gui.addCommand('Command2', Command2())
+#registered on demand through project.commands.command_stubs
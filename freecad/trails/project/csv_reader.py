@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+# **************************************************************************
+# *                                                                        *
+# *  Copyright (c) 2019 Joel Graff <monograff76@gmail.com>                 *
+# *                                                                        *
+# *  This program is free software; you can redistribute it and/or modify  *
+# *  it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *  as published by the Free Software Foundation; either version 2 of     *
+# *  the License, or (at your option) any later version.                   *
+# *  for detail see the LICENCE text file.                                 *
+# *                                                                        *
+# *  This program is distributed in the hope that it will be useful,       *
+# *  but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *  GNU Library General Public License for more details.                  *
+# *                                                                        *
+# *  You should have received a copy of the GNU Library General Public     *
+# *  License along with this program; if not, write to the Free Software   *
+# *  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *  USA                                                                   *
+# *                                                                        *
+# **************************************************************************
+
+"""
+Columnar, chunked reader for CSV alignment files.
+
+Rows are read in chunks of a fixed size into per-column NumPy string
+arrays (using pandas when it is available), numeric columns are
+converted a column at a time and alignments are split on the rows where
+the ID column is set.  Each alignment is yielded as soon as the next one
+begins, so memory is bounded by the chunk size and the largest single
+alignment rather than the file size.
+"""
+
+import csv
+import itertools
+
+import numpy
+
+__title__ = 'csv_reader.py'
+__author__ = "Joel Graff"
+__url__ = "https://www.freecadweb.org"
+
+META_FIELDS = ['ID', 'Northing', 'Easting']
+
+DATA_FIELDS = [
+    'Northing', 'Easting', 'Bearing', 'Distance', 'Radius', 'Degree', 'Spiral'
+]
+
+STATION_FIELDS = ['Parent_ID', 'Back', 'Forward']
+
+CHUNK_SIZE = 65536
+
+#bytes read to sniff the dialect and estimate the row count
+SAMPLE_SIZE = 4096
+
+def get_pandas():
+    """
+    Return the pandas module, or None if it is not installed
+    """
+
+    try:
+        import pandas
+
+    except ImportError:
+        return None
+
+    return pandas
+
+def sniff(filepath, size=SAMPLE_SIZE):
+    """
+    Sniff the dialect and header from the start of the file.
+    Returns a tuple of (dialect, has_header, sample)
+    """
+
+    with open(filepath, encoding='utf-8-sig', newline='') as stream:
+        sample = stream.read(size)
+
+    #drop the last line, which is likely incomplete
+    _lines = sample.splitlines(True)
+
+    if len(_lines) > 1:
+        sample = ''.join(_lines[:-1])
+
+    sniffer = csv.Sniffer()
+
+    try:
+        dialect = sniffer.sniff(sample)
+        has_header = sniffer.has_header(sample)
+
+    #default to a copy of the excel dialect, as callers modify it
+    except csv.Error:
+        dialect = type('dialect', (csv.excel,), {})
+        has_header = True
+
+    return dialect, has_header, sample
+
+def get_columns(headers):
+    """
+    Return a dictionary of the named columns in the header list,
+    keyed by name, with the column index as the value.  Unnamed
+    and duplicate columns are ignored.
+    """
+
+    result = {}
+
+    for _i, _name in enumerate(headers):
+
+        if _name and _name not in result:
+            result[_name] = _i
+
+    return result
+
+def to_float(values, station=False):
+    """
+    Convert an array of strings to floats.  Empty values become NaN,
+    as do malformed values.  Station values may include '+'.
+    """
+
+    _v = numpy.char.strip(numpy.asarray(values, dtype=str))
+
+    if station:
+        _v = numpy.char.replace(_v, '+', '')
+
+    result = numpy.full(_v.shape, numpy.nan)
+    _mask = _v != ''
+
+    try:
+        result[_mask] = _v[_mask].astype(float)
+
+    #convert value by value only when the column holds malformed numbers
+    except ValueError:
+
+        for _i in numpy.flatnonzero(_mask):
+
+            try:
+                result[_i] = float(_v[_i])
+
+            except ValueError:
+                continue
+
+    return result
+
+def _read_chunks_csv(filepath, dialect, columns, chunk_size, skip_header):
+    """
+    Chunk generator using the csv module
+    """
+
+    with open(filepath, encoding='utf-8-sig', newline='') as stream:
+
+        reader = csv.reader(stream, dialect)
+
+        if skip_header:
+            next(reader, None)
+
+        while True:
+
+            rows = list(itertools.islice(reader, chunk_size))
+
+            if not rows:
+                return
+
+            #short rows are padded with empty values
+            yield {
+                _k: numpy.array(
+                    [_r[_i] if _i < len(_r) else '' for _r in rows], dtype=str
+                )
+                for _k, _i in columns.items()
+            }
+
+def _read_chunks_pandas(pandas, filepath, dialect, columns, chunk_size,
+                        skip_header):
+    """
+    Chunk generator using pandas
+    """
+
+    _reader = pandas.read_csv(
+        filepath, sep=dialect.delimiter, quotechar=dialect.quotechar,
+        header=None, skiprows=int(bool(skip_header)),
+        usecols=sorted(set(columns.values())), dtype=str,
+        keep_default_na=False, encoding='utf-8-sig', chunksize=chunk_size
+    )
+
+    for _chunk in _reader:
+
+        yield {
+            _k: _chunk[_i].to_numpy(dtype=str) for _k, _i in columns.items()
+        }
+
+def read_chunks(filepath, headers, dialect, chunk_size=CHUNK_SIZE,
+                skip_header=True):
+    """
+    Generator yielding dictionaries of column name to string arrays for
+    the named columns, chunk_size rows at a time
+    """
+
+    columns = get_columns(headers)
+    pandas = get_pandas()
+
+    if pandas:
+        return _read_chunks_pandas(
+            pandas, filepath, dialect, columns, chunk_size, skip_header
+        )
+
+    return _read_chunks_csv(
+        filepath, dialect, columns, chunk_size, skip_header
+    )
+
+def _concatenate(parts):
+    """
+    Join the column arrays of consecutive chunk slices
+    """
+
+    if len(parts) == 1:
+        return parts[0]
+
+    return {
+        _k: numpy.concatenate([_p[_k] for _p in parts]) for _k in parts[0]
+    }
+
+def build_alignment(columns):
+    """
+    Build the alignment data from the column arrays of its rows,
+    returning None if the rows define no geometry or stationing.
+
+    Returns a dictionary of:
+    meta - dictionary of metadata values from the first row
+    station - dictionary of station equations (list of [back, forward]
+              under 'equations') and intersection equations (keyed by
+              parent ID)
+    data - dictionary of float arrays for the valid PIs, keyed by field
+    """
+
+    _count = len(next(iter(columns.values())))
+    _empty = numpy.full(_count, numpy.nan)
+
+    #metadata is defined on the first row only
+    meta = {_k: str(columns[_k][0]) for _k in META_FIELDS if _k in columns}
+
+    if meta.get('ID'):
+        meta['ID'] = meta['ID'].replace(' ', '_')
+
+    #station and intersection equations
+    station = {'equations': []}
+
+    _back = _empty
+    _fwd = _empty
+
+    if 'Back' in columns:
+        _back = to_float(columns['Back'], True)
+
+    if 'Forward' in columns:
+        _fwd = to_float(columns['Forward'], True)
+
+    _eqs = numpy.nan_to_num(_back) != 0.0
+    _eqs |= numpy.nan_to_num(_fwd) != 0.0
+
+    _parents = numpy.full(_count, '')
+
+    if 'Parent_ID' in columns:
+        _parents = numpy.char.replace(
+            numpy.char.strip(columns['Parent_ID']), ' ', '_'
+        )
+
+    for _i in numpy.flatnonzero(_eqs):
+
+        _sta = [float(numpy.nan_to_num(_back[_i])),
+                float(numpy.nan_to_num(_fwd[_i]))]
+
+        if _parents[_i]:
+            station[str(_parents[_i])] = _sta
+
+        else:
+            station['equations'].append(_sta)
+
+    #PI data
+    data = {
+        _k: to_float(columns[_k]) if _k in columns else _empty.copy()
+        for _k in DATA_FIELDS
+    }
+
+    _valid = numpy.isfinite
+
+    #(northing / easting) or (bearing / distance) must be specified,
+    #along with either radius or degree of curve
+    _pos = _valid(data['Northing']) & _valid(data['Easting'])
+    _pos |= _valid(data['Bearing']) & _valid(data['Distance'])
+    _mask = _pos & (_valid(data['Radius']) | _valid(data['Degree']))
+
+    if not (_mask.any() or _eqs.any()):
+        return None
+
+    data = {_k: _v[_mask] for _k, _v in data.items()}
+
+    return {'meta': meta, 'station': station, 'data': data}
+
+def read_alignments(filepath, headers, dialect, chunk_size=CHUNK_SIZE,
+                    skip_header=True):
+    """
+    Generator yielding the data of each alignment in the file in turn.
+    See build_alignment() for the data format.
+
+    headers - the field name of each column, blank for unused columns
+    """
+
+    if 'ID' not in headers:
+        return
+
+    pending = []
+
+    for chunk in read_chunks(filepath, headers, dialect, chunk_size,
+                             skip_header):
+
+        #rows with an ID begin a new alignment
+        _ids = numpy.char.strip(chunk['ID'])
+        _bounds = numpy.flatnonzero(_ids != '').tolist() + [len(_ids)]
+
+        #leading rows continue the alignment begun in a previous chunk
+        if _bounds[0] > 0:
+            pending.append({_k: _v[0:_bounds[0]] for _k, _v in chunk.items()})
+
+        for _a, _b in zip(_bounds[:-1], _bounds[1:]):
+
+            if pending:
+
+                _result = build_alignment(_concatenate(pending))
+
+                if _result:
+                    yield _result
+
+            pending = [{_k: _v[_a:_b] for _k, _v in chunk.items()}]
+
+    if pending:
+
+        _result = build_alignment(_concatenate(pending))
+
+        if _result:
+            yield _result
+
+def map_headers(sample, dialect, mapping=None):
+    """
+    Return the field name of each column from the header row of a sample,
+    blank for unused columns.
+
+    mapping - dictionary of file headers to field names.  Headers which
+              are not mapped are used if they are field names.
+    """
+
+    _row = next(csv.reader(sample.splitlines(), dialect), [])
+    _fields = set(META_FIELDS + DATA_FIELDS + STATION_FIELDS)
+
+    mapping = mapping or {}
+    result = []
+
+    for _header in _row:
+
+        _header = _header.strip()
+        _field = mapping.get(_header, _header)
+
+        result.append(_field if _field in _fields else '')
+
+    return result
+
+def to_model_data(alignment):
+    """
+    Convert alignment data read from a file (see build_alignment()) to
+    AlignmentModel data.  PIs are located by northing / easting, or by
+    distance and bearing (degrees) from the previous PI, beginning at
+    the northing / easting of the first row.  Curves take the radius, or
+    the degree of curve where no radius is given.  Values are in
+    document units.
+    """
+
+    from FreeCAD import Vector
+
+    from ..alignment.alignment_model import get_pi_data
+    from .support import units, utils
+
+    _scale = units.scale_factor()
+    _metric = units.is_metric_doc()
+
+    meta = alignment['meta']
+    data = alignment['data']
+
+    _start = Vector()
+
+    if meta.get('Northing') and meta.get('Easting'):
+        _start = Vector(
+            float(meta['Easting']), float(meta['Northing']), 0.0
+        ).multiply(_scale)
+
+    pis = [_start]
+    radii = [0.0]
+
+    for _i in range(len(data['Radius'])):
+
+        _n, _e = data['Northing'][_i], data['Easting'][_i]
+
+        if numpy.isfinite(_n) and numpy.isfinite(_e):
+            _pi = Vector(_e, _n, 0.0).multiply(_scale)
+
+        else:
+            _pi = pis[-1].add(utils.distance_bearing_to_coordinates(
+                data['Distance'][_i] * _scale, data['Bearing'][_i]
+            ))
+
+        #skip coincident PIs
+        if _pi.sub(pis[-1]).Length < 1e-6:
+            continue
+
+        _radius = 0.0
+
+        if numpy.isfinite(data['Radius'][_i]):
+            _radius = data['Radius'][_i]
+
+        elif numpy.nan_to_num(data['Degree'][_i]):
+            _radius = utils.doc_to_radius(data['Degree'][_i], _metric)
+
+        pis.append(_pi)
+        radii.append(float(_radius) * _scale)
+
+    if len(pis) < 2:
+        return None
+
+    #an equation with no back station sets the starting station
+    _eqs = alignment['station']['equations']
+    _start_sta = 0.0
+
+    if _eqs and not _eqs[0][0]:
+        _start_sta, _eqs = _eqs[0][1], _eqs[1:]
+
+    station = [Vector(0.0, _start_sta, 0.0)]
+    station += [Vector(_back, _ahead, 0.0) for _back, _ahead in _eqs]
+
+    return get_pi_data(
+        {'ID': meta.get('ID') or '', 'StartStation': _start_sta},
+        pis, radii, station
+    )
@@ -143,6 +143,32 @@ class Preferences():
             return DocumentProperty._get_string('Document', 'AddThumbnailLogo')
 
 
+    class Instrumentation():
+        """
+        Enable interaction latency instrumentation
+        """
+
+        @staticmethod
+        def set_value(value=False):
+            """
+            Set the instrumentation preference value
+            """
+
+            DocumentProperty._set_int(
+                'Mod/Transportation', 'Instrumentation', int(bool(value))
+            )
+
+        @staticmethod
+        def get_value():
+            """
+            Return the instrumentation preference value
+            """
+
+            return bool(DocumentProperty._get_int(
+                'Mod/Transportation', 'Instrumentation', 0
+            ))
+
+
 class TemplateLibrary():
     """
     Library to manage sketch templates for sweeping along alignments
@@ -207,3 +233,29 @@ class Policy():
             DocumentProperty._set_float(
                 'Mod/Transportation', 'MinimumTangentLength', value
                 )
+
+    class HashTolerance():
+        """
+        Policy for the tolerance of geometry hash comparisons,
+        in document units
+        """
+
+        @staticmethod
+        def get_value():
+            """
+            Return the geometry hash tolerance value
+            """
+
+            return DocumentProperty._get_float(
+                'Mod/Transportation', 'HashTolerance', 0.001
+                )
+
+        @staticmethod
+        def set_value(value):
+            """
+            Set the geometry hash tolerance value
+            """
+
+            DocumentProperty._set_float(
+                'Mod/Transportation', 'HashTolerance', value
+                )
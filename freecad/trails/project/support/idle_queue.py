@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#*                                                                     *
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+
+"""
+Idle-time work queue.
+
+Callbacks are run one at a time from the GUI event loop, yielding to
+user events between each, so deferred work (such as warming caches
+after a document opens) never blocks interaction.  Without a GUI there
+is no event loop and queued work is simply left to be done on demand.
+"""
+
+__title__ = "idle_queue.py"
+__author__ = "Joel Graff"
+__url__ = "https://www.freecadweb.org"
+
+from collections import deque
+
+import FreeCAD as App
+
+from .singleton import Singleton
+
+class IdleQueue(metaclass=Singleton):
+    """
+    FIFO queue of callbacks run in idle time
+    """
+
+    #milliseconds between callbacks, letting pending events through
+    INTERVAL = 0
+
+    def __init__(self):
+        """
+        Constructor
+        """
+
+        self.callbacks = deque()
+        self.timer = None
+
+    def push(self, callback):
+        """
+        Queue a callback, starting the queue if idle
+        """
+
+        if not App.GuiUp:
+            return
+
+        self.callbacks.append(callback)
+
+        if not self.timer:
+
+            from PySide import QtCore
+
+            self.timer = QtCore.QTimer()
+            self.timer.setSingleShot(True)
+            self.timer.timeout.connect(self.run_next)
+
+        if not self.timer.isActive():
+            self.timer.start(self.INTERVAL)
+
+    def clear(self):
+        """
+        Discard all queued callbacks
+        """
+
+        self.callbacks.clear()
+
+        if self.timer:
+            self.timer.stop()
+
+    def run_next(self):
+        """
+        Run the next callback and reschedule while work remains
+        """
+
+        if not self.callbacks:
+            return
+
+        _cb = self.callbacks.popleft()
+
+        #a failed callback must not stall the rest of the queue
+        try:
+            _cb()
+
+        except Exception as _ex:
+            App.Console.PrintWarning(
+                'Idle task {} failed: {}\n'.format(
+                    getattr(_cb, '__qualname__', _cb), _ex)
+            )
+
+        if self.callbacks:
+            self.timer.start(self.INTERVAL)
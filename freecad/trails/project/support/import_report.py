@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#*                                                                     *
+#* Copyright (c) 2018 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+
+"""
+Import-time reporting for workbench start-up.
+
+Runs an import in a fresh interpreter with '-X importtime' and summarizes
+the parsed timings, so start-up cost can be tracked between releases.
+The interpreter must be able to import FreeCAD for the GUI modules, e.g.
+with FreeCAD's lib directory on PYTHONPATH:
+
+    python -m freecad.trails.project.support.import_report \\
+        freecad.trails.init_gui --top 25 --budget 500
+"""
+
+__title__ = "import_report.py"
+__author__ = "Joel Graff"
+__url__ = "https://www.freecadweb.org"
+
+import argparse
+import json
+import subprocess
+import sys
+
+def parse_importtime(text):
+    """
+    Parse '-X importtime' output into a list of dictionaries of module
+    name, nesting depth and self / cumulative times in milliseconds
+    """
+
+    result = []
+
+    for _line in text.splitlines():
+
+        if not _line.startswith('import time:'):
+            continue
+
+        _fields = _line[len('import time:'):].split('|')
+
+        if len(_fields) != 3:
+            continue
+
+        #skip the column header
+        try:
+            _self, _cumulative = int(_fields[0]), int(_fields[1])
+
+        except ValueError:
+            continue
+
+        _name = _fields[2].rstrip()
+        _module = _name.lstrip()
+
+        result.append({
+            'module': _module,
+            'depth': (len(_name) - len(_module) - 1) // 2,
+            'self': _self / 1000.0,
+            'cumulative': _cumulative / 1000.0
+        })
+
+    return result
+
+def measure(module, python=None):
+    """
+    Import the module in a fresh interpreter, returning the parsed timings
+    and the interpreter error output, if the import failed
+    """
+
+    if not python:
+        python = sys.executable
+
+    _proc = subprocess.run(
+        [python, '-X', 'importtime', '-c', 'import ' + module],
+        stderr=subprocess.PIPE, universal_newlines=True, check=False
+    )
+
+    _errors = ''
+
+    if _proc.returncode:
+        _errors = '\n'.join(
+            _l for _l in _proc.stderr.splitlines()
+            if not _l.startswith('import time:')
+        )
+
+    return parse_importtime(_proc.stderr), _errors
+
+def summarize(entries, top=20):
+    """
+    Return the total import time and the entries with the largest self
+    times, in descending order
+    """
+
+    #top-level imports carry the cumulative cost of everything below them
+    _total = sum(_e['cumulative'] for _e in entries if _e['depth'] == 0)
+
+    _top = sorted(entries, key=lambda _e: _e['self'], reverse=True)
+
+    return _total, _top[:top]
+
+def format_report(entries, top=20):
+    """
+    Format the import timings as a text table
+    """
+
+    _total, _top = summarize(entries, top)
+
+    lines = ['{} modules imported in {:.1f} ms'.format(len(entries), _total)]
+    lines.append('{:>10} {:>12}  {}'.format('self ms', 'cumul. ms', 'module'))
+
+    for _e in _top:
+        lines.append('{:>10.2f} {:>12.2f}  {}'.format(
+            _e['self'], _e['cumulative'], _e['module']))
+
+    return '\n'.join(lines)
+
+def main(argv=None):
+    """
+    Command line entry point.  Returns non-zero if the import fails or
+    exceeds the budget.
+    """
+
+    parser = argparse.ArgumentParser(
+        description='Report the import time of a module')
+
+    parser.add_argument('module', nargs='?', default='freecad.trails.init_gui')
+    parser.add_argument('--python', help='interpreter to run the import')
+    parser.add_argument('--top', type=int, default=20,
+                        help='number of modules to list')
+    parser.add_argument('--json', help='write the timings to a JSON file')
+    parser.add_argument('--budget', type=float,
+                        help='maximum total import time, in milliseconds')
+
+    args = parser.parse_args(argv)
+
+    entries, errors = measure(args.module, args.python)
+
+    if errors:
+        print(errors, file=sys.stderr)
+        return 1
+
+    print(format_report(entries, args.top))
+
+    if args.json:
+        with open(args.json, 'w') as _f:
+            json.dump(entries, _f, indent=1)
+
+    _total = summarize(entries, 0)[0]
+
+    if args.budget and _total > args.budget:
+        print('Import time {:.1f} ms exceeds budget of {:.1f} ms'.format(
+            _total, args.budget), file=sys.stderr)
+        return 1
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
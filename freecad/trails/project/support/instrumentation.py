@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#*                                                                     *
+#* Copyright (c) 2018 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+
+"""
+Opt-in latency instrumentation for interactive tools.
+
+Timings are recorded in histograms by category (e.g. 'pick', 'transform',
+'resolve', 'scene', 'recompute') and event name.  Recording is disabled
+unless enabled through enable() or the Instrumentation preference.
+
+    with instrumentation.timer('pick', 'PiTracker.pick_node'):
+        ...
+
+    @instrumentation.timed('scene')
+    def update(self, points):
+        ...
+
+    instrumentation.report()
+    instrumentation.dump('/tmp/latency.json')
+"""
+
+__title__ = "instrumentation.py"
+__author__ = "Joel Graff"
+__url__ = "https://www.freecadweb.org"
+
+import bisect
+import contextlib
+import functools
+import json
+import time
+
+#upper histogram bucket limits, in milliseconds
+BUCKETS = [0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 33.0, 66.0, 100.0, 250.0, 500.0,
+           1000.0, float('inf')]
+
+_STATE = {
+    'enabled': None,
+    'histograms': {}
+}
+
+class Histogram():
+    """
+    Latency histogram for a single event
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        """
+        Add a latency value, in milliseconds
+        """
+
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+
+        if self.min is None or value < self.min:
+            self.min = value
+
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, fraction):
+        """
+        Return the upper bucket limit containing the percentile
+        """
+
+        _target = fraction * self.count
+        _sum = 0
+
+        for _i, _count in enumerate(self.counts):
+
+            _sum += _count
+
+            if _count and _sum >= _target:
+                return min(BUCKETS[_i], self.max)
+
+        return self.max
+
+    def to_dict(self):
+        """
+        Return the histogram as a JSON-compatible dictionary
+        """
+
+        _labels = ['<=' + str(_v) for _v in BUCKETS[:-1]] \
+            + ['>' + str(BUCKETS[-2])]
+
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count if self.count else None,
+            'min_ms': self.min,
+            'max_ms': self.max,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'buckets': {
+                _l: _c for _l, _c in zip(_labels, self.counts) if _c
+            }
+        }
+
+def is_enabled():
+    """
+    Return true if instrumentation is enabled, reading the preference
+    on first use
+    """
+
+    if _STATE['enabled'] is None:
+
+        try:
+            from .document_properties import Preferences
+            _STATE['enabled'] = Preferences.Instrumentation.get_value()
+
+        except Exception:
+            _STATE['enabled'] = False
+
+    return _STATE['enabled']
+
+def enable(value=True):
+    """
+    Enable or disable instrumentation for the session
+    """
+
+    _STATE['enabled'] = bool(value)
+
+def record(category, event, seconds):
+    """
+    Record an event latency
+    """
+
+    _key = (category, event)
+    _hist = _STATE['histograms'].get(_key)
+
+    if not _hist:
+        _hist = Histogram()
+        _STATE['histograms'][_key] = _hist
+
+    _hist.add(seconds * 1000.0)
+
+@contextlib.contextmanager
+def timer(category, event):
+    """
+    Context manager recording the latency of the enclosed block
+    """
+
+    if not is_enabled():
+        yield
+        return
+
+    _start = time.perf_counter()
+
+    try:
+        yield
+
+    finally:
+        record(category, event, time.perf_counter() - _start)
+
+def timed(category, event=None):
+    """
+    Decorator recording the latency of each call of a function.
+    The event defaults to the function's qualified name.
+    """
+
+    def _decorator(func):
+
+        _event = event or func.__qualname__
+
+        @functools.wraps(func)
+        def _wrapper(*args, **kwargs):
+
+            if not is_enabled():
+                return func(*args, **kwargs)
+
+            _start = time.perf_counter()
+
+            try:
+                return func(*args, **kwargs)
+
+            finally:
+                record(category, _event, time.perf_counter() - _start)
+
+        return _wrapper
+
+    return _decorator
+
+def report():
+    """
+    Return the recorded histograms as a dictionary keyed by
+    category and event
+    """
+
+    result = {}
+
+    for (_category, _event), _hist in sorted(_STATE['histograms'].items()):
+        result.setdefault(_category, {})[_event] = _hist.to_dict()
+
+    return result
+
+def format_report():
+    """
+    Return the recorded histograms as a text table
+    """
+
+    lines = ['{:<10} {:<48} {:>7} {:>9} {:>9} {:>9}'.format(
+        'category', 'event', 'count', 'mean ms', 'p95 ms', 'max ms'
+    )]
+
+    for _category, _events in report().items():
+        for _event, _v in _events.items():
+
+            lines.append('{:<10} {:<48} {:>7} {:>9.3f} {:>9.3f} {:>9.3f}'.format(
+                _category, _event, _v['count'], _v['mean_ms'], _v['p95_ms'],
+                _v['max_ms']
+            ))
+
+    return '\n'.join(lines)
+
+def dump(path):
+    """
+    Write the recorded histograms to a JSON file
+    """
+
+    with open(path, 'w') as _f:
+        json.dump(report(), _f, indent=2)
+
+def reset():
+    """
+    Discard all recorded timings
+    """
+
+    _STATE['histograms'] = {}
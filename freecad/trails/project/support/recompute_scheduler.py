@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#*                                                                     *
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+
+"""
+Debounced, coalesced recompute scheduling for scripted objects.
+
+Objects marked dirty within a short window are recomputed together, each
+once, with their dependents, in dependency order.  An object recomputed
+by the document in the meantime is no longer dirty, so it is not
+recomputed again.  Without a GUI there is no event loop to run the timer,
+so changes are only deferred inside a batch, where objects skip their
+execute until the batch ends.
+
+Scripted objects call is_deferred() and discard() from execute().
+
+    with RecomputeScheduler().batch():
+        for _obj in alignments:
+            _obj.Seg_Value = 5.0
+"""
+
+__title__ = "recompute_scheduler.py"
+__author__ = "Joel Graff"
+__url__ = "https://www.freecadweb.org"
+
+import contextlib
+
+import FreeCAD as App
+
+from .singleton import Singleton
+
+class RecomputeScheduler(metaclass=Singleton):
+    """
+    Coalesces recompute requests across objects and documents
+    """
+
+    #milliseconds to wait for further changes before recomputing
+    DELAY = 100
+
+    def __init__(self):
+        """
+        Constructor
+        """
+
+        #document name -> set of dirty object names
+        self.dirty = {}
+        self.batch_depth = 0
+        self.timer = None
+
+    def mark_dirty(self, obj):
+        """
+        Schedule an object for recompute
+        """
+
+        #headless changes outside a batch wait for the document recompute
+        if not (self.batch_depth or App.GuiUp):
+            return
+
+        self.dirty.setdefault(obj.Document.Name, set()).add(obj.Name)
+
+        if self.batch_depth:
+            return
+
+        if not self.timer:
+
+            from PySide import QtCore
+
+            self.timer = QtCore.QTimer()
+            self.timer.setSingleShot(True)
+            self.timer.timeout.connect(self.flush)
+
+        #restart the window on each change
+        self.timer.start(self.DELAY)
+
+    def is_dirty(self, obj):
+        """
+        Return true if the object is awaiting recompute
+        """
+
+        return obj.Name in self.dirty.get(obj.Document.Name, ())
+
+    def is_deferred(self, obj):
+        """
+        Return true if the object's execute should wait for the end of
+        the current batch
+        """
+
+        return bool(self.batch_depth) and self.is_dirty(obj)
+
+    def discard(self, obj):
+        """
+        Drop the object from the dirty set, as it is being recomputed
+        """
+
+        _names = self.dirty.get(obj.Document.Name)
+
+        if not _names:
+            return
+
+        _names.discard(obj.Name)
+
+        if not _names:
+            del self.dirty[obj.Document.Name]
+
+    @staticmethod
+    def get_order(doc, names):
+        """
+        Return the named objects and their dependents, ordered so each
+        object follows the objects it depends on
+        """
+
+        _targets = set()
+
+        for _name in names:
+
+            _obj = doc.getObject(_name)
+
+            if not _obj:
+                continue
+
+            _targets.add(_obj.Name)
+            _targets.update(_o.Name for _o in _obj.InListRecursive)
+
+        result = []
+        _visited = set()
+
+        #depth-first over dependencies, appending each object after them
+        def _visit(_obj):
+
+            if _obj.Name in _visited:
+                return
+
+            _visited.add(_obj.Name)
+
+            for _dep in _obj.OutList:
+
+                if _dep.Name in _targets:
+                    _visit(_dep)
+
+            result.append(_obj)
+
+        for _name in sorted(_targets):
+            _visit(doc.getObject(_name))
+
+        return result
+
+    def flush(self):
+        """
+        Recompute all dirty objects now
+        """
+
+        if self.timer:
+            self.timer.stop()
+
+        _dirty = self.dirty
+        self.dirty = {}
+
+        for _doc_name, _names in _dirty.items():
+
+            _doc = App.listDocuments().get(_doc_name)
+
+            if not _doc:
+                continue
+
+            for _obj in self.get_order(_doc, _names):
+                _obj.recompute()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Context manager deferring recomputes until the outermost batch ends
+        """
+
+        self.batch_depth += 1
+
+        try:
+            yield self
+
+        finally:
+            self.batch_depth -= 1
+
+            if not self.batch_depth:
+                self.flush()
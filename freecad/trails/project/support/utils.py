@@ -33,8 +33,6 @@ import math
 import uuid
 
 import FreeCAD as App
-import DraftGui
-from Draft import _Wire, _ViewProviderWire
 
 from .const import Const
 
@@ -62,6 +60,9 @@ def translate(text, context = 'trails'):
     Translate convenience fn for the DraftGui.translate() convenience fn
     """
 
+    #deferred so headless imports do not load the Draft GUI
+    import DraftGui
+
     DraftGui.translate(context, text)
 
 def make_wire(points, wire_name=None, closed=False, support=None, depth=0.0):
@@ -69,6 +70,8 @@ def make_wire(points, wire_name=None, closed=False, support=None, depth=0.0):
     Reduced version of Draft.makeWire()
     """
 
+    from Draft import _Wire, _ViewProviderWire
+
     if not wire_name:
         wire_name = 'Wire'
 
@@ -24,12 +24,11 @@
 Subtask to populate the XML dialog when an XML file is chosen for import
 """
 
-import csv
-
 import PySide.QtGui as QtGui
 import PySide.QtCore as QtCore
 
-from freecad.trails.project import CsvParser
+from freecad.trails.project import CsvParser, csv_reader
+from freecad.trails.project.tasks.alignment import csv_preview_model
 from freecad.trails.project.tasks.alignment.import_alignment_model \
     import ImportAlignmentModel as Model
 
@@ -47,6 +46,7 @@ class ImportCsvSubtask:
         self.errors = []
         self.panel = panel
         self.filepath = filepath
+        self.preview = None
 
         self._setup_panel()
 
@@ -65,19 +65,15 @@ class ImportCsvSubtask:
 
     def _populate_panel(self):
 
-        sniffer = csv.Sniffer()
-
-        with open(self.filepath, encoding="utf-8-sig") as stream:
+        #sniff from the start of the file only
+        self.dialect, has_header, self.sample = \
+            csv_preview_model.sniff(self.filepath)
 
-            first_bytes = stream.read(1024)
-            stream.seek(0)
-
-            self.dialect = sniffer.sniff(first_bytes)
-            self.panel.delimiter.setText(self.dialect.delimiter)
+        self.panel.delimiter.setText(self.dialect.delimiter)
 
         check_state = QtCore.Qt.Checked
 
-        if not sniffer.has_header(first_bytes):
+        if not has_header:
             check_state = QtCore.Qt.Unchecked
 
         self.panel.headers.setCheckState(check_state)
@@ -86,36 +82,36 @@ class ImportCsvSubtask:
 
     def _open_file(self):
         """
-        Open the file for previewing
+        Open the file for previewing.  Rows are read as the table
+        scrolls, the full import runs only on accept.
         """
 
         if self.dialect.delimiter != self.panel.delimiter.text():
             self.dialect.delimiter = self.panel.delimiter.text()
 
-        with open(self.filepath, encoding="utf-8-sig") as stream:
-
-            csv_reader = csv.reader(stream, self.dialect)
+        if self.preview:
+            self.preview.close()
 
-            #populate table view...
-            data = [row for row in csv_reader]
+        self.preview = csv_preview_model.CsvPreviewModel(
+            self.filepath, self.dialect, self.panel.headers.isChecked(),
+            self.sample
+        )
 
-        headers = data[0]
+        self.panel.table_view.setModel(self.preview)
+        self.panel.table_view.setToolTip(
+            'About {} rows'.format(self.preview.estimated_rows)
+        )
 
-        if self.panel.headers.isChecked():
-            data = data[1:]
-        else:
-            headers = ['Column ' + str(_i) for _i in range(0, len(data[0]))]
-
-        table_model = Model('csv', headers[:], data)
-        self.panel.table_view.setModel(table_model)
-
-        self._populate_views(headers)
+        self._populate_views(self.preview.headers[:])
 
     def _populate_views(self, header):
         """
         Populate the table views with the data acquired from open_file
         """
-        model = alignment.Alignment.meta_fields + HorizontalAlignment.data_fields + HorizontalAlignment.station_fields
+        model = list(dict.fromkeys(
+            csv_reader.META_FIELDS + csv_reader.DATA_FIELDS
+            + csv_reader.STATION_FIELDS
+        ))
 
         lower_header = [_x.lower() for _x in header]
         lower_model = [_x.lower() for _x in model]
@@ -203,7 +199,14 @@ class ImportCsvSubtask:
         if result:
             return None
 
+        if self.preview:
+            self.preview.close()
+
         parser = CsvParser.create()
 
-        parser.import_file(self.filepath, headers, self.dialect)
+        parser.import_file(
+            self.filepath, headers, self.dialect,
+            self.panel.headers.isChecked()
+        )
+
         return parser.data
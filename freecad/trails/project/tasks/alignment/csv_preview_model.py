@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+#***********************************************************************
+#*                                                                     *
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+
+"""
+Bounded preview of CSV files for the alignment import task.
+
+Only the first few kilobytes are read to sniff the dialect and estimate
+the row count.  Rows are read in batches as the view scrolls, so large
+files open immediately.
+"""
+
+import csv
+import itertools
+import os
+
+import PySide.QtCore as QtCore
+
+#shared with the headless batch import
+from ...csv_reader import sniff
+
+def estimate_rows(filepath, sample):
+    """
+    Estimate the number of rows in the file from the average row size
+    of the sample
+    """
+
+    _count = len(sample.splitlines())
+
+    if not _count:
+        return 0
+
+    _size = len(sample.encode('utf-8')) / _count
+
+    return int(round(os.path.getsize(filepath) / _size))
+
+class CsvPreviewModel(QtCore.QAbstractTableModel):
+    """
+    Read-only table model which reads rows from the file on demand
+    """
+
+    def __init__(self, filepath, dialect, has_header, sample=None,
+                 batch_size=100, parent=None):
+
+        QtCore.QAbstractTableModel.__init__(self, parent)
+
+        self.data_model = []
+        self.batch_size = batch_size
+
+        self.stream = open(filepath, encoding='utf-8-sig', newline='')
+        self.reader = csv.reader(self.stream, dialect)
+
+        if sample is None:
+            sample = sniff(filepath)[2]
+
+        self.estimated_rows = estimate_rows(filepath, sample)
+
+        _first = next(self.reader, [])
+
+        self.headers = [
+            'Column ' + str(_i) for _i in range(0, len(_first))
+        ]
+
+        if has_header:
+            self.headers = _first
+            self.estimated_rows = max(0, self.estimated_rows - 1)
+
+        else:
+            self.data_model.append(_first)
+
+        self.data_model.extend(self._read_rows())
+
+    def _read_rows(self):
+        """
+        Return the next batch of rows, closing the file at the end
+        """
+
+        if not self.stream:
+            return []
+
+        rows = list(itertools.islice(self.reader, self.batch_size))
+
+        if len(rows) < self.batch_size:
+            self.close()
+
+        return rows
+
+    def close(self):
+        """
+        Close the file
+        """
+
+        if self.stream:
+            self.stream.close()
+
+        self.stream = None
+        self.reader = None
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        """
+        True while there are unread rows
+        """
+
+        return self.stream is not None
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        """
+        Read and append the next batch of rows
+        """
+
+        _count = len(self.data_model)
+        rows = self._read_rows()
+
+        if not rows:
+            return
+
+        self.beginInsertRows(QtCore.QModelIndex(), _count,
+                             _count + len(rows) - 1)
+
+        self.data_model.extend(rows)
+
+        self.endInsertRows()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """
+        Number of rows read so far
+        """
+
+        return len(self.data_model)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """
+        Number of columns, as defined by the first row
+        """
+
+        return len(self.headers)
+
+    def data(self, index, role):
+        """
+        Return data for valid indices and display role
+        """
+
+        if not index.isValid():
+            return None
+
+        if role != QtCore.Qt.DisplayRole:
+            return None
+
+        _row = self.data_model[index.row()]
+
+        if index.column() >= len(_row):
+            return None
+
+        return _row[index.column()]
+
+    def headerData(self, col, orientation, role):
+        """
+        Headers to be displayed
+        """
+
+        if orientation == QtCore.Qt.Horizontal \
+            and role == QtCore.Qt.DisplayRole \
+            and col < len(self.headers):
+
+            return self.headers[col]
+
+        return None
+
+    def flags(self, index):
+        """
+        Preview rows are read-only
+        """
+
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
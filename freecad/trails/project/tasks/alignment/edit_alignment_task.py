@@ -24,18 +24,23 @@
 """
 Task to edit an alignment
 """
+from copy import deepcopy
+
+from FreeCAD import Vector
 import FreeCADGui as Gui
 
 import Draft
 import DraftTools
 
 from ....alignment import alignment_model
+from ....geometry import arc
 
-from ...support import const
+from ...support import const, instrumentation
 from ...support.mouse_state import MouseState
 
 from ...trackers.pi_tracker import PiTracker
 from ...trackers.drag_tracker import DragTracker
+from ...trackers.wire_tracker import WireTracker
 
 from .draft_alignment_task import DraftAlignmentTask
 
@@ -61,6 +66,9 @@ class EditAlignmentTask:
         PI = [(0.0, 0.0, 1.0), 'Solid']
         SELECTED = [(1.0, 0.8, 0.0), 'Solid']
 
+    #number of segments used to draw curves while dragging
+    CURVE_SEGMENTS = 32
+
     def __init__(self, doc, view, alignment_data, obj):
 
         self.panel = None
@@ -69,8 +77,13 @@ class EditAlignmentTask:
         self.obj = obj
         self.alignment = alignment_model.AlignmentModel()
         self.alignment.data = alignment_data
+
+        #the PI trackers stay relative to the datum the task started with
+        self.datum = Vector(self.alignment.get_datum())
         self.pi_tracker = None
         self.drag_tracker = None
+        self.curve_trackers = {}
+        self.drag_curves = None
         self.callbacks = {}
         self.mouse = MouseState()
 
@@ -146,6 +159,7 @@ class EditAlignmentTask:
         pos = self.view.getCursorPos()
         self.mouse.update(arg, pos)
 
+    @instrumentation.timed('event')
     def mouse_action(self, arg):
         """
         Mouse movement actions
@@ -172,10 +186,27 @@ class EditAlignmentTask:
         End drag operations with drag tracker
         """
 
-        _coords = self.drag_tracker.get_transformed_coordinates('PI_TRACKER')
+        _coords = self.drag_tracker.get_transformed_coordinates(
+            'PI_TRACKER', self.pi_tracker.drag_points
+        )
 
         self.pi_tracker.update(_coords)
 
+        _pts = self.drag_curves['points'].copy()
+
+        _pts[[
+            int(_k.split('-')[1]) for _k in self.pi_tracker.gui_action['selected']
+        ]] = _coords
+
+        #the recomputed alignment replaces the curve previews
+        for _tr in self.curve_trackers.values():
+            _tr.remove_node(_tr.node, self.pi_tracker.node)
+
+        self.curve_trackers.clear()
+        self.drag_curves = None
+
+        self.rebuild_alignment(_pts)
+
         self.drag_tracker.finalize()
         self.pi_tracker.drag_mode = False
         self.drag_tracker = None
@@ -204,10 +235,144 @@ class EditAlignmentTask:
         )
 
         self.drag_tracker.callbacks.append(self.pi_tracker.drag_callback)
+
+        self.start_curve_preview()
+        self.drag_tracker.callbacks.append(self.curve_preview_callback)
         #self.drag_tracker.callbacks.append
         #    self.alignment_tracker.drag_callback
         #)
 
+    def get_curve(self, index):
+        """
+        Return the curve at the PI node index, or None
+        """
+
+        _curves = [
+            _v for _v in self.alignment.data['geometry'] if _v.get('PI')
+        ]
+
+        if 0 < index <= len(_curves):
+            return _curves[index - 1]
+
+        return None
+
+    def start_curve_preview(self):
+        """
+        Prepare the trackers for the curves adjacent to the dragged PIs
+        """
+
+        _nodes = list(self.pi_tracker.trackers['NODE'].values())
+
+        _selected = sorted(
+            int(_k.split('-')[1]) for _k in self.pi_tracker.gui_action['selected']
+        )
+
+        #curves at the end nodes have no adjacent tangents to solve against
+        _curves = sorted({
+            _j for _i in _selected for _j in (_i - 1, _i, _i + 1)
+            if 0 < _j < len(_nodes) - 1 and self.get_curve(_j)
+        })
+
+        self.drag_curves = {
+            'points': self.pi_tracker.get_coordinates(_nodes),
+            'selected': _selected,
+            'curves': _curves,
+            'solved': {}
+        }
+
+        for _i in _curves:
+
+            if _i in self.curve_trackers:
+                continue
+
+            _tr = WireTracker(
+                names=[self.doc.Name, self.obj.Name, 'CURVE-' + str(_i)],
+                points=[], style=WireTracker.STYLE.EDIT
+            )
+
+            _tr.set_style(WireTracker.STYLE.EDIT)
+            _tr.color.rgb = self.STYLES.HIGHLIGHT[0]
+
+            _tr.insert_node(_tr.node, self.pi_tracker.node)
+
+            self.curve_trackers[_i] = _tr
+
+    @instrumentation.timed('resolve')
+    def curve_preview_callback(self, xform, pos):
+        """
+        Drag tracker callback which re-solves and redraws only the curves
+        adjacent to the dragged PIs
+        """
+
+        _pts = self.drag_curves['points'].copy()
+        _pts[self.drag_curves['selected']] += xform
+
+        self.solve_curves(_pts)
+
+    def solve_curves(self, points):
+        """
+        Re-solve and redraw the curves adjacent to the dragged PIs from
+        the (n, 3) array of PI coordinates
+        """
+
+        for _i in self.drag_curves['curves']:
+
+            _curve = arc.get_pi_curve(
+                Vector(*points[_i - 1]), Vector(*points[_i]),
+                Vector(*points[_i + 1]), self.get_curve(_i)['Radius']
+            )
+
+            #discard earlier solutions which no longer apply
+            if not _curve:
+                self.drag_curves['solved'].pop(_i, None)
+                continue
+
+            _points = arc.get_points(
+                _curve, self.CURVE_SEGMENTS, layer=points[_i][2]
+            )[0]
+
+            self.curve_trackers[_i].update_points(_points)
+            self.drag_curves['solved'][_i] = _curve
+
+    def rebuild_alignment(self, points):
+        """
+        Rebuild the alignment from the (n, 3) array of PI coordinates,
+        re-solving every curve and re-deriving the stationing and length,
+        and recompute the alignment object
+        """
+
+        #coordinates are planar - the tracker z is a rendering layer
+        _pis = [self.datum.add(Vector(_p[0], _p[1], 0.0)) for _p in points]
+
+        _radii = [0.0] * len(_pis)
+
+        for _i in range(1, len(_pis) - 1):
+
+            _curve = self.get_curve(_i)
+
+            if _curve:
+                _radii[_i] = _curve['Radius']
+
+        _model = alignment_model.AlignmentModel(alignment_model.get_pi_data(
+            self.alignment.data['meta'], _pis, _radii,
+            self.alignment.data.get('station')
+        ))
+
+        if _model.errors:
+
+            print('Errors encountered during alignment edit:\n')
+
+            for _e in _model.errors:
+                print(_e)
+
+        #keep a separate copy of the data for further editing
+        self.alignment = alignment_model.AlignmentModel()
+        self.alignment.data = deepcopy(_model.data)
+
+        self.obj.Proxy.set_geometry(_model)
+        self.obj.touch()
+        self.doc.recompute()
+
     def set_vobj_style(self, vobj, style):
         """
         Set the view object style based on the passed style tuple
@@ -253,6 +418,9 @@ class EditAlignmentTask:
 
             self.callbacks.clear()
 
+        #curve trackers are removed with the pi tracker node
+        self.curve_trackers.clear()
+
         #shut down the tracker and re-select the object
         if self.pi_tracker:
             self.pi_tracker.finalize()
@@ -35,7 +35,7 @@ import FreeCADGui as Gui
 from . import import_xml_subtask #, ImportCsvSubtask
 
 from .... import resources
-from ....alignment import alignment_group, alignment
+from ....alignment import alignment_group, alignment, model_pipeline
 
 
 class ImportAlignmentTask:
@@ -69,17 +69,23 @@ class ImportAlignmentTask:
 
         alignment_group.create()
 
-        for key, value in data['Alignments'].items():
+        _values = list(data['Alignments'].values())
 
-            result = alignment.create(
-                value, value['meta']['ID'] + ' Horiz'
+        #construct and validate the models (serially, as the GUI is up),
+        #then create the objects in one batch with a single recompute
+        models = model_pipeline.construct_models(_values)
+
+        for value, model in zip(_values, models):
+
+            alignment.create(
+                model, value['meta']['ID'] + ' Horiz', recompute=False
             )
 
-            if result.errors:
-                errors += result.errors
-                result.errors = []
+            if model.errors:
+                errors += model.errors
+                model.errors = []
 
-            App.ActiveDocument.recompute()
+        App.ActiveDocument.recompute()
 
         if errors:
             print('Errors encountered during alignment creation:\n')
@@ -26,90 +26,134 @@ Tracker for alignment drafting
 
 from pivy import coin
 
-import FreeCAD as App
-import Part
 from DraftTrackers import Tracker
 
+from ..support import instrumentation
+
 class AlignmentTracker(Tracker):
     """
-    Tracker class for alignment design
+    Tracker class for alignment design.
+
+    Committed points are kept in a coordinate block which is only
+    appended to as points are picked, while the rubber-band segment from
+    the last committed point to the cursor is drawn separately, so each
+    mouse move updates two coordinates regardless of the point count.
     """
 
     def __init__(self, dotted=False, scolor=None, swidth=None, points=None):
         """
         Constructor
         """
-        self.wire = None
-        self.points = points
+
+        self.points = []
         self.trans = coin.SoTransform()
         self.sep = coin.SoSeparator()
-        self.recompute()
+
+        self.committed = {
+            'coord': coin.SoCoordinate3(),
+            'line': coin.SoLineSet()
+        }
+
+        self.tail = {
+            'coord': coin.SoCoordinate3(),
+            'line': coin.SoLineSet()
+        }
+
+        for _block in [self.committed, self.tail]:
+
+            _node = coin.SoSeparator()
+            _node.addChild(_block['coord'])
+            _node.addChild(_block['line'])
+
+            self.sep.addChild(_node)
+
+        self.tail['line'].numVertices.setValue(0)
+
+        if points:
+            self.update(points)
+
+        else:
+            self.recompute()
 
         Tracker.__init__(self, dotted, scolor, swidth,
                          [self.trans, self.sep], name="AlignmentTracker")
 
-    def update(self, points):
+    @instrumentation.timed('scene')
+    def append(self, point):
         """
-        Update the tracker points and recompute
+        Commit a picked point to the end of the wire
         """
-        self.points = points
-        self.recompute()
 
-    def recompute(self):
+        _count = len(self.points)
+
+        self.points.append(point)
+
+        self.committed['coord'].point.set1Value(_count, tuple(point))
+        self.committed['line'].numVertices.setValue(_count + 1)
+
+        #restart the tail at the new point
+        self.update_tail(point)
+
+    def pop(self):
         """
-        Recompute geometry based on current points
+        Remove the last committed point, returning it
         """
+
         if not self.points:
-            return
+            return None
 
-        if len(self.points) <= 1:
-            return
+        _point = self.points.pop()
+        _count = len(self.points)
 
-        if self.wire:
-            self.sep.removeChild(self.wire)
+        self.committed['coord'].point.deleteValues(_count)
+        self.committed['line'].numVertices.setValue(_count)
 
-        wire = Part.makePolygon(self.points)
+        if self.points:
+            self.update_tail(self.points[-1])
 
-        buf = wire.writeInventor(2, 0.01)
+        else:
+            self.tail['line'].numVertices.setValue(0)
 
-        try:
-            ivin = coin.SoInput()
-            ivin.setBuffer(buf)
-            ivob = coin.SoDB.readAll(ivin)
+        return _point
 
-        except:
+    @instrumentation.timed('scene')
+    def update_tail(self, point):
+        """
+        Update the segment from the last committed point to the cursor
+        """
+
+        if not self.points:
+            return
 
-            import re
+        self.tail['coord'].point.setValues(
+            0, 2, [tuple(self.points[-1]), tuple(point)]
+        )
 
-            buf = buf.replace('\n', '')
-            pts = re.findall(r'point \[(.*?)\]', buf)[0]
-            pts = pts.split(',')
-            _pc = []
+        self.tail['line'].numVertices.setValue(2)
 
-            for _p in pts:
-                _v = _p.strip().split()
-                _pc.append([float(_v[0]), float(_v[1]), float(_v[2])])
+    def update(self, points):
+        """
+        Replace the committed points, using the last point as the tail
+        """
 
-            coords = coin.SoCoordinate3()
-            coords.point.setValues(0, len(_pc, _pc))
+        self.points = list(points[:-1])
+        self.recompute()
 
-            line = coin.SoLineSet()
-            line.numVertices.setValue(-1)
+        if points:
+            self.update_tail(points[-1])
 
-            self.wire = coin.SoSeparator()
-            self.wire.addChild(coords)
+    def recompute(self):
+        """
+        Rebuild the committed coordinate block from the current points
+        """
 
-            self.sep.addChild(self.wire)
+        _count = len(self.points)
 
-        else:
-            if ivob and ivob.getNumChildren() > 1:
+        self.committed['coord'].point.setValues(
+            0, _count, [tuple(_p) for _p in self.points]
+        )
 
-                self.wire = ivob.getChild(1).getChild(0)
-                self.wire.removeChild(self.wire.getChild(0))
-                self.wire.removeChild(self.wire.getChild(0))
-                self.sep.addChild(self.wire)
+        self.committed['coord'].point.setNum(_count)
+        self.committed['line'].numVertices.setValue(_count)
 
-            else:
-                App.Console.PrintWarning("""
-                    AlignmentTracker.recompute() failed to read Inventor string\n
-                """)
+        self.tail['line'].numVertices.setValue(0)
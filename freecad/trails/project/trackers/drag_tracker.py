@@ -24,11 +24,14 @@
 Tracker for dragging operations
 """
 
+import numpy
+
 from pivy import coin
 
 from FreeCAD import Vector
 
 from .base_tracker import BaseTracker
+from ..support import instrumentation
 
 class DragTracker(BaseTracker):
     """
@@ -116,10 +119,14 @@ class DragTracker(BaseTracker):
         self.datums['drag_start'] = world_pos
         self.update(world_pos)
 
-    def get_transformed_coordinates(self, group_name):
+    @instrumentation.timed('transform')
+    def get_transformed_coordinates(self, group_name, points=None):
         """
         Return the transformed coordinates of the selected nodes based on the
         transformations applied by the drag tracker
+
+        points - (n, 3) array of the untransformed group coordinates.
+                 If None, they are read from the group's coordinate node.
         """
 
         #retrive the group to transform by name
@@ -143,17 +150,20 @@ class DragTracker(BaseTracker):
         _matrix = coin.SoGetMatrixAction(self.viewport)
         _matrix.apply(self.start_path)
 
-        _xf = _matrix.getMatrix()
+        _xf = numpy.array(_matrix.getMatrix().getValue())
+
+        if points is None:
+            points = [_v.getValue() for _v in _coords.point.getValues()]
+
+        points = numpy.asarray(points, dtype=float).reshape(-1, 3)
 
-        #create the 4D vectors for the transformation
-        _vecs = [
-            coin.SbVec4f(_v.getValue() + (1.0,)) \
-                for _v in _coords.point.getValues()
-            ]
+        #create the homogeneous coordinates for the transformation
+        _vecs = numpy.ones((len(points), 4))
+        _vecs[:, 0:3] = points
 
-        #multiply each coordinate by the transformation matrix and return
-        #a list of the transformed coordinates, omitting the fourth value
-        return [_xf.multVecMatrix(_v).getValue()[:3] for _v in _vecs]
+        #coin matrices multiply row vectors, so transform all coordinates
+        #at once and return the array, omitting the fourth value
+        return (_vecs @ _xf)[:, 0:3]
 
     def drag_rotation(self, vector, modify):
         """
@@ -219,6 +229,7 @@ class DragTracker(BaseTracker):
         #return the +z axis rotation for the transformation
         return coin.SbRotation(coin.SbVec3f(0.0, 0.0, 1.0), _rot)
 
+    @instrumentation.timed('transform')
     def update(self, world_pos, rotation=False, modify=True):
         """
         Update the transform with the passed position
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+#**************************************************************************
+#*                                                                     *
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Batched tracker drawing many PI nodes with a single Coin node set
+"""
+
+import numpy
+
+from pivy import coin
+
+from FreeCAD import Vector
+import FreeCADGui as Gui
+
+from .base_tracker import BaseTracker
+from .node_tracker import NodeTracker
+
+class NodeProxy():
+    """
+    Lightweight stand-in for a NodeTracker, addressing one vertex of
+    a NodeSetTracker
+    """
+
+    def __init__(self, node_set, index):
+        """
+        Constructor
+        """
+
+        self.type = 'NODE'
+        self.node_set = node_set
+        self.index = index
+        self.name = 'NODE-' + str(index)
+
+    def on(self):
+        """
+        Nodes in a set are always visible
+        """
+
+        return
+
+    def off(self):
+        """
+        Nodes in a set are always visible
+        """
+
+        return
+
+    def default(self):
+        """
+        Set node to default style
+        """
+
+        self.node_set.set_selected([self.index], False)
+
+    def selected(self):
+        """
+        Set node to select style
+        """
+
+        self.node_set.set_selected([self.index], True)
+
+    def rollover(self, state=True):
+        """
+        Show or hide the rollover highlight
+        """
+
+        if state:
+            self.node_set.set_rollover(self.index)
+
+        elif self.node_set.rollover == self.index:
+            self.node_set.set_rollover(None)
+
+    def update(self, coord):
+        """
+        Update the coordinate position
+        """
+
+        self.node_set.update_points([self.index], [tuple(coord)])
+
+    def get(self):
+        """
+        Get method
+        """
+
+        return Vector(tuple(self.node_set.points[self.index]))
+
+    def finalize(self):
+        """
+        Cleanup
+        """
+
+        pass
+
+class NodeSetTracker(BaseTracker):
+    """
+    Tracker drawing all nodes with one coordinate, marker and material
+    node, coloring the selection state per vertex
+    """
+
+    STYLE = NodeTracker.STYLE
+
+    def __init__(self, names, points):
+        """
+        Constructor
+        """
+
+        self.type = 'NODE'
+        self.name = names[2]
+
+        self.points = numpy.array(
+            [tuple(_p) for _p in points], dtype=float
+        ).reshape(-1, 3)
+
+        self.is_selected = numpy.zeros(len(self.points), dtype=bool)
+        self.rollover = None
+
+        self.coord = coin.SoCoordinate3()
+        self.material = coin.SoMaterial()
+
+        binding = coin.SoMaterialBinding()
+        binding.value = coin.SoMaterialBinding.PER_VERTEX
+
+        marker = coin.SoMarkerSet()
+        marker.markerIndex = Gui.getMarkerIndex(
+            self.STYLE.DEFAULT['shape'], self.STYLE.DEFAULT['size']
+        )
+
+        #isolate the per-vertex binding from the rest of the scene
+        group = coin.SoSeparator()
+
+        for _node in [self.coord, self.material, binding, marker]:
+            group.addChild(_node)
+
+        super().__init__(names=names, children=[
+            group, self.create_rollover()
+        ], select=True)
+
+        #highlighting is per vertex, not for the whole set
+        self.node.highlightMode.setValue(2)
+
+        self.nodes = [NodeProxy(self, _i) for _i in range(len(self.points))]
+
+        self.refresh_points()
+        self.refresh_colors()
+
+    def create_rollover(self):
+        """
+        Create the rollover markers, drawn at the rollover node only
+        """
+
+        self.roll_coord = coin.SoCoordinate3()
+        self.roll_switch = coin.SoSwitch()
+
+        group = coin.SoSeparator()
+        group.addChild(self.roll_coord)
+
+        for style in [self.STYLE.ROLL_INNER, self.STYLE.ROLL_OUTER]:
+
+            color = coin.SoBaseColor()
+            color.rgb = style['color']
+
+            marker = coin.SoMarkerSet()
+            marker.markerIndex = \
+                Gui.getMarkerIndex(style['shape'], style['size'])
+
+            group.addChild(color)
+            group.addChild(marker)
+
+        self.roll_switch.addChild(group)
+        self.roll_switch.whichChild = -1
+
+        return self.roll_switch
+
+    def refresh_points(self):
+        """
+        Push all coordinates to the scene graph
+        """
+
+        self.coord.point.setValues(0, len(self.points), self.points.tolist())
+        self.coord.point.setNum(len(self.points))
+
+        if self.rollover is not None:
+            self.roll_coord.point.setValue(
+                tuple(self.points[self.rollover])
+            )
+
+    def refresh_colors(self):
+        """
+        Push all vertex colors to the scene graph
+        """
+
+        colors = numpy.where(
+            self.is_selected[:, None],
+            numpy.array(self.STYLE.SELECTED['color']),
+            numpy.array(self.STYLE.DEFAULT['color'])
+        )
+
+        self.material.diffuseColor.setValues(0, len(colors), colors.tolist())
+        self.material.diffuseColor.setNum(len(colors))
+
+    def update_points(self, indices, points):
+        """
+        Update the coordinates of the indexed nodes
+        """
+
+        self.points[indices] = numpy.asarray(points, dtype=float).reshape(-1, 3)
+        self.refresh_points()
+
+    def set_selected(self, indices, state):
+        """
+        Set the selection state of the indexed nodes
+        """
+
+        self.is_selected[indices] = state
+        self.refresh_colors()
+
+    def set_rollover(self, index):
+        """
+        Highlight the node at the index, or none if the index is None
+        """
+
+        self.rollover = index
+
+        if index is None:
+            self.roll_switch.whichChild = -1
+            return
+
+        self.roll_coord.point.setValue(tuple(self.points[index]))
+        self.roll_switch.whichChild = 0
+
+    def reset(self):
+        """
+        Clear the selection and rollover states of all nodes
+        """
+
+        self.set_rollover(None)
+        self.set_selected(slice(None), False)
+
+    def find_nearest(self, point):
+        """
+        Return the name of the node nearest the point
+        """
+
+        if not len(self.points):
+            return None
+
+        _dist = numpy.linalg.norm(self.points - numpy.array(tuple(point)), axis=1)
+
+        return self.nodes[int(numpy.argmin(_dist))].name
+
+    def finalize(self):
+        """
+        Cleanup
+        """
+
+        pass
@@ -192,6 +192,13 @@ class NodeTracker(BaseTracker):
         if self.switch.whichChild:
             self.switch.whichChild = 0
 
+    def rollover(self, state=True):
+        """
+        Show or hide the rollover highlight
+        """
+
+        self.switch.whichChild = int(state)
+
     def update(self, coord):
         """
         Update the coordinate position
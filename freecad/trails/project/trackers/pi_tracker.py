@@ -24,6 +24,10 @@
 Customized wire tracker for PI alignments
 """
 
+import time
+
+import numpy
+
 from pivy import coin
 
 from FreeCAD import Vector
@@ -32,10 +36,13 @@ import DraftTools
 
 from .base_tracker import BaseTracker
 from .node_tracker import NodeTracker
+from .node_set_tracker import NodeSetTracker
 from .wire_tracker import WireTracker
+from .screen_index import ScreenIndex
 
 from ..support.utils import Constants as C
 from ..support.mouse_state import MouseState
+from ..support import instrumentation
 
 class PiTracker(BaseTracker):
     """
@@ -43,11 +50,24 @@ class PiTracker(BaseTracker):
     picking and editing
     """
 
-    def __init__(self, doc, view, object_name, node_name, points):
+    #minimum time between rollover picks, in seconds
+    PICK_INTERVAL = 1.0 / 60.0
+
+    #node count above which nodes are drawn as a single node set
+    BATCH_THRESHOLD = 250
+
+    def __init__(self, doc, view, object_name, node_name, points,
+                 batched=None):
         """
         Constructor
+
+        batched - draw nodes as one node set.  If None, nodes are batched
+                  when their count exceeds BATCH_THRESHOLD
         """
 
+        if batched is None:
+            batched = len(points) > self.BATCH_THRESHOLD
+
         #dict which tracks actions on nodes in the gui
         self.gui_action = {
             'rollover': None,
@@ -66,6 +86,13 @@ class PiTracker(BaseTracker):
         self.connect_idx = -1
         self.drag_start = None
         self.drag_mode = False
+        self.drag_points = None
+        self.screen_index = ScreenIndex()
+        self.last_pick = 0.0
+        self.pending_pick = None
+        self.pick_timer = None
+        self.batched = batched
+        self.node_set = None
 
         _names = [doc.Name, object_name, node_name]
 
@@ -75,11 +102,15 @@ class PiTracker(BaseTracker):
             names=_names, select=False, group=True
         )
 
-        for _tracker in {
-                **self.trackers['NODE'],
-                **self.trackers['WIRE']
-            }.values():
+        _trackers = list(self.trackers['WIRE'].values())
 
+        if self.node_set:
+            _trackers.append(self.node_set)
+
+        else:
+            _trackers.extend(self.trackers['NODE'].values())
+
+        for _tracker in _trackers:
             self.insert_node(_tracker.node, self.node)
 
         self.color.rgb = (0.0, 0.0, 1.0)
@@ -117,43 +148,118 @@ class PiTracker(BaseTracker):
         """
 
         if self.gui_action['rollover']:
-            self.gui_action['rollover'].whichChild = 0
+            self.gui_action['rollover'].rollover(False)
             self.gui_action['rollover'] = None
 
+    @instrumentation.timed('pick')
+    def pick_node(self, pos):
+        """
+        Return the name of the node under the screen position, or None.
+        Nodes are found through the screen index, falling back to a
+        Coin pick if the index cannot be built or has no node within
+        the pick radius.
+        """
+
+        _index = self.screen_index
+
+        if _index.is_stale(self.view):
+
+            try:
+                _index.build(self.view, {
+                    _k: _v.get() for _k, _v in self.trackers['NODE'].items()
+                })
+
+            except Exception:
+                _index.invalidate()
+
+        if _index.valid:
+
+            result = _index.query(pos)
+
+            if result:
+                return result
+
+        info = self.validate_info(self.view.getObjectInfo(pos))
+
+        if not info:
+            return None
+
+        component = info['Component'].split('.')[0]
+
+        #resolve picks on the node set to the nearest node
+        if self.node_set and component == self.node_set.name:
+            return self.node_set.find_nearest(
+                Vector(info['x'], info['y'], info['z'])
+            )
+
+        return component
+
     def on_rollover(self, pos):
         """
         Manage element highlighting
         """
 
-        info = self.view.getObjectInfo(pos)
+        #limit picking to the display frame rate, deferring the last
+        #suppressed position so the highlight catches up when the
+        #cursor stops
+        _now = time.perf_counter()
+        _wait = self.PICK_INTERVAL - (_now - self.last_pick)
+
+        if _wait > 0.0:
+
+            self.pending_pick = pos
+
+            if not self.pick_timer:
+
+                from PySide import QtCore
+
+                self.pick_timer = QtCore.QTimer()
+                self.pick_timer.setSingleShot(True)
+                self.pick_timer.timeout.connect(self.run_pending_pick)
+
+            if not self.pick_timer.isActive():
+                self.pick_timer.start(int(_wait * 1000.0) + 1)
+
+            return
+
+        self.last_pick = _now
+        self.pending_pick = None
+
+        component = self.pick_node(pos)
 
         roll_node = self.gui_action['rollover']
 
         #if we rolled over nothing or an invalid object,
         #unhighlight the existing node
-        if not self.validate_info(info):
+        if not component:
 
             if roll_node:
-                roll_node.switch.whichChild = 0
+                roll_node.rollover(False)
 
             self.gui_action['rollover'] = None
 
             return
 
-        component = info['Component'].split('.')[0]
-
         _tracker = self.trackers['NODE'].get(component)
 
         if _tracker:
 
             #unhighlight existing node
             if roll_node and roll_node.name != component:
-                roll_node.switch.whichChild = 0
+                roll_node.rollover(False)
 
-            _tracker.switch.whichChild = 1
+            _tracker.rollover()
 
             self.gui_action['rollover'] = _tracker
 
+    def run_pending_pick(self):
+        """
+        Pick the last rollover position suppressed by the pick interval
+        """
+
+        if self.pending_pick is not None:
+            self.on_rollover(self.pending_pick)
+
     def get_drag_selection(self):
         """
         Return a SoGroup() object of trackers to be transformed by draf
@@ -165,12 +271,15 @@ class PiTracker(BaseTracker):
         _result = coin.SoGroup()
         _result.setName('PI_TRACKER')
 
-        _c = [list(_v.get()) for _v in self.gui_action['selected'].values()]
+        _c = self.get_coordinates(self.gui_action['selected'].values())
+
+        #keep the source coordinates to transform when the drag ends
+        self.drag_points = _c
 
         _count = len(_c)
 
         _coord = coin.SoCoordinate3()
-        _coord.point.setValues(0, _count, _c)
+        _coord.point.setValues(0, _count, _c.tolist())
 
         _result.addChild(_coord)
         _result.addChild(coin.SoMarkerSet())
@@ -216,8 +325,8 @@ class PiTracker(BaseTracker):
 
         _coord = coin.SoCoordinate3()
 
-        for _i, _v in enumerate(_conn):
-            _coord.point.set1Value(_i, list(_v.get()))
+        _c = self.get_coordinates(_conn)
+        _coord.point.setValues(0, len(_c), _c.tolist())
 
         _marker = coin.SoMarkerSet()
 
@@ -235,6 +344,21 @@ class PiTracker(BaseTracker):
 
         return _result
 
+    def get_coordinates(self, nodes):
+        """
+        Return the (n, 3) array of the coordinates of the node trackers
+        """
+
+        nodes = list(nodes)
+
+        if self.node_set:
+            return self.node_set.points[[_v.index for _v in nodes]]
+
+        return numpy.array(
+            [tuple(_v.get()) for _v in nodes], dtype=float
+        ).reshape(-1, 3)
+
+    @instrumentation.timed('scene')
     def drag_callback(self, xform, pos):
         """
         Callback triggered when a drag tracker is updated to allow for geometry
@@ -247,6 +371,7 @@ class PiTracker(BaseTracker):
             self.connect_idx, self.drag_start.add(Vector(xform))
         )
 
+    @instrumentation.timed('pick')
     def on_selection(self, arg, pos):
         """
         Mouse selection in view
@@ -254,15 +379,13 @@ class PiTracker(BaseTracker):
 
         self.unhighlight()
 
-        info = self.validate_info(self.view.getObjectInfo(pos))
+        component = self.pick_node(pos)
 
         #deselect all and quit if no valid object is picked
-        if not info:
+        if not component:
             self.deselect_geometry('all')
             return
 
-        component = info['Component'].split('.')[0]
-
         #quit if this is a previously-picked object
         #if component in self.gui_action['selected']:
         #    return
@@ -282,14 +405,23 @@ class PiTracker(BaseTracker):
 
         self.gui_action['selected'] = {}
 
-        for _node in list(self.trackers['NODE'].values())[_idx:_max]:
-            _node.selected()
+        _nodes = list(self.trackers['NODE'].values())[_idx:_max]
+
+        if self.node_set:
+            self.node_set.set_selected([_n.index for _n in _nodes], True)
+
+        for _node in _nodes:
+
+            if not self.node_set:
+                _node.selected()
+
             self.gui_action['selected'][_node.name] = _node
 
         if (_max - _idx) > 1:
             for _wire in list(self.trackers['WIRE'].values())[_idx:_max -1]:
                 _wire.selected()
 
+    @instrumentation.timed('event')
     def mouse_action(self, arg):
         """
         Mouse movement actions
@@ -344,8 +476,14 @@ class PiTracker(BaseTracker):
         'all', 'node', 'wire'
         """
 
-        for _grp in self.trackers.values():
-            for _tracker in _grp.values():
+        for _tracker in self.trackers['WIRE'].values():
+            _tracker.default()
+
+        if self.node_set:
+            self.node_set.reset()
+
+        else:
+            for _tracker in self.trackers['NODE'].values():
                 _tracker.default()
 
         self.gui_action = {
@@ -353,17 +491,50 @@ class PiTracker(BaseTracker):
             'selected': {},
         }
 
+    @instrumentation.timed('scene')
     def update(self, points):
         """
         Updates existing coordinates
         """
 
-        for _i, _node in enumerate(self.gui_action['selected'].values()):
-            _node.update(points[_i])
-            _node.on()
+        _selected = list(self.gui_action['selected'].values())
 
-        for _wire in self.trackers['WIRE'].values():
-            _wire.update()
+        if self.node_set:
+
+            if not isinstance(points, numpy.ndarray):
+                points = numpy.array([tuple(_p) for _p in points], dtype=float)
+
+            self.node_set.update_points(
+                [_n.index for _n in _selected], points[:len(_selected)]
+            )
+
+        else:
+            for _i, _node in enumerate(_selected):
+                _node.update(points[_i])
+                _node.on()
+
+        self.screen_index.invalidate()
+
+        #only the wires on either side of a moved node change
+        _moved = [int(_n.name.split('-')[1]) for _n in _selected]
+        _wires = sorted({
+            _j for _i in _moved for _j in (_i - 1, _i)
+            if 0 <= _j < len(self.trackers['WIRE'])
+        })
+
+        if not _wires:
+            return
+
+        _ends = sorted({_k for _j in _wires for _k in (_j, _j + 1)})
+
+        _coords = dict(zip(_ends, self.get_coordinates(
+            [self.trackers['NODE']['NODE-' + str(_k)] for _k in _ends]
+        )))
+
+        for _j in _wires:
+            self.trackers['WIRE']['WIRE-' + str(_j)].update_points(
+                [_coords[_j], _coords[_j + 1]]
+            )
 
     def build_trackers(self, points, names):
         """
@@ -371,21 +542,35 @@ class PiTracker(BaseTracker):
         """
 
         self.finalize_trackers()
+        self.screen_index.invalidate()
 
-        for _i, _pt in enumerate(points):
+        for _pt in points:
 
             #set z value on top
             _pt.z = C.Z_DEPTH[2]
 
-            #build node trackers
-            _tr = NodeTracker(
-                names=names[:2] + ['NODE-' + str(_i)],
-                point=_pt
+        if self.batched:
+
+            self.node_set = NodeSetTracker(
+                names=names[:2] + ['NODE-SET'], points=points
             )
 
-            _tr.update(_pt)
+            for _node in self.node_set.nodes:
+                self.trackers['NODE'][_node.name] = _node
+
+        else:
+
+            for _i, _pt in enumerate(points):
 
-            self.trackers['NODE'][_tr.name] = _tr
+                #build node trackers
+                _tr = NodeTracker(
+                    names=names[:2] + ['NODE-' + str(_i)],
+                    point=_pt
+                )
+
+                _tr.update(_pt)
+
+                self.trackers['NODE'][_tr.name] = _tr
 
         _prev = None
 
@@ -418,6 +603,10 @@ class PiTracker(BaseTracker):
 
             self.trackers.clear()
 
+        if self.node_set:
+            self.node_set.finalize()
+            self.node_set = None
+
     def finalize(self, node=None):
         """
         Override of the parent method
@@ -425,6 +614,13 @@ class PiTracker(BaseTracker):
 
         self.finalize_trackers()
 
+        if self.pick_timer:
+            self.pick_timer.stop()
+            self.pick_timer = None
+
+        self.pending_pick = None
+        self.screen_index.detach()
+
         if self.callbacks:
 
             for _k, _v in self.callbacks.items():
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#**************************************************************************
+#*                                                                     *
+#* Copyright (c) 2019 Joel Graff <monograff76@gmail.com>               *
+#*                                                                     *
+#* This program is free software; you can redistribute it and/or modify*
+#* it under the terms of the GNU Lesser General Public License (LGPL)  *
+#* as published by the Free Software Foundation; either version 2 of   *
+#* the License, or (at your option) any later version.                 *
+#* for detail see the LICENCE text file.                               *
+#*                                                                     *
+#* This program is distributed in the hope that it will be useful,     *
+#* but WITHOUT ANY WARRANTY; without even the implied warranty of      *
+#* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the       *
+#* GNU Library General Public License for more details.                *
+#*                                                                     *
+#* You should have received a copy of the GNU Library General Public   *
+#* License along with this program; if not, write to the Free Software *
+#* Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307*
+#* USA                                                                 *
+#*                                                                     *
+#***********************************************************************
+"""
+Screen-space grid index for picking tracker nodes under the cursor
+"""
+
+import math
+
+from pivy import coin
+
+from FreeCAD import Vector
+
+class ScreenIndex():
+    """
+    Uniform grid of node screen positions, invalidated when the camera moves
+    """
+
+    def __init__(self, cell_size=16, radius=8):
+        """
+        Constructor
+
+        cell_size - grid cell size in pixels
+        radius - pick radius in pixels
+        """
+
+        self.cell_size = cell_size
+        self.radius = radius
+        self.cells = {}
+        self.view_state = None
+        self.sensor = None
+        self.valid = False
+
+    def invalidate(self, *args):
+        """
+        Force a rebuild on the next query, e.g. after nodes move.
+        Also the camera sensor callback.
+        """
+
+        self.valid = False
+
+    def is_stale(self, view):
+        """
+        Return true if the index must be rebuilt for the current view.
+        The camera node is replaced when the camera type changes and the
+        viewport size is not a camera field, so both are compared here.
+        """
+
+        return not self.valid or self.view_state != (
+            view.getCameraType(), tuple(view.getSize())
+        )
+
+    def watch(self, view):
+        """
+        Invalidate the index whenever the view camera changes
+        """
+
+        self.detach()
+
+        self.sensor = coin.SoNodeSensor(self.invalidate, None)
+        self.sensor.attach(view.getCameraNode())
+
+    def detach(self):
+        """
+        Stop watching the view camera
+        """
+
+        if self.sensor:
+            self.sensor.detach()
+            self.sensor = None
+
+    def build(self, view, points):
+        """
+        Project the node points to the screen and bin them by grid cell
+
+        points - dictionary of node names and 3D coordinates
+        """
+
+        self.cells = {}
+        self.view_state = (view.getCameraType(), tuple(view.getSize()))
+
+        self.watch(view)
+
+        for _name, _pt in points.items():
+
+            _x, _y = view.getPointOnScreen(Vector(_pt))[0:2]
+            _key = (int(_x // self.cell_size), int(_y // self.cell_size))
+
+            self.cells.setdefault(_key, []).append((_name, _x, _y))
+
+        self.valid = True
+
+    def query(self, pos):
+        """
+        Return the name of the node nearest the screen position within
+        the pick radius, or None
+        """
+
+        _x, _y = pos[0:2]
+        _reach = int(math.ceil(self.radius / self.cell_size))
+
+        _cx = int(_x // self.cell_size)
+        _cy = int(_y // self.cell_size)
+
+        result = None
+        _best = self.radius * self.radius
+
+        #search the cell under the cursor and its neighbours
+        for _i in range(_cx - _reach, _cx + _reach + 1):
+            for _j in range(_cy - _reach, _cy + _reach + 1):
+
+                for _name, _nx, _ny in self.cells.get((_i, _j), ()):
+
+                    _dist = (_nx - _x) ** 2 + (_ny - _y) ** 2
+
+                    if _dist <= _best:
+                        _best = _dist
+                        result = _name
+
+        return result
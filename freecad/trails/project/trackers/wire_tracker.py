@@ -24,6 +24,8 @@
 Customized wire tracker from DraftTrackers.wireTracker
 """
 
+import numpy
+
 from pivy import coin
 
 from ..support.const import Const
@@ -121,17 +123,20 @@ class WireTracker(BaseTracker):
 
     def update_points(self, points):
         """
-        Update the wire tracker coordinates based on passed list of
-        SoCoordinate3 references
+        Update the wire tracker coordinates based on passed array or
+        list of coordinates
         """
 
         _p = points
 
-        if not isinstance(points[0], tuple):
-            _p = [tuple(_v) for _v in points]
+        if not isinstance(points, numpy.ndarray):
+            _p = numpy.array([tuple(_v) for _v in points], dtype=float)
+
+        _p = _p.reshape(-1, 3)
 
-        self.coord.point.setValues(0, len(points), _p)
-        self.line.numVertices.setValue(len(points))
+        self.coord.point.setValues(0, len(_p), _p.tolist())
+        self.coord.point.setNum(len(_p))
+        self.line.numVertices.setValue(len(_p))
 
     def update_placement(self, placement):
         """
@@ -28,7 +28,7 @@ Exporter for Alignments in LandXML files
 import datetime
 import math
 
-from xml.etree import ElementTree as etree
+import numpy
 
 import FreeCAD as App
 
@@ -109,34 +109,45 @@ class AlignmentExporter(object):
                 sta_eq, parent, Maps.XML_ATTRIBS['StaEquation']
             )
 
-    def _write_coordinates(self, data, parent):
+    def _add_coordinates(self, data, parent, coordinates):
         """
-        Write coordinate children to parent geometry
+        Add coordinate children to parent geometry, appending the child
+        nodes and their coordinates to the coordinates list for writing
         """
 
-        _sf = 1.0 / units.scale_factor()
-
         for _key in Maps.XML_TAGS['coordinate']:
 
             if data.get(_key) is None:
                 continue
 
-            #scale the coordinates to the document units
-            _vec = App.Vector(data[_key])
-            _vec.multiply(_sf)
+            coordinates.append(
+                (landxml.add_child(parent, _key), tuple(data[_key]))
+            )
+
+    @staticmethod
+    def _write_coordinates(coordinates):
+        """
+        Scale and format the coordinates of all geometry at once,
+        writing them to their nodes
+        """
 
-            _child = landxml.add_child(parent, _key)
+        if not coordinates:
+            return
 
-            _vec_string = landxml.get_vector_string(_vec)
+        _nodes, _coords = zip(*coordinates)
 
-            landxml.set_text(_child, _vec_string)
+        #scale the coordinates to the document units
+        _coords = numpy.array(_coords) / units.scale_factor()
 
-    def _write_alignment_data(self, data, parent):
+        for _node, _text in zip(_nodes, landxml.format_coordinates(_coords)):
+            landxml.set_text(_node, _text)
+
+    def _write_alignment_data(self, data):
         """
-        Write individual alignment to XML
+        Write individual alignment to XML, returning the alignment node
         """
 
-        _align_node = landxml.add_child(parent, 'Alignment')
+        _align_node = landxml.create_node('Alignment')
 
         #write the alignment attributes
         self._write_tree_data(
@@ -153,6 +164,8 @@ class AlignmentExporter(object):
         #write the station equation data
         self.write_station_data(data['station'], _align_node)
 
+        _coordinates = []
+
         #write the alignment geometry data
         for _geo in data['geometry']:
 
@@ -169,18 +182,25 @@ class AlignmentExporter(object):
                 self._write_tree_data(_geo, _node, Maps.XML_ATTRIBS['Curve'])
 
             if _node is not None:
-                self._write_coordinates(_geo, _node)
+                self._add_coordinates(_geo, _node, _coordinates)
+
+        self._write_coordinates(_coordinates)
+
+        return _align_node
 
-    def write(self, data, source_path, target_path):
+    def write(self, data, source_path, target_path, pretty_print=False):
         """
-        Write the alignment data to a land xml file in the target location
+        Write the alignment data to a land xml file in the target location.
+        Alignments are written to the file as they are built, so only one
+        is held in memory at a time.
         """
 
-        root = etree.parse(source_path).getroot()
+        with landxml.StreamWriter(
+            target_path, source_path, pretty_print) as _writer:
 
-        _parent = landxml.add_child(root, 'Alignments')
+            _writer.start('Alignments')
 
-        for _align in data:
-            self._write_alignment_data(_align, _parent)
+            for _align in data:
+                _writer.write(self._write_alignment_data(_align))
 
-        landxml.write_to_file(root, target_path)
+            _writer.end()
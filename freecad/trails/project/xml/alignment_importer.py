@@ -28,10 +28,11 @@ import math
 
 from xml.etree import ElementTree as etree
 
-from PySide import QtGui
+import FreeCAD as App
 
 from ..support import units, utils
 from ..support.document_properties import Preferences
+from ...geometry import spatial_hash
 from . import landxml
 from .key_maps import KeyMaps as maps
 
@@ -41,9 +42,16 @@ class AlignmentImporter(object):
     landxml parsing class for alignments
     """
 
-    def __init__(self):
+    def __init__(self, interactive=True):
+        """
+        Constructor
+
+        interactive - if false, never prompt the user.  Unit mismatches
+                      are resolved by importing in the file's units.
+        """
 
         self.errors = []
+        self.interactive = interactive
 
     def _validate_units(self, _units):
         """
@@ -61,6 +69,13 @@ class AlignmentImporter(object):
         if xml_units == system_units:
             return xml_units
 
+        #coordinates are scaled in and out by the same document factor,
+        #so headless imports round-trip in the units of the file
+        if not self.interactive:
+            return xml_units
+
+        from PySide import QtGui
+
         #otherwise, prompt user for further action
         msg_box = QtGui.QMessageBox()
 
@@ -239,6 +254,10 @@ class AlignmentImporter(object):
 
         result = []
 
+        _tags = maps.XML_TAGS['coordinate']
+        _nodes = []
+
+        #collect the coordinate text of every geometry node
         for geo_node in coord_geo:
 
             node_tag = geo_node.tag.split('}')[1]
@@ -246,16 +265,33 @@ class AlignmentImporter(object):
             if not node_tag in ['Curve', 'Spiral', 'Line']:
                 continue
 
+            _nodes.append((node_tag, geo_node))
+
+        _texts = []
+
+        for _geo_tag, _geo_node in _nodes:
+
+            for _tag in _tags:
+
+                _child = landxml.get_child(_geo_node, _tag)
+                _texts.append(None if _child is None else _child.text)
+
+        #parse and scale all of the alignment coordinates at once
+        _coords, _valid = landxml.parse_coordinates(_texts)
+        _coords *= units.scale_factor()
+
+        for _i, (node_tag, geo_node) in enumerate(_nodes):
+
             points = []
 
-            for _tag in ['Start', 'End', 'Center', 'PI']:
+            for _j, _tag in enumerate(_tags):
 
-                _pt = landxml.get_child_as_vector(geo_node, _tag)
+                _k = _i * len(_tags) + _j
 
                 points.append(None)
 
-                if _pt:
-                    points[-1] = (_pt.multiply(units.scale_factor()))
+                if _valid[_k]:
+                    points[-1] = App.Vector(*_coords[_k])
                     continue
 
                 if not (node_tag == 'Line' and _tag in ['Center', 'PI']):
@@ -267,7 +303,7 @@ class AlignmentImporter(object):
             hash_value = None
 
             if len(points) >= 2 and all(points):
-                hash_value = hash(tuple(points[0]) + tuple(points[1]))
+                hash_value = spatial_hash.get_hash(points[0], points[1])
 
             coords = {
                 'Hash': hash_value,
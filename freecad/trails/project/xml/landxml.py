@@ -25,11 +25,17 @@
 Importer for LandXML files
 """
 
+import os
 import re
+import tempfile
+import warnings
 
 from shutil import copyfile
 from xml.etree import ElementTree as etree
 from xml.dom import minidom
+from xml.sax.saxutils import quoteattr
+
+import numpy
 
 import FreeCAD as App
 
@@ -49,6 +55,8 @@ class _C(const.Const):
 
     PRECISION = '{:.9f}'    #Attribute precision for floats
 
+    DECIMALS = 9            #Coordinate precision
+
 def convert_token(tag, value):
     """
     Given a LandXML tag and it's value, return it
@@ -115,6 +123,268 @@ def write_to_file(node, target, pretty_print=True):
     with open(target, 'w', encoding='UTF-8') as _file:
         _file.write(_xml)
 
+def get_local_name(tag):
+    """
+    Return the tag stripped of it's namespace
+    """
+
+    return tag.rsplit('}', 1)[-1]
+
+def indent(node, level=0, space='  '):
+    """
+    Indent the node and it's children in place for pretty printing
+    """
+
+    _pad = '\n' + level * space
+
+    if len(node):
+
+        if not node.text or not node.text.strip():
+            node.text = _pad + space
+
+        for _child in node:
+
+            indent(_child, level + 1, space)
+
+            if not _child.tail or not _child.tail.strip():
+                _child.tail = _pad + space
+
+        if not _child.tail or not _child.tail.strip():
+            _child.tail = _pad
+
+class StreamWriter():
+    """
+    Incremental LandXML writer.
+
+    The template root and it's children are written on open, after which
+    container nodes are opened and closed with start() and end().  Nodes
+    passed to write() are serialized immediately and cleared, so memory
+    is bounded by the largest single node rather than the document.
+
+    The file is written to a temporary file which replaces the target on
+    close, so a failed export never leaves a truncated target.
+
+        with landxml.StreamWriter(target, template) as _writer:
+
+            _writer.start('Alignments')
+
+            for _node in nodes:
+                _writer.write(_node)
+
+            _writer.end()
+    """
+
+    def __init__(self, target, template, pretty_print=False, space='  '):
+        """
+        Constructor
+
+        target - the path of the file to write
+        template - the path of the LandXML template whose root and
+                   children lead the file
+        """
+
+        self.target = target
+        self.template = template
+        self.pretty_print = pretty_print
+        self.space = space
+        self.stream = None
+        self.temp_path = None
+        self.stack = []
+        self.prefixes = {}
+
+    def __enter__(self):
+
+        try:
+            self.open()
+
+        except Exception:
+            self.abort()
+            raise
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        if exc_type:
+            self.abort()
+
+        else:
+            self.close()
+
+    def _get_name(self, tag):
+        """
+        Return the qualified name of a tag or attribute.  The template's
+        default namespace is written unprefixed.
+        """
+
+        if not tag.startswith('{'):
+            return tag
+
+        _uri, _name = tag[1:].split('}', 1)
+        _prefix = self.prefixes.get(_uri)
+
+        if not _prefix:
+            return _name
+
+        return _prefix + ':' + _name
+
+    def _serialize(self, node, level):
+        """
+        Serialize a node and it's children at the given nesting level
+        """
+
+        for _n in node.iter():
+
+            _n.tag = get_local_name(_n.tag)
+
+            for _k in [_k for _k in _n.attrib if _k.startswith('{')]:
+                _n.attrib[self._get_name(_k)] = _n.attrib.pop(_k)
+
+        _pad = ''
+
+        if self.pretty_print:
+
+            indent(node, level, self.space)
+            _pad = '\n' + level * self.space
+
+        node.tail = None
+
+        return _pad + etree.tostring(node, encoding='unicode')
+
+    def _write_start(self, tag, attrib, namespaces=None):
+        """
+        Write the start tag of an open container node
+        """
+
+        _attribs = ''
+
+        for _uri, _prefix in (namespaces or {}).items():
+
+            _name = 'xmlns'
+
+            if _prefix:
+                _name += ':' + _prefix
+
+            _attribs += ' {}={}'.format(_name, quoteattr(_uri))
+
+        for _k, _v in attrib.items():
+            _attribs += ' {}={}'.format(self._get_name(_k), quoteattr(_v))
+
+        _pad = ''
+
+        if self.pretty_print and self.stack:
+            _pad = '\n' + len(self.stack) * self.space
+
+        self.stream.write(
+            '{}<{}{}>'.format(_pad, self._get_name(tag), _attribs)
+        )
+
+        self.stack.append(self._get_name(tag))
+
+    def open(self):
+        """
+        Open the target, writing the template root and it's children
+        """
+
+        #collect the template namespace declarations
+        for _event, _ns in etree.iterparse(self.template, ['start-ns']):
+            self.prefixes.setdefault(_ns[1], _ns[0])
+
+        root = etree.parse(self.template).getroot()
+
+        _fd, self.temp_path = tempfile.mkstemp(
+            suffix='.tmp', prefix=os.path.basename(self.target) + '.',
+            dir=os.path.dirname(os.path.abspath(self.target))
+        )
+
+        self.stream = open(_fd, 'w', encoding='utf-8')
+        self.stream.write('<?xml version="1.0" encoding="utf-8"?>')
+
+        if self.pretty_print:
+            self.stream.write('\n')
+
+        self._write_start(root.tag, root.attrib, self.prefixes)
+
+        for _child in list(root):
+            self.write(_child)
+
+    def start(self, tag, attrib=None):
+        """
+        Open a container node
+        """
+
+        self._write_start(tag, attrib or {})
+
+    def write(self, node):
+        """
+        Write a complete node in the open container, clearing it afterward
+        """
+
+        self.stream.write(self._serialize(node, len(self.stack)))
+
+        node.clear()
+
+    def end(self):
+        """
+        Close the most recently opened container node
+        """
+
+        _tag = self.stack.pop()
+
+        _pad = ''
+
+        if self.pretty_print:
+            _pad = '\n' + len(self.stack) * self.space
+
+        self.stream.write('{}</{}>'.format(_pad, _tag))
+
+    def close(self):
+        """
+        Close any open nodes and replace the target with the written file
+        """
+
+        if not self.stream:
+            return
+
+        while self.stack:
+            self.end()
+
+        if self.pretty_print:
+            self.stream.write('\n')
+
+        self.stream.close()
+        self.stream = None
+
+        #temporary files are private, so apply the usual file permissions
+        _umask = os.umask(0)
+        os.umask(_umask)
+        os.chmod(self.temp_path, 0o666 & ~_umask)
+
+        os.replace(self.temp_path, self.target)
+        self.temp_path = None
+
+    def abort(self):
+        """
+        Discard the written file, leaving the target unchanged
+        """
+
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if self.temp_path and os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+        self.temp_path = None
+        self.stack = []
+
+def create_node(node_name):
+    """
+    Return a new node which has no parent
+    """
+
+    return etree.Element(node_name)
+
 def dump_node(node):
     """
     Dump the tree to a prettified string
@@ -175,25 +445,88 @@ def get_child_as_vector(node, node_name, delimiter=' '):
     if result is None:
         return None
 
-    vec_list = result.text.strip().split(delimiter)
+    coords, valid = parse_coordinates([result.text], delimiter)
+
+    if not valid[0]:
+        return None
+
+    return App.Vector(*coords[0])
+
+def parse_coordinates(texts, delimiter=' '):
+    """
+    Parse a list of coordinate texts (Northing Easting [Elevation]) in
+    a single call
+
+    Returns an (n, 3) array of X / Y / Z coordinates and a boolean array
+    flagging the texts which held two or three valid values
+    """
 
-    #validate values as floating point
+    _tokens = [
+        (_t or '').replace(delimiter, ' ').split() for _t in texts
+    ]
+
+    counts = numpy.array([len(_t) for _t in _tokens], dtype=int)
+    valid = (counts >= 2) & (counts <= 3)
+
+    coords = numpy.zeros((len(texts), 3))
+
+    if not valid.any():
+        return coords, valid
+
+    _rows = numpy.flatnonzero(valid)
+    _flat = ' '.join(' '.join(_tokens[_i]) for _i in _rows)
+
+    #parse every value at once, falling back to parsing each text
+    #only if a malformed value cuts the parse short
     try:
-        vec_list = [float(_v) for _v in vec_list]
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
+            _values = numpy.fromstring(_flat, sep=' ')
 
     except ValueError:
-        return None
+        _values = []
 
-    _len = len(vec_list)
+    if len(_values) == counts[_rows].sum():
 
-    #pad the vector if it's too short
-    if _len < 3:
-        vec_list = vec_list + [0.0]*(3-_len)
+        _cols = numpy.concatenate([numpy.arange(_c) for _c in counts[_rows]])
+        coords[numpy.repeat(_rows, counts[_rows]), _cols] = _values
 
-    #Northing / Easting reverse for X/Ycd Project
-    vec_list[0], vec_list[1] = vec_list[1], vec_list[0]
+    else:
 
-    return App.Vector(vec_list)
+        for _i in _rows:
+
+            _v = utils.to_float(_tokens[_i])
+
+            if None in _v:
+                valid[_i] = False
+                continue
+
+            coords[_i, 0:len(_v)] = _v
+
+    #Northing / Easting reverse for X / Y
+    coords[:, [0, 1]] = coords[:, [1, 0]]
+
+    return coords, valid
+
+def format_coordinates(coords, delimiter=' ', decimals=_C.DECIMALS):
+    """
+    Format an (n, 3) array of X / Y / Z coordinates as a list of
+    Northing / Easting / Elevation strings
+    """
+
+    coords = numpy.asarray(coords, dtype=float).reshape(-1, 3)
+
+    if not len(coords):
+        return []
+
+    _text = numpy.char.mod('%.{}f'.format(decimals), coords[:, [1, 0, 2]])
+
+    result = numpy.char.add(_text[:, 0], delimiter)
+    result = numpy.char.add(result, _text[:, 1])
+    result = numpy.char.add(result, delimiter)
+
+    return numpy.char.add(result, _text[:, 2]).tolist()
 
 def get_children(node, node_name):
     """
@@ -214,12 +547,7 @@ def get_vector_string(vector, delimiter=' '):
     Return a string of vector or list elements
     """
 
-    #swap X/Y to store as Northing / Easting
-    vector.x, vector.y = vector.y, vector.x
-
-    result = [_C.PRECISION.format(_v) for _v in vector]
-
-    return delimiter.join(result)
+    return format_coordinates([tuple(vector)], delimiter)[0]
 
 def build_vector(coords):
     """